@@ -0,0 +1,420 @@
+"""
+Load probe driving the page object flows as synthetic users.
+
+Starts N concurrent headless sessions, ramped up over a configurable time, each
+repeating a user journey (login, opening the settings, starting a ticket purchase)
+with think time between the steps. Reports per-step latency (p50/p95/p99 and a
+histogram) and error rates, against the local stand-in unless --url is given.
+
+Usage:
+    python -m benchmarks.load_probe [--users N] [--ramp-up S] [--duration S] [--scenario NAME] [--url URL]
+"""
+import argparse
+import bisect
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from decouple import config
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.auth_state import get_user_password
+from configuration.driver_factory import create_driver
+from pages.authentication_page import AuthenticationPage
+from pages.home_page import HomePage
+from pages.ticket_page import TicketPage
+from pages.user_profile_page import UserProfilePage
+from stand_in.server import StandInServer
+from utils.helpers import percentile
+
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last bucket is open.
+HISTOGRAM_BOUNDS_MS = (50, 100, 200, 500, 1000, 2000, 5000, 10000)
+TICKET_TYPE = "BILET CZASOWY"
+
+
+class VirtualUser:
+    """
+    One synthetic user: a browser session, its page objects and its credentials.
+    """
+
+    def __init__(self, driver: WebDriver, url: str, login: str) -> None:
+        """
+        Initialize the VirtualUser.
+
+        Args:
+            driver (WebDriver): The user's browser session.
+            url (str): The application URL.
+            login (str): The login the user signs in with.
+        """
+        self.driver = driver
+        self.url = url
+        self.login = login
+        self.home_page = HomePage(driver)
+        self.authentication_page = AuthenticationPage(driver)
+        self.user_profile_page = UserProfilePage(driver)
+        self.ticket_page = TicketPage(driver)
+
+
+def open_home(user: VirtualUser) -> None:
+    """
+    Open the home page signed out.
+    """
+    user.driver.delete_all_cookies()
+    user.driver.get(user.url)
+    user.home_page.wait_until_app_stable()
+
+
+def log_in(user: VirtualUser) -> None:
+    """
+    Sign in through the login form.
+    """
+    user.home_page.go_to_login_page()
+    user.authentication_page.fill_login_form(user.login, get_user_password(user.login))
+    user.authentication_page.click_login_button()
+    user.user_profile_page.is_user_logged_in()
+
+
+def open_settings(user: VirtualUser) -> None:
+    """
+    Open the user settings and wait for the profile details.
+    """
+    user.user_profile_page.go_to_user_settings()
+    user.user_profile_page.are_profile_details_displayed()
+
+
+def open_ticket_page(user: VirtualUser) -> None:
+    """
+    Open the ticket purchase page.
+    """
+    user.user_profile_page.go_to_ticket_page()
+
+
+def select_ticket_type(user: VirtualUser) -> None:
+    """
+    Select the ticket type in the dropdown.
+    """
+    user.ticket_page.select_ticket_type(TICKET_TYPE)
+
+
+def click_next(user: VirtualUser) -> None:
+    """
+    Proceed to the pricing step.
+    """
+    user.ticket_page.click_next_button()
+    user.ticket_page.is_pricing_step_displayed()
+
+
+Step = Tuple[str, Callable[[VirtualUser], None]]
+
+# Named user journeys. Every iteration starts from a signed-out home page.
+SCENARIOS: Dict[str, Sequence[Step]] = {
+    "login": (
+        ("open_home", open_home),
+        ("log_in", log_in),
+    ),
+    "settings": (
+        ("open_home", open_home),
+        ("log_in", log_in),
+        ("open_settings", open_settings),
+    ),
+    "ticket_purchase": (
+        ("open_home", open_home),
+        ("log_in", log_in),
+        ("open_ticket_page", open_ticket_page),
+        ("select_ticket_type", select_ticket_type),
+        ("click_next", click_next),
+    ),
+}
+
+
+class LoadRecorder:
+    """
+    Collects step latencies and errors from every virtual user thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.iterations: Dict[str, List[int]] = {}
+
+    def record_step(self, step: str, seconds: float, error: Optional[BaseException] = None) -> None:
+        """
+        Record one execution of a step.
+
+        Args:
+            step (str): The step name.
+            seconds (float): Its duration.
+            error (Optional[BaseException]): The exception the step failed with, if any.
+        """
+        with self._lock:
+            self.latencies.setdefault(step, []).append(seconds)
+            errors = self.errors.setdefault(step, {})
+            if error is not None:
+                name = type(error).__name__
+                errors[name] = errors.get(name, 0) + 1
+
+    def record_iteration(self, scenario: str, failed: bool) -> None:
+        """
+        Record one completed or failed run of a scenario.
+
+        Args:
+            scenario (str): The scenario name.
+            failed (bool): Whether a step of it failed.
+        """
+        with self._lock:
+            counts = self.iterations.setdefault(scenario, [0, 0])
+            counts[0] += 1
+            counts[1] += failed
+
+    def summary(self, elapsed: float) -> Dict[str, object]:
+        """
+        Summarize the recorded steps and iterations.
+
+        Args:
+            elapsed (float): Wall time of the load phase, for throughput.
+
+        Returns:
+            Dict[str, object]: Per step: count, errors by type, error_rate, p50/p95/p99/max
+                in seconds and histogram counts by bucket; per scenario: iterations,
+                failures and iterations per second.
+        """
+        with self._lock:
+            steps = {}
+            for step, samples in self.latencies.items():
+                buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+                for seconds in samples:
+                    buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+                labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+                error_count = sum(self.errors[step].values())
+                steps[step] = {
+                    "count": len(samples),
+                    "errors": dict(self.errors[step]),
+                    "error_rate": round(error_count / len(samples), 4),
+                    "p50": round(percentile(samples, 50), 4),
+                    "p95": round(percentile(samples, 95), 4),
+                    "p99": round(percentile(samples, 99), 4),
+                    "max": round(max(samples), 4),
+                    "histogram": dict(zip(labels, buckets)),
+                }
+            scenarios = {
+                scenario: {
+                    "iterations": total,
+                    "failures": failures,
+                    "per_second": round(total / elapsed, 3) if elapsed else 0.0,
+                }
+                for scenario, (total, failures) in self.iterations.items()
+            }
+        return {"steps": steps, "scenarios": scenarios}
+
+
+def run_user(
+    recorder: LoadRecorder,
+    url: str,
+    login: str,
+    scenario: str,
+    start_at: float,
+    stop_at: float,
+    iterations: Optional[int],
+    think_time: Tuple[float, float],
+) -> None:
+    """
+    Run one virtual user: wait for its ramp-up slot, start a browser and repeat the
+    scenario until stop_at or the iteration limit. Any exception of a step is counted
+    as an error of that step and ends the iteration; a browser that stopped responding
+    is replaced.
+
+    Args:
+        recorder (LoadRecorder): Collects the step latencies.
+        url (str): The application URL.
+        login (str): The login of the user.
+        scenario (str): A key of SCENARIOS.
+        start_at (float): time.monotonic() at which the user starts.
+        stop_at (float): time.monotonic() after which no new iteration starts.
+        iterations (Optional[int]): Maximum number of iterations, or None for no limit.
+        think_time (Tuple[float, float]): Bounds of the uniform pause after each step, in seconds.
+    """
+    time.sleep(max(0.0, start_at - time.monotonic()))
+    user: Optional[VirtualUser] = None
+    try:
+        for _ in itertools.count() if iterations is None else range(iterations):
+            if time.monotonic() >= stop_at:
+                break
+            if user is None:
+                started = time.perf_counter()
+                try:
+                    user = VirtualUser(create_driver(), url, login)
+                except Exception as error:
+                    recorder.record_step("start_session", time.perf_counter() - started, error)
+                    recorder.record_iteration(scenario, failed=True)
+                    continue
+                recorder.record_step("start_session", time.perf_counter() - started)
+            failed = False
+            for name, action in SCENARIOS[scenario]:
+                started = time.perf_counter()
+                try:
+                    action(user)
+                except Exception as error:
+                    recorder.record_step(name, time.perf_counter() - started, error)
+                    failed = True
+                    break
+                recorder.record_step(name, time.perf_counter() - started)
+                time.sleep(random.uniform(*think_time))
+            recorder.record_iteration(scenario, failed)
+            if failed and not _responds(user.driver):
+                _quit(user.driver)
+                user = None
+    finally:
+        if user is not None:
+            _quit(user.driver)
+
+
+def _quit(driver: WebDriver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _responds(driver: WebDriver) -> bool:
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def run_load(
+    url: str,
+    logins: Sequence[str],
+    scenarios: Sequence[str],
+    users: int,
+    ramp_up: float,
+    duration: float,
+    iterations: Optional[int],
+    think_time: Tuple[float, float],
+) -> Dict[str, object]:
+    """
+    Run the virtual users concurrently and summarize the results.
+
+    Users are started evenly over the ramp-up time and take their scenario and login
+    round-robin from the given lists.
+
+    Args:
+        url (str): The application URL.
+        logins (Sequence[str]): Logins to sign in with; users may share one.
+        scenarios (Sequence[str]): Keys of SCENARIOS.
+        users (int): Number of concurrent users.
+        ramp_up (float): Seconds over which the users are started.
+        duration (float): Seconds after the start during which iterations start.
+        iterations (Optional[int]): Maximum iterations per user, or None for no limit.
+        think_time (Tuple[float, float]): Bounds of the pause after each step, in seconds.
+
+    Returns:
+        Dict[str, object]: LoadRecorder.summary() plus "elapsed" seconds.
+    """
+    recorder = LoadRecorder()
+    started = time.monotonic()
+    threads = [
+        threading.Thread(
+            target=run_user,
+            name=f"virtual-user-{index}",
+            args=(
+                recorder, url, logins[index % len(logins)], scenarios[index % len(scenarios)],
+                started + ramp_up * index / users, started + duration, iterations, think_time,
+            ),
+            daemon=True,
+        )
+        for index in range(users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    return dict(recorder.summary(elapsed), elapsed=round(elapsed, 1))
+
+
+def configured_logins() -> List[str]:
+    """
+    Return the logins of the TEST_USERS setting.
+
+    Returns:
+        List[str]: Logins with a configured password.
+    """
+    entries = (entry.strip().partition(":")[0] for entry in config("TEST_USERS", default="").split(","))
+    return [login for login in entries if login]
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_probe", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=5, help="Number of concurrent virtual users.")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Seconds over which the users are started.")
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="Seconds during which users start new iterations.")
+    parser.add_argument("--iterations", type=int, default=None, help="Maximum iterations per user.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run; repeat to mix scenarios across users (default: all).")
+    parser.add_argument("--think-min", type=float, default=0.5, help="Minimum pause after a step, in seconds.")
+    parser.add_argument("--think-max", type=float, default=2.0, help="Maximum pause after a step, in seconds.")
+    parser.add_argument("--login", action="append",
+                        help="Login to sign in with; repeat for several (default: all of TEST_USERS).")
+    parser.add_argument("--url", default=None, help="Probe this URL instead of a locally served stand-in.")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="Exit with 1 when any step fails more often than this (default 0.01).")
+    parser.add_argument("--output", default=None, help="Write the summary to this JSON file.")
+    args = parser.parse_args(argv)
+
+    logins = args.login or configured_logins()
+    if not logins:
+        parser.error("no logins: set TEST_USERS or pass --login")
+
+    stand_in = None if args.url else StandInServer().start()
+    url = args.url or stand_in.url
+    try:
+        summary = run_load(
+            url, logins, args.scenario or sorted(SCENARIOS), args.users, args.ramp_up,
+            args.duration, args.iterations, (args.think_min, max(args.think_min, args.think_max)),
+        )
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    print(f"{args.users} users against {'the stand-in' if stand_in else url} for {summary['elapsed']} s\n")
+    print(f"{'step':<20}{'count':>7}{'errors':>8}{'p50 [ms]':>10}{'p95 [ms]':>10}{'p99 [ms]':>10}{'max [ms]':>10}")
+    for step, values in summary["steps"].items():
+        print(
+            f"{step:<20}{values['count']:>7}{values['error_rate']:>8.1%}{values['p50'] * 1000:>10.0f}"
+            f"{values['p95'] * 1000:>10.0f}{values['p99'] * 1000:>10.0f}{values['max'] * 1000:>10.0f}"
+        )
+    print()
+    for scenario, values in summary["scenarios"].items():
+        print(f"{scenario:<20}{values['iterations']:>7} iterations, {values['failures']} failed, "
+              f"{values['per_second']:.2f}/s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(dict(
+                summary,
+                timestamp=datetime.now().isoformat(timespec="seconds"),
+                url="stand-in" if stand_in else url,
+                users=args.users,
+                ramp_up=args.ramp_up,
+                think_time=[args.think_min, args.think_max],
+            ), output_file, indent=2)
+
+    failing = [step for step, values in summary["steps"].items() if values["error_rate"] > args.max_error_rate]
+    if failing:
+        print(f"\nError rate above {args.max_error_rate:.1%}: {', '.join(failing)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
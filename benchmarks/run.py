@@ -0,0 +1,247 @@
+"""
+Step-level benchmark suite for the test framework.
+
+Times the building blocks of a browser test separately (driver cold start, first
+page load, login flow, profile form fill, Taiga ticket type dropdown, teardown) against
+the local stand-in, stores p50/p95 of every step in a JSON history, and fails when
+a step regresses past a threshold compared to earlier runs.
+
+Usage:
+    python -m benchmarks.run [--repeat N] [--threshold 0.2] [--url URL]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from configuration.auth_state import get_user_password
+from configuration.driver_factory import create_driver
+from pages.authentication_page import AuthenticationPage
+from pages.home_page import HomePage
+from pages.ticket_page import TicketPage
+from pages.user_profile_page import UserProfilePage
+from stand_in.server import StandInServer
+from utils.helpers import percentile
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY_FILE = os.path.join(BENCHMARKS_DIR, "history.json")
+STEPS = (
+    "driver_cold_start",
+    "first_get",
+    "login_flow",
+    "fill_profile_form",
+    "select_ticket_type",
+    "teardown",
+)
+BENCHMARK_USER = "Testowy_1"
+
+
+class StepTimer:
+    """
+    Collects the durations of named steps over repeated runs.
+    """
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {step: [] for step in STEPS}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Time the body of the with-block as one sample of a step.
+
+        Args:
+            name (str): Name of the step.
+        """
+        started = time.perf_counter()
+        yield
+        self.samples[name].append(time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the samples of every step.
+
+        Returns:
+            Dict[str, Dict[str, float]]: p50, p95 and sample count by step.
+        """
+        return {
+            name: {
+                "p50": round(percentile(samples, 50), 4),
+                "p95": round(percentile(samples, 95), 4),
+                "samples": len(samples),
+            }
+            for name, samples in self.samples.items()
+            if samples
+        }
+
+
+def run_iteration(timer: StepTimer, url: str) -> None:
+    """
+    Run every step once, on a freshly started driver.
+
+    Args:
+        timer (StepTimer): Collects the step durations.
+        url (str): The application URL.
+    """
+    with timer.step("driver_cold_start"):
+        driver = create_driver()
+    try:
+        home_page = HomePage(driver)
+        with timer.step("first_get"):
+            driver.get(url)
+            home_page.wait_until_app_stable()
+
+        authentication_page = AuthenticationPage(driver)
+        user_profile_page = UserProfilePage(driver)
+        with timer.step("login_flow"):
+            home_page.go_to_login_page()
+            authentication_page.fill_login_form(BENCHMARK_USER, get_user_password(BENCHMARK_USER))
+            authentication_page.click_login_button()
+            user_profile_page.is_user_logged_in()
+
+        user_profile_page.go_to_user_settings()
+        with timer.step("fill_profile_form"):
+            user_profile_page.fill_profile_form(
+                last_name="Nowak",
+                first_name="Anna",
+                email="anna.nowak@example.com",
+                phone_number="987654321",
+                city="Kraków",
+                street="Długa",
+                building="5",
+                apartment_number="12",
+                postal_code="30-001",
+            )
+
+        user_profile_page.go_to_ticket_page()
+        ticket_page = TicketPage(driver)
+        with timer.step("select_ticket_type"):
+            ticket_page.select_ticket_type("BILET CZASOWY")
+    finally:
+        with timer.step("teardown"):
+            driver.quit()
+
+
+def load_history(path: str) -> List[Dict[str, object]]:
+    """
+    Load earlier benchmark runs.
+
+    Args:
+        path (str): The history JSON file.
+
+    Returns:
+        List[Dict[str, object]]: Earlier runs, oldest first; empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as history_file:
+        return json.load(history_file)
+
+
+def find_regressions(
+    summary: Dict[str, Dict[str, float]],
+    history: List[Dict[str, object]],
+    threshold: float,
+    baseline_runs: int,
+) -> List[str]:
+    """
+    Compare a run with the median of the last baseline_runs runs.
+
+    Args:
+        summary (Dict[str, Dict[str, float]]): The current run's step summary.
+        history (List[Dict[str, object]]): Earlier runs, oldest first.
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20 %.
+        baseline_runs (int): Number of earlier runs forming the baseline.
+
+    Returns:
+        List[str]: A description of every regressed step and percentile.
+    """
+    regressions = []
+    recent = history[-baseline_runs:]
+    for step, current in summary.items():
+        for key in ("p50", "p95"):
+            previous = [run["steps"][step][key] for run in recent if step in run["steps"]]
+            if not previous:
+                continue
+            baseline = statistics.median(previous)
+            if baseline > 0 and current[key] > baseline * (1 + threshold):
+                regressions.append(
+                    f"{step} {key}: {current[key] * 1000:.0f} ms vs baseline {baseline * 1000:.0f} ms "
+                    f"(+{(current[key] / baseline - 1):.0%}, threshold {threshold:.0%})"
+                )
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    """
+    Return the short hash of the checked out commit, if available.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARKS_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Number of iterations of every step.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative slowdown of a step's p50/p95 (default 0.2 = 20%%).")
+    parser.add_argument("--baseline-runs", type=int, default=5,
+                        help="Number of earlier runs whose median forms the baseline.")
+    parser.add_argument("--history", default=DEFAULT_HISTORY_FILE, help="JSON history file.")
+    parser.add_argument("--url", default=None,
+                        help="Benchmark against this URL instead of a locally served stand-in.")
+    parser.add_argument("--no-save", action="store_true", help="Do not append this run to the history.")
+    args = parser.parse_args(argv)
+
+    timer = StepTimer()
+    stand_in = None if args.url else StandInServer().start()
+    url = args.url or stand_in.url
+    try:
+        for _ in range(args.repeat):
+            if stand_in:
+                stand_in.state.reset()
+            run_iteration(timer, url)
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    summary = timer.summary()
+    history = load_history(args.history)
+    regressions = find_regressions(summary, history, args.threshold, args.baseline_runs)
+
+    print(f"{'step':<22}{'p50 [ms]':>10}{'p95 [ms]':>10}")
+    for step, values in summary.items():
+        print(f"{step:<22}{values['p50'] * 1000:>10.0f}{values['p95'] * 1000:>10.0f}")
+
+    if not args.no_save:
+        history.append({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "url": "stand-in" if stand_in else url,
+            "repeat": args.repeat,
+            "steps": summary,
+        })
+        with open(args.history, "w", encoding="utf-8") as history_file:
+            json.dump(history, history_file, indent=2)
+
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,203 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from decouple import config
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from pages.base_page import mark_navigation
+
+
+READ_WEB_STORAGE_SCRIPT = """
+return {
+    local: Object.assign({}, window.localStorage),
+    session: Object.assign({}, window.sessionStorage)
+};
+"""
+
+COOKIE_PARAM_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+WEBDRIVER_COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+SAME_SITE_VALUES = ("Strict", "Lax", "None")
+
+WRITE_WEB_STORAGE_SCRIPT = """
+var state = arguments[0];
+Object.keys(state.local).forEach(function (key) { window.localStorage.setItem(key, state.local[key]); });
+Object.keys(state.session).forEach(function (key) { window.sessionStorage.setItem(key, state.session[key]); });
+"""
+
+
+class AuthState:
+    """
+    Snapshot of the browser state produced by a successful UI login.
+
+    Attributes:
+        cookies (List[Dict[str, Any]]): Cookies of every domain the session knows about.
+        local_storage (Dict[str, str]): localStorage of the application origin.
+        session_storage (Dict[str, str]): sessionStorage of the application origin.
+        landing_url (str): The URL the application showed right after logging in.
+        created_at (float): time.monotonic() timestamp of the capture.
+    """
+
+    def __init__(
+        self,
+        cookies: List[Dict[str, Any]],
+        local_storage: Dict[str, str],
+        session_storage: Dict[str, str],
+        landing_url: str,
+    ) -> None:
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.landing_url = landing_url
+        self.created_at = time.monotonic()
+
+
+class AuthStateCache:
+    """
+    Per-process cache of AuthState snapshots keyed by login, with a time-to-live.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """
+        Initialize the AuthStateCache.
+
+        Args:
+            ttl (float): Number of seconds a captured state may be reused.
+        """
+        self.ttl = ttl
+        self._states: Dict[str, AuthState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, login: str) -> Optional[AuthState]:
+        """
+        Return the cached state for a login, dropping it if it has expired.
+
+        Args:
+            login (str): The user login.
+
+        Returns:
+            Optional[AuthState]: The cached state, or None if there is no fresh one.
+        """
+        with self._lock:
+            state = self._states.get(login)
+            if state and time.monotonic() - state.created_at > self.ttl:
+                del self._states[login]
+                state = None
+            return state
+
+    def put(self, login: str, state: AuthState) -> None:
+        """
+        Store the state captured for a login.
+
+        Args:
+            login (str): The user login.
+            state (AuthState): The captured state.
+        """
+        with self._lock:
+            self._states[login] = state
+
+    def invalidate(self, login: str) -> None:
+        """
+        Forget the state of a login, e.g. after the server rejected it.
+
+        Args:
+            login (str): The user login.
+        """
+        with self._lock:
+            self._states.pop(login, None)
+
+
+auth_state_cache = AuthStateCache(ttl=config("AUTH_STATE_TTL", default=900, cast=float))
+
+
+def get_user_password(login: str) -> str:
+    """
+    Look up the password of a test user in the TEST_USERS setting.
+
+    TEST_USERS is a comma separated list of ``login:password`` pairs.
+
+    Args:
+        login (str): The user login.
+
+    Returns:
+        str: The user's password.
+
+    Raises:
+        KeyError: If the login is not configured.
+    """
+    for entry in config("TEST_USERS", default="").split(","):
+        user, _, password = entry.strip().partition(":")
+        if user == login:
+            return password
+    raise KeyError(f"No password configured in TEST_USERS for '{login}'.")
+
+
+def capture_auth_state(driver: WebDriver) -> AuthState:
+    """
+    Capture cookies and web storage of a logged-in WebDriver session.
+
+    Args:
+        driver (WebDriver): A session that has just logged in.
+
+    Returns:
+        AuthState: The captured state.
+    """
+    try:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    except (AttributeError, WebDriverException):
+        cookies = driver.get_cookies()
+    storage = driver.execute_script(READ_WEB_STORAGE_SCRIPT)
+    return AuthState(cookies, storage["local"], storage["session"], driver.current_url)
+
+
+def to_webdriver_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a captured cookie to the fields WebDriver's add_cookie accepts.
+
+    Cookies captured over CDP carry "expires" (-1 for session cookies) and CDP-only
+    fields such as "size" or "priority"; WebDriver expects an integer "expiry".
+
+    Args:
+        cookie (Dict[str, Any]): A cookie from Network.getAllCookies or get_cookies().
+
+    Returns:
+        Dict[str, Any]: The cookie as a WebDriver cookie.
+    """
+    converted = {key: cookie[key] for key in WEBDRIVER_COOKIE_KEYS if key in cookie}
+    if "expiry" not in converted and cookie.get("expires", -1) >= 0 and not cookie.get("session"):
+        converted["expiry"] = int(cookie["expires"])
+    if converted.get("sameSite") not in SAME_SITE_VALUES:
+        converted.pop("sameSite", None)
+    return converted
+
+
+def inject_auth_state(driver: WebDriver, state: AuthState) -> None:
+    """
+    Restore a captured AuthState into a WebDriver session and open the landing page.
+
+    The session must already show a page of the application origin, so that web
+    storage is written to the right origin.
+
+    Args:
+        driver (WebDriver): The session to log in.
+        state (AuthState): The state to restore.
+    """
+    try:
+        cookies = []
+        for captured in state.cookies:
+            cookie = {key: captured[key] for key in COOKIE_PARAM_KEYS if key in captured}
+            if "expiry" in captured:
+                cookie.setdefault("expires", captured["expiry"])
+            if cookie.get("expires", 0) < 0:
+                del cookie["expires"]
+            cookies.append(cookie)
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    except (AttributeError, WebDriverException):
+        for cookie in state.cookies:
+            driver.add_cookie(to_webdriver_cookie(cookie))
+    driver.execute_script(
+        WRITE_WEB_STORAGE_SCRIPT, {"local": state.local_storage, "session": state.session_storage}
+    )
+    mark_navigation(driver)
+    driver.get(state.landing_url)
@@ -0,0 +1,167 @@
+import threading
+from typing import Callable, Dict, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.driver_factory import BLOCKING_PROFILE, PAGE_LOAD_STRATEGY, create_driver
+from configuration.network_blocking import apply_blocking_profile
+from pages.base_page import APP_HOOKS_JS
+
+
+class ContextHost:
+    """
+    One Chrome session hosting many isolated browser contexts.
+
+    Every context is created with CDP Target.createBrowserContext and has its own
+    cookies, storage and cache, like a separate incognito profile, at the cost of a
+    window instead of a whole browser process tree.
+
+    Each context is driven by its own WebDriver session, attached to the host's
+    Chrome through the host's chromedriver (goog:chromeOptions debuggerAddress), so
+    contexts run their commands concurrently, each over its own connection. The host
+    session itself only creates and disposes of contexts.
+
+    Attributes:
+        driver (WebDriver): The host session, a local Chrome started by driver_factory.
+    """
+
+    def __init__(self, driver_factory: Callable[[], WebDriver] = create_driver) -> None:
+        """
+        Initialize the ContextHost and start its browser.
+
+        Args:
+            driver_factory (Callable[[], WebDriver], optional): Starts the host session
+                on a local chromedriver.
+        """
+        self.driver = driver_factory()
+        self.debugger_address: str = self.driver.caps["goog:chromeOptions"]["debuggerAddress"]
+        self.service_url: str = self.driver.service.service_url
+        self.lock = threading.Lock()
+        self._contexts: Dict[str, "ContextDriver"] = {}
+
+    def new_context(self) -> "ContextDriver":
+        """
+        Create a browser context with one window and attach a WebDriver session to it.
+
+        The window gets the default network blocking profile and the application
+        readiness hooks, like sessions from create_driver.
+
+        Returns:
+            ContextDriver: A WebDriver for the new context, disposed of by its quit().
+        """
+        with self.lock:
+            context_id = self.driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            target_id = self.driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id, "newWindow": True}
+            )["targetId"]
+        try:
+            context_driver = ContextDriver(self, context_id, target_id)
+            apply_blocking_profile(context_driver, BLOCKING_PROFILE)
+            context_driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": APP_HOOKS_JS})
+        except Exception:
+            self.dispose(context_id)
+            raise
+        with self.lock:
+            self._contexts[context_id] = context_driver
+        return context_driver
+
+    def dispose(self, context_id: str) -> None:
+        """
+        Close a browser context together with its windows, cookies and storage.
+
+        Args:
+            context_id (str): Id of the browser context.
+        """
+        with self.lock:
+            self._contexts.pop(context_id, None)
+            try:
+                self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+            except WebDriverException:
+                pass
+
+    def close(self) -> None:
+        """
+        Quit the session of every context, dispose of the contexts and quit the host browser.
+        """
+        with self.lock:
+            contexts = list(self._contexts.values())
+        for context_driver in contexts:
+            context_driver.quit()
+        self.driver.quit()
+
+
+class ContextDriver(webdriver.Chrome):
+    """
+    WebDriver session attached to one browser context of a ContextHost.
+
+    It runs on the host's chromedriver with its own connection and session, attached
+    to the host's Chrome and switched to the context's window, so page objects use
+    it like any other Chrome WebDriver.
+
+    Attributes:
+        context_id (str): Id of the browser context.
+    """
+
+    def __init__(self, host: ContextHost, context_id: str, window_handle: str) -> None:
+        self._host = host
+        self.context_id = context_id
+        options = Options()
+        options.debugger_address = host.debugger_address
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
+        options.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
+        executor = ChromiumRemoteConnection(host.service_url, vendor_prefix="goog", browser_name="chrome")
+        # Skip ChromiumDriver.__init__, which would start a chromedriver process.
+        WebDriver.__init__(self, command_executor=executor, options=options)
+        self._is_remote = False
+        self.switch_to.window(window_handle)
+
+    @property
+    def window_handles(self) -> list:
+        """
+        Returns the handles of the windows of this browser context only.
+        """
+        targets = self.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        return [
+            target["targetId"] for target in targets
+            if target["type"] == "page" and target.get("browserContextId") == self.context_id
+        ]
+
+    def quit(self) -> None:
+        """
+        End the attached session and dispose of the browser context. The host's
+        Chrome keeps running, as chromedriver does not close browsers it attached to.
+        """
+        try:
+            WebDriver.quit(self)
+        except WebDriverException:
+            pass
+        finally:
+            self._host.dispose(self.context_id)
+
+
+_active_context_host: Optional[ContextHost] = None
+
+
+def get_active_context_host() -> Optional[ContextHost]:
+    """
+    Return the context host installed for the current test session, if any.
+
+    Returns:
+        Optional[ContextHost]: The active host, or None when every session has its own browser.
+    """
+    return _active_context_host
+
+
+def set_active_context_host(host: Optional[ContextHost]) -> None:
+    """
+    Install the host that TestDriver creates its browser contexts in.
+
+    Args:
+        host (Optional[ContextHost]): The host to install, or None to disable browser contexts.
+    """
+    global _active_context_host
+    _active_context_host = host
@@ -0,0 +1,68 @@
+from typing import Optional
+
+from decouple import config
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.network_blocking import apply_blocking_profile
+from pages.base_page import APP_HOOKS_JS
+
+
+BLOCKING_PROFILE: str = config("BLOCKING_PROFILE", default="minimal")
+PAGE_LOAD_STRATEGY: str = config("PAGE_LOAD_STRATEGY", default="eager")
+
+# Background work Chrome does on startup that the tests never need.
+CHROME_STARTUP_ARGUMENTS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-default-apps",
+)
+
+
+def build_chrome_options(user_data_dir: Optional[str] = None) -> Options:
+    """
+    Build the Chrome options shared by every WebDriver session started for the tests.
+
+    Args:
+        user_data_dir (Optional[str]): Profile directory for the browser. Defaults to a
+            new temporary profile created by chromedriver.
+
+    Returns:
+        Options: Chrome options configured for headless runs.
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    for argument in CHROME_STARTUP_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    if user_data_dir:
+        chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+    chrome_options.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
+    return chrome_options
+
+
+def create_driver(service: Optional[Service] = None, options: Optional[Options] = None) -> WebDriver:
+    """
+    Start a new headless Chrome WebDriver session with the default network blocking
+    profile (BLOCKING_PROFILE) applied and the application readiness hooks used by
+    BasePage.wait_until_app_stable installed in every new document.
+
+    Args:
+        service (Optional[Service]): chromedriver service to start the session on.
+            Defaults to a new chromedriver process for this session.
+        options (Optional[Options]): Chrome options of the session. Defaults to
+            build_chrome_options().
+
+    Returns:
+        WebDriver: A freshly started Chrome WebDriver session.
+    """
+    driver = webdriver.Chrome(options=options if options else build_chrome_options(), service=service)
+    apply_blocking_profile(driver, BLOCKING_PROFILE)
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": APP_HOOKS_JS})
+    return driver
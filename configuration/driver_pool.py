@@ -0,0 +1,266 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from decouple import config
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.driver_factory import create_driver
+from pages.base_page import mark_navigation
+
+
+CLEAR_WEB_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+POOL_LEASE_TIMEOUT: float = config("POOL_LEASE_TIMEOUT", default=300, cast=float)
+
+
+class PoolTimeout(RuntimeError):
+    """
+    Raised when no pooled session was released before the lease timeout.
+    """
+
+
+def is_session_healthy(driver: WebDriver) -> bool:
+    """
+    Check whether a WebDriver session still responds to commands.
+
+    Args:
+        driver (WebDriver): The WebDriver session to probe.
+
+    Returns:
+        bool: True if the browser answered, False if the session or browser has crashed.
+    """
+    try:
+        driver.current_window_handle
+    except WebDriverException:
+        return False
+    return True
+
+
+def clean_session(driver: WebDriver, url: str) -> None:
+    """
+    Reset a WebDriver session so it can be handed to the next test.
+
+    Closes every window except the first one, clears web storage and cookies,
+    drains the browser logs and navigates back to the given URL. The load is measured
+    when the next test waits for the app to be stable.
+
+    Args:
+        driver (WebDriver): The WebDriver session to clean.
+        url (str): The URL to load once the session is clean.
+    """
+    handles: List[str] = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    try:
+        driver.execute_script(CLEAR_WEB_STORAGE_SCRIPT)
+    except WebDriverException:
+        pass
+
+    parts = urlsplit(url)
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd(
+            "Storage.clearDataForOrigin",
+            {"origin": f"{parts.scheme}://{parts.netloc}", "storageTypes": "local_storage,indexeddb"},
+        )
+    except (AttributeError, WebDriverException):
+        driver.delete_all_cookies()
+
+    for log_type in ("browser", "performance"):
+        try:
+            driver.get_log(log_type)
+        except WebDriverException:
+            pass
+
+    mark_navigation(driver, timed=False)
+    driver.get(url)
+
+
+class DriverPool:
+    """
+    A thread-safe pool of warm WebDriver sessions that tests lease and return.
+
+    Returned sessions are cleaned (windows, cookies and web storage) and navigated
+    back to the pool URL, so the next lease starts from the same state as a freshly
+    started browser. Sessions that crash are discarded, and sessions are recycled
+    after a configurable number of uses.
+
+    Attributes:
+        url (str): The URL every returned session is navigated back to.
+        size (int): Maximum number of live sessions owned by the pool.
+        max_uses (int): Number of leases after which a session is quit and replaced.
+        lease_timeout (float): Seconds a lease waits for a session to be released.
+        prefetch (Optional[Callable[[], None]]): Called when a leased session is on its
+            last use, so its replacement can start while the session is still in use.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        size: int = 1,
+        max_uses: int = 25,
+        driver_factory: Callable[[], WebDriver] = create_driver,
+        lease_timeout: Optional[float] = None,
+        prefetch: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Initialize the DriverPool. Sessions are started lazily on the first leases.
+
+        Args:
+            url (str, optional): The URL to return sessions to. Defaults to TEST_URL.
+            size (int, optional): Maximum number of live sessions. Defaults to 1.
+            max_uses (int, optional): Leases before a session is recycled. Defaults to 25.
+            driver_factory (Callable[[], WebDriver], optional): Starts a new session.
+                Defaults to create_driver.
+            lease_timeout (float, optional): Seconds a lease waits for a session to be
+                released. Defaults to the POOL_LEASE_TIMEOUT setting.
+            prefetch (Callable[[], None], optional): Starts a session ahead, e.g.
+                DriverPrefetcher.prefetch, called when a leased session will be recycled.
+        """
+        self.url = url if url else config("TEST_URL")
+        self.size = size
+        self.max_uses = max_uses
+        self.driver_factory = driver_factory
+        self.lease_timeout = lease_timeout if lease_timeout is not None else POOL_LEASE_TIMEOUT
+        self.prefetch = prefetch
+        self._idle: List[WebDriver] = []
+        self._uses: Dict[int, int] = {}
+        self._live = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def lease(self) -> WebDriver:
+        """
+        Take a session out of the pool, starting a new one if the pool is not full.
+        Blocks while every session is leased.
+
+        Returns:
+            WebDriver: A clean WebDriver session showing the pool URL.
+
+        Raises:
+            PoolTimeout: If every session stayed leased for lease_timeout seconds.
+            RuntimeError: If the pool has been closed.
+        """
+        deadline = time.monotonic() + self.lease_timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("The driver pool has been closed.")
+                while self._idle:
+                    driver = self._idle.pop()
+                    if is_session_healthy(driver):
+                        self._uses[id(driver)] += 1
+                        if self._uses[id(driver)] >= self.max_uses:
+                            self._prefetch()
+                        return driver
+                    self._discard(driver)
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"No pooled session was released within {self.lease_timeout:g}s; "
+                        f"all {self.size} are leased (raise --pool-size or POOL_LEASE_TIMEOUT)."
+                    )
+                self._condition.wait(remaining)
+
+        try:
+            driver = self.driver_factory()
+            mark_navigation(driver, timed=False)
+            driver.get(self.url)
+        except Exception:
+            with self._condition:
+                self._live -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._uses[id(driver)] = 1
+        if self.max_uses <= 1:
+            self._prefetch()
+        return driver
+
+    def release(self, driver: WebDriver) -> None:
+        """
+        Return a leased session to the pool. The session is cleaned before it is
+        made available again, or quit if it crashed or reached max_uses.
+
+        Args:
+            driver (WebDriver): The session obtained from lease().
+        """
+        with self._condition:
+            keep = not self._closed and self._uses.get(id(driver), 0) < self.max_uses
+        if keep and is_session_healthy(driver):
+            try:
+                clean_session(driver, self.url)
+            except WebDriverException:
+                keep = False
+        else:
+            keep = False
+
+        with self._condition:
+            if keep:
+                self._idle.append(driver)
+            else:
+                self._discard(driver)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """
+        Quit every idle session and refuse further leases.
+        """
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._condition.notify_all()
+
+    def _prefetch(self) -> None:
+        if self.prefetch:
+            self.prefetch()
+
+    def _discard(self, driver: WebDriver) -> None:
+        """
+        Quit a session and forget about it. Must be called with the pool lock held.
+
+        Args:
+            driver (WebDriver): The session to discard.
+        """
+        self._uses.pop(id(driver), None)
+        self._live -= 1
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+_active_pool: Optional[DriverPool] = None
+
+
+def get_active_pool() -> Optional[DriverPool]:
+    """
+    Return the pool installed for the current test session, if any.
+
+    Returns:
+        Optional[DriverPool]: The active pool, or None when tests start their own drivers.
+    """
+    return _active_pool
+
+
+def set_active_pool(pool: Optional[DriverPool]) -> None:
+    """
+    Install the pool that TestDriver leases sessions from.
+
+    Args:
+        pool (Optional[DriverPool]): The pool to install, or None to disable pooling.
+    """
+    global _active_pool
+    _active_pool = pool
@@ -0,0 +1,453 @@
+"""
+Scheduling of WebDriver sessions across several endpoints: local chromedriver
+processes on different ports or Selenium Grid / Remote URLs.
+
+Sessions go to the healthy endpoint with the lowest load relative to its capacity,
+rotating round-robin between equally loaded endpoints. The load is shared by every
+worker process of the machine through one lock file per endpoint slot, so parallel
+workers spread across the endpoints instead of all starting on the first one.
+When every endpoint is full, requests wait in a first-come, first-served queue.
+Endpoints that repeatedly fail to start sessions are taken out of rotation until
+they answer /status again, probed after a back-off.
+
+Usage (start local chromedriver nodes to run against):
+    python -m configuration.endpoints [--nodes N] [--base-port PORT]
+"""
+import argparse
+import hashlib
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import IO, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import urllib3
+from decouple import config
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.driver_factory import BLOCKING_PROFILE, build_chrome_options
+from configuration.network_blocking import apply_blocking_profile
+from pages.base_page import APP_HOOKS_JS
+from utils import test_metrics
+from utils.helpers import try_lock_file, unlock_file
+
+
+ENDPOINT_MAX_FAILURES: int = config("ENDPOINT_MAX_FAILURES", default=2, cast=int)
+ENDPOINT_RETRY_AFTER: float = config("ENDPOINT_RETRY_AFTER", default=30, cast=float)
+ENDPOINT_QUEUE_TIMEOUT: float = config("ENDPOINT_QUEUE_TIMEOUT", default=300, cast=float)
+ENDPOINT_POLL_INTERVAL: float = config("ENDPOINT_POLL_INTERVAL", default=0.5, cast=float)
+ENDPOINT_SLOTS_DIR: str = config(
+    "ENDPOINT_SLOTS_DIR", default=os.path.join(tempfile.gettempdir(), "webdriver-endpoint-slots")
+)
+DEFAULT_CAPACITY = 1
+
+status_pool = urllib3.PoolManager(timeout=urllib3.Timeout(connect=2, read=5), retries=False)
+
+
+class EndpointUnavailable(WebDriverException):
+    """
+    Raised when no endpoint could start a session before the queue timeout.
+    """
+
+
+class Endpoint:
+    """
+    A WebDriver endpoint and its scheduling state.
+
+    Attributes:
+        url (str): Base URL of the endpoint, e.g. "http://127.0.0.1:9515" or "http://grid:4444/wd/hub".
+        capacity (int): Maximum number of concurrent sessions.
+        browser_path (str): Chrome binary for sessions of a local node, if not the default one.
+        active (int): Sessions this process currently runs on the endpoint.
+        healthy (bool): Whether the endpoint is in rotation.
+        failures (int): Consecutive failures.
+        retry_at (float): time.monotonic() after which an unhealthy endpoint is probed again.
+        started (int): Sessions started in total.
+    """
+
+    def __init__(self, url: str, capacity: int = DEFAULT_CAPACITY, browser_path: str = "") -> None:
+        self.url = url.rstrip("/")
+        self.capacity = capacity
+        self.browser_path = browser_path
+        self.active = 0
+        self.healthy = True
+        self.failures = 0
+        self.retry_at = 0.0
+        self.started = 0
+
+    def is_ready(self) -> bool:
+        """
+        Ask the endpoint whether it accepts new sessions (GET /status).
+
+        Returns:
+            bool: True if it answered and reported ready.
+        """
+        try:
+            response = status_pool.request("GET", f"{self.url}/status")
+        except urllib3.exceptions.HTTPError:
+            return False
+        if response.status != 200:
+            return False
+        try:
+            return bool(response.json().get("value", {}).get("ready", True))
+        except ValueError:
+            return False
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r}, {self.active}/{self.capacity}{'' if self.healthy else ', unhealthy'})"
+
+
+def parse_endpoints(spec: str) -> List[Endpoint]:
+    """
+    Parse a comma separated endpoint list, each entry an URL with an optional
+    "*capacity" suffix, e.g. "http://127.0.0.1:9515*2,http://grid:4444/wd/hub*8".
+
+    Args:
+        spec (str): The endpoint list.
+
+    Returns:
+        List[Endpoint]: The endpoints, in order.
+    """
+    endpoints = []
+    for entry in spec.split(","):
+        url, _, capacity = entry.strip().partition("*")
+        if url:
+            endpoints.append(Endpoint(url, int(capacity) if capacity else DEFAULT_CAPACITY))
+    return endpoints
+
+
+class ScheduledDriver(webdriver.Chrome):
+    """
+    Chrome WebDriver session on an endpoint of an EndpointScheduler. It speaks the
+    Chromium protocol extensions (CDP commands, logs) over the endpoint URL, and
+    quit() frees its slot on the endpoint.
+
+    Attributes:
+        endpoint (Endpoint): The endpoint running the session.
+    """
+
+    def __init__(self, scheduler: "EndpointScheduler", endpoint: Endpoint, options: Options) -> None:
+        self._scheduler = scheduler
+        self._released = False
+        self.endpoint = endpoint
+        executor = ChromiumRemoteConnection(endpoint.url, vendor_prefix="goog", browser_name="chrome")
+        # Skip ChromiumDriver.__init__, which would start a chromedriver process.
+        WebDriver.__init__(self, command_executor=executor, options=options)
+
+    def quit(self) -> None:
+        """
+        End the session and free its slot on the endpoint.
+        """
+        try:
+            WebDriver.quit(self)
+        except WebDriverException:
+            pass
+        finally:
+            if not self._released:
+                self._released = True
+                self._scheduler.release(self.endpoint)
+
+
+class EndpointScheduler:
+    """
+    Spreads WebDriver sessions across endpoints by load and capacity.
+
+    Every endpoint has one lock file per slot in slots_dir; a session holds the lock
+    of its slot until quit(), so schedulers of all worker processes on the machine
+    see the same load. Sessions start on the healthy endpoint with the most free
+    slots relative to its capacity, ties going round-robin from the endpoint after
+    the one used last. While every healthy endpoint is at capacity, create_driver()
+    waits in a FIFO queue, polling for slots freed by other processes. An endpoint
+    is taken out of rotation after max_failures consecutive session start failures,
+    and put back once it answers /status again, probed at most every retry_after seconds.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        max_failures: int = ENDPOINT_MAX_FAILURES,
+        retry_after: float = ENDPOINT_RETRY_AFTER,
+        queue_timeout: float = ENDPOINT_QUEUE_TIMEOUT,
+        options_factory: Callable[[], Options] = build_chrome_options,
+        slots_dir: str = ENDPOINT_SLOTS_DIR,
+        poll_interval: float = ENDPOINT_POLL_INTERVAL,
+    ) -> None:
+        """
+        Initialize the EndpointScheduler.
+
+        Args:
+            endpoints (Sequence[Endpoint]): The endpoints to schedule on.
+            max_failures (int, optional): Consecutive failures that take an endpoint out of rotation.
+            retry_after (float, optional): Seconds before an unhealthy endpoint is probed again.
+            queue_timeout (float, optional): Seconds a request waits for a free endpoint.
+            options_factory (Callable[[], Options], optional): Builds the Chrome options of a session.
+            slots_dir (str, optional): Directory of the slot lock files, shared by the worker processes.
+            poll_interval (float, optional): Seconds between checks for slots freed by other processes.
+        """
+        if not endpoints:
+            raise ValueError("The endpoint scheduler needs at least one endpoint.")
+        self.endpoints = list(endpoints)
+        self.max_failures = max_failures
+        self.retry_after = retry_after
+        self.queue_timeout = queue_timeout
+        self.options_factory = options_factory
+        self.slots_dir = slots_dir
+        self.poll_interval = poll_interval
+        self._held: Dict[Endpoint, List[IO]] = {endpoint: [] for endpoint in self.endpoints}
+        self._rotation = 0
+        self._condition = threading.Condition()
+        self._queue: Deque[int] = deque()
+        self._tickets = itertools.count()
+
+    def create_driver(self) -> WebDriver:
+        """
+        Start a session on the least loaded healthy endpoint, waiting for a free slot
+        if needed, with the default network blocking profile and readiness hooks
+        applied like configuration.driver_factory.create_driver.
+
+        Returns:
+            WebDriver: The new session; quit() frees its slot.
+
+        Raises:
+            EndpointUnavailable: If no endpoint started a session within the queue timeout.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        queued = time.perf_counter()
+        while True:
+            endpoint = self.acquire(deadline)
+            options = self.options_factory()
+            if endpoint.browser_path:
+                options.binary_location = endpoint.browser_path
+            try:
+                driver = ScheduledDriver(self, endpoint, options)
+            except (WebDriverException, urllib3.exceptions.HTTPError, OSError):
+                self.release(endpoint, failed=True)
+                continue
+            try:
+                apply_blocking_profile(driver, BLOCKING_PROFILE)
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": APP_HOOKS_JS})
+            except WebDriverException:
+                driver.quit()
+                raise
+            with self._condition:
+                endpoint.failures = 0
+                endpoint.started += 1
+            test_metrics.add("endpoint_wait_seconds", round(time.perf_counter() - queued, 3))
+            return driver
+
+    def acquire(self, deadline: float) -> Endpoint:
+        """
+        Reserve a slot on the least loaded healthy endpoint, in arrival order.
+        The slot's lock file stays locked until release().
+
+        Args:
+            deadline (float): time.monotonic() after which to give up.
+
+        Returns:
+            Endpoint: The endpoint, with the slot counted in its active sessions.
+
+        Raises:
+            EndpointUnavailable: If no slot became free before the deadline.
+        """
+        self._probe_unhealthy()
+        with self._condition:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+            try:
+                while True:
+                    if self._queue[0] == ticket:
+                        endpoint = self._claim()
+                        if endpoint:
+                            return endpoint
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise EndpointUnavailable(f"No WebDriver endpoint available: {self.endpoints}")
+                    # Slots freed by other processes are not notified, so poll for them.
+                    self._condition.wait(min(remaining, self.poll_interval, self.retry_after))
+                    self._condition.release()
+                    try:
+                        self._probe_unhealthy()
+                    finally:
+                        self._condition.acquire()
+            finally:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+
+    def release(self, endpoint: Endpoint, failed: bool = False) -> None:
+        """
+        Free a slot on an endpoint.
+
+        Args:
+            endpoint (Endpoint): The endpoint the slot was acquired on.
+            failed (bool, optional): The session could not be started; counts as a
+                failure of the endpoint.
+        """
+        with self._condition:
+            endpoint.active -= 1
+            unlock_file(self._held[endpoint].pop())
+            if failed:
+                endpoint.failures += 1
+                if endpoint.failures >= self.max_failures:
+                    endpoint.healthy = False
+                    endpoint.retry_at = time.monotonic() + self.retry_after
+            self._condition.notify_all()
+
+    def summary(self) -> List[Dict[str, object]]:
+        """
+        Describe the state of every endpoint.
+
+        Returns:
+            List[Dict[str, object]]: url, capacity, active, healthy and started per endpoint.
+        """
+        with self._condition:
+            return [
+                {
+                    "url": endpoint.url,
+                    "capacity": endpoint.capacity,
+                    "active": endpoint.active,
+                    "healthy": endpoint.healthy,
+                    "started": endpoint.started,
+                }
+                for endpoint in self.endpoints
+            ]
+
+    def _slot_paths(self, endpoint: Endpoint) -> List[str]:
+        name = hashlib.sha1(endpoint.url.encode("utf-8")).hexdigest()[:16]
+        return [os.path.join(self.slots_dir, f"{name}-{slot}.lock") for slot in range(endpoint.capacity)]
+
+    def _claim(self) -> Optional[Endpoint]:
+        """
+        Lock a free slot on the healthy endpoint with the most free capacity.
+        Called with the condition held.
+        """
+        start = self._rotation % len(self.endpoints)
+        order = self.endpoints[start:] + self.endpoints[:start]
+        free: List[Tuple[Endpoint, List[IO]]] = [
+            (endpoint, [lock_file for lock_file in map(try_lock_file, self._slot_paths(endpoint)) if lock_file])
+            for endpoint in order if endpoint.healthy
+        ]
+        free = [(endpoint, locked) for endpoint, locked in free if locked]
+        chosen: Optional[Endpoint] = None
+        if free:
+            # max() keeps the first of equally free endpoints, i.e. the next one in the rotation.
+            chosen, locked = max(free, key=lambda item: len(item[1]) / item[0].capacity)
+            self._held[chosen].append(locked.pop(0))
+            chosen.active += 1
+            self._rotation = self.endpoints.index(chosen) + 1
+        for _, locked in free:
+            for lock_file in locked:
+                unlock_file(lock_file)
+        return chosen
+
+    def _probe_unhealthy(self) -> None:
+        now = time.monotonic()
+        with self._condition:
+            due = [endpoint for endpoint in self.endpoints if not endpoint.healthy and endpoint.retry_at <= now]
+            for endpoint in due:
+                endpoint.retry_at = now + self.retry_after
+        for endpoint in due:
+            if endpoint.is_ready():
+                with self._condition:
+                    endpoint.healthy = True
+                    endpoint.failures = 0
+                    self._condition.notify_all()
+
+
+class LocalNodes:
+    """
+    Local chromedriver processes on consecutive ports, standing in for remote nodes.
+    """
+
+    def __init__(self, count: int, base_port: int = 9515, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Initialize the LocalNodes.
+
+        Args:
+            count (int): Number of chromedriver processes.
+            base_port (int, optional): Port of the first process.
+            capacity (int, optional): Sessions each node accepts.
+        """
+        self.count = count
+        self.base_port = base_port
+        self.capacity = capacity
+        self.services: List[Service] = []
+
+    def start(self) -> List[Endpoint]:
+        """
+        Start the chromedriver processes.
+
+        Returns:
+            List[Endpoint]: One endpoint per process.
+        """
+        finder = DriverFinder(Service(), build_chrome_options())
+        driver_path, browser_path = finder.get_driver_path(), finder.get_browser_path()
+        endpoints = []
+        for port in range(self.base_port, self.base_port + self.count):
+            service = Service(executable_path=driver_path, port=port)
+            service.start()
+            self.services.append(service)
+            endpoints.append(Endpoint(service.service_url, self.capacity, browser_path))
+        return endpoints
+
+    def stop(self) -> None:
+        """
+        Stop the chromedriver processes.
+        """
+        while self.services:
+            self.services.pop().stop()
+
+
+_active_scheduler: Optional[EndpointScheduler] = None
+
+
+def get_active_scheduler() -> Optional[EndpointScheduler]:
+    """
+    Return the endpoint scheduler installed for the current test session, if any.
+
+    Returns:
+        Optional[EndpointScheduler]: The active scheduler, or None when sessions start locally.
+    """
+    return _active_scheduler
+
+
+def set_active_scheduler(scheduler: Optional[EndpointScheduler]) -> None:
+    """
+    Install the scheduler that TestDriver starts its sessions through.
+
+    Args:
+        scheduler (Optional[EndpointScheduler]): The scheduler to install, or None to start sessions locally.
+    """
+    global _active_scheduler
+    _active_scheduler = scheduler
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m configuration.endpoints", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=2, help="Number of chromedriver processes.")
+    parser.add_argument("--base-port", type=int, default=9515, help="Port of the first process.")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="Sessions each node accepts.")
+    args = parser.parse_args(argv)
+
+    nodes = LocalNodes(args.nodes, args.base_port, args.capacity)
+    endpoints = nodes.start()
+    print("WEBDRIVER_ENDPOINTS=" + ",".join(f"{endpoint.url}*{endpoint.capacity}" for endpoint in endpoints))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        nodes.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
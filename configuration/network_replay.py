@@ -0,0 +1,335 @@
+"""
+Record and replay of the backend calls (XHR and fetch) a page makes, through CDP
+request interception (Fetch domain).
+
+In record mode every backend response is stored in a per-test cassette,
+cassettes/<folder>/<test>.json. In replay mode the requests are answered from the
+cassette without reaching the server; requests missing from it fail the test or pass
+through to the server, as configured by REPLAY_MISSING.
+
+Interception runs over a DevTools WebSocket session attached to the test's tab,
+served by a trio event loop on a background thread.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import trio
+import urllib3
+from decouple import config
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.bidi import cdp
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.helpers import get_test_context
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASSETTES_DIR: str = os.path.join(PROJECT_ROOT, config("CASSETTES_DIR", default="cassettes"))
+NETWORK_MODES = ("off", "record", "replay")
+# What happens to a request missing from the cassette in replay mode: "fail" or "passthrough".
+REPLAY_MISSING: str = config("REPLAY_MISSING", default="fail")
+INTERCEPTION_START_TIMEOUT = 10
+# Headers of the transfer encoding; recorded bodies are stored decoded.
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteMiss(AssertionError):
+    """
+    Raised at the end of a replayed test that made requests missing from its cassette.
+    """
+
+
+def request_key(method: str, url: str, post_data: Optional[str]) -> str:
+    """
+    Build the key a request is matched by: method, URL and a hash of the body.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Full URL, query included.
+        post_data (Optional[str]): Request body, if any.
+
+    Returns:
+        str: The key, e.g. "POST https://host/api/auth/login#3f2a9c1b".
+    """
+    digest = hashlib.sha256(post_data.encode("utf-8")).hexdigest()[:8] if post_data else ""
+    return f"{method} {url}#{digest}"
+
+
+class Cassette:
+    """
+    Recorded backend responses of one test, replayed in recording order per request key.
+    """
+
+    def __init__(self, path: str, load: bool = True) -> None:
+        """
+        Initialize the Cassette, loading the file if it exists.
+
+        Args:
+            path (str): The cassette JSON file.
+            load (bool, optional): Load the recorded interactions. Record mode starts
+                empty, so saving replaces the file instead of appending to it.
+        """
+        self.path = path
+        self.interactions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        if load and os.path.exists(path):
+            with open(path, encoding="utf-8") as cassette_file:
+                self.interactions = json.load(cassette_file)["interactions"]
+
+    @classmethod
+    def for_current_test(cls, load: bool = True) -> "Cassette":
+        """
+        Open the cassette of the running test.
+
+        Args:
+            load (bool, optional): Load the recorded interactions.
+
+        Returns:
+            Cassette: cassettes/<folder>/<test>.json.
+        """
+        folder_name, test_name = get_test_context()
+        path = os.path.join(CASSETTES_DIR, folder_name or "no_folder", f"{test_name or 'no_test_name'}.json")
+        return cls(path, load)
+
+    @property
+    def exists(self) -> bool:
+        """
+        Return whether the cassette was recorded.
+        """
+        return os.path.exists(self.path)
+
+    def add(self, interaction: Dict[str, Any]) -> None:
+        """
+        Append a recorded interaction.
+
+        Args:
+            interaction (Dict[str, Any]): key, status, status_text, headers, body and base64.
+        """
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def next_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the next recorded response of a request; the last one repeats once
+        every recorded response was served.
+
+        Args:
+            key (str): The request key.
+
+        Returns:
+            Optional[Dict[str, Any]]: The interaction, or None when the request was never recorded.
+        """
+        with self._lock:
+            if not self._queues:
+                grouped: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+                for interaction in self.interactions:
+                    grouped[interaction["key"]].append(interaction)
+                self._queues = dict(grouped)
+            queue = self._queues.get(key)
+            if not queue:
+                return None
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def save(self) -> None:
+        """
+        Write the cassette.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            content = {"recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "interactions": self.interactions}
+        with open(self.path, "w", encoding="utf-8") as cassette_file:
+            json.dump(content, cassette_file, indent=1, ensure_ascii=False)
+
+
+def _devtools_endpoint(driver: WebDriver) -> Tuple[str, str]:
+    """
+    Find the DevTools WebSocket URL and major version of a session's browser.
+    """
+    caps = driver.caps or {}
+    if caps.get("se:cdp"):
+        return caps["se:cdp"], caps.get("se:cdpVersion", caps.get("browserVersion", "")).split(".")[0]
+    debugger_address = caps.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if not debugger_address:
+        raise WebDriverException("The session does not expose a DevTools endpoint.")
+    response = urllib3.request("GET", f"http://{debugger_address}/json/version", timeout=5)
+    details = response.json()
+    return details["webSocketDebuggerUrl"], details["Browser"].split("/")[-1].split(".")[0]
+
+
+class NetworkInterceptor:
+    """
+    Records the backend responses of a WebDriver session's tab into a Cassette, or
+    answers its backend requests from one, from start() until stop().
+
+    Attributes:
+        mode (str): "record" or "replay".
+        misses (List[str]): Keys of replayed requests missing from the cassette.
+    """
+
+    def __init__(self, driver: WebDriver, cassette: Cassette, mode: str, on_missing: str = REPLAY_MISSING) -> None:
+        """
+        Initialize the NetworkInterceptor.
+
+        Args:
+            driver (WebDriver): A Chrome session; interception covers its current tab.
+            cassette (Cassette): The cassette to record into or replay from.
+            mode (str): "record" or "replay".
+            on_missing (str, optional): "fail" or "passthrough" for requests missing
+                from the cassette in replay mode.
+        """
+        self.driver = driver
+        self.cassette = cassette
+        self.mode = mode
+        self.on_missing = on_missing
+        self.misses: List[str] = []
+        self._target_id = driver.current_window_handle
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._cancel_scope: Optional[trio.CancelScope] = None
+        self._trio_token: Optional[trio.lowlevel.TrioToken] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "NetworkInterceptor":
+        """
+        Start intercepting and wait until interception is active.
+
+        Returns:
+            NetworkInterceptor: self, for chaining.
+
+        Raises:
+            WebDriverException: If interception could not be set up.
+        """
+        ws_url, version = _devtools_endpoint(self.driver)
+        devtools = cdp.import_devtools(version)
+        self._thread = threading.Thread(
+            target=trio.run, args=(self._run, ws_url, devtools), name="network-interceptor", daemon=True
+        )
+        self._thread.start()
+        if not self._ready.wait(INTERCEPTION_START_TIMEOUT) or self._error:
+            self.stop()
+            raise WebDriverException(f"Could not start network {self.mode}: {self._error!r}")
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop intercepting. Requests still paused are released when the DevTools session closes.
+        """
+        if self._trio_token and self._cancel_scope:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._trio_token)
+            except trio.RunFinishedError:
+                pass
+        if self._thread:
+            self._thread.join(INTERCEPTION_START_TIMEOUT)
+
+    async def _run(self, ws_url: str, devtools: Any) -> None:
+        self._trio_token = trio.lowlevel.current_trio_token()
+        with trio.CancelScope() as self._cancel_scope:
+            try:
+                async with cdp.open_cdp(ws_url) as connection:
+                    session = await connection.connect_session(devtools.target.TargetID(self._target_id))
+                    stages = devtools.fetch.RequestStage
+                    stage = stages.RESPONSE if self.mode == "record" else stages.REQUEST
+                    patterns = [
+                        devtools.fetch.RequestPattern(url_pattern="*", resource_type=resource_type, request_stage=stage)
+                        for resource_type in (devtools.network.ResourceType.XHR, devtools.network.ResourceType.FETCH)
+                    ]
+                    events = session.listen(devtools.fetch.RequestPaused, buffer_size=100)
+                    await session.execute(devtools.fetch.enable(patterns=patterns))
+                    self._ready.set()
+                    async with trio.open_nursery() as nursery:
+                        async for event in events:
+                            handler = self._record if self.mode == "record" else self._replay
+                            nursery.start_soon(handler, session, devtools, event)
+            except Exception as error:
+                self._error = error
+                self._ready.set()
+
+    async def _record(self, session: Any, devtools: Any, event: Any) -> None:
+        request = event.request
+        try:
+            if event.response_status_code is not None and event.response_error_reason is None:
+                body, is_base64 = None, False
+                if not 300 <= event.response_status_code < 400:
+                    try:
+                        body, is_base64 = await session.execute(devtools.fetch.get_response_body(event.request_id))
+                    except cdp.BrowserError:
+                        pass
+                self.cassette.add({
+                    "key": request_key(request.method, request.url, request.post_data),
+                    "status": event.response_status_code,
+                    "status_text": event.response_status_text or "",
+                    "headers": [
+                        [header.name, header.value] for header in event.response_headers or []
+                        if header.name.lower() not in DROPPED_HEADERS
+                    ],
+                    "body": body,
+                    "base64": is_base64,
+                })
+        finally:
+            await self._continue(session, devtools, event)
+
+    async def _replay(self, session: Any, devtools: Any, event: Any) -> None:
+        request = event.request
+        key = request_key(request.method, request.url, request.post_data)
+        interaction = self.cassette.next_response(key)
+        if interaction is None:
+            if self.on_missing == "passthrough":
+                await self._continue(session, devtools, event)
+                return
+            self.misses.append(key)
+            await session.execute(
+                devtools.fetch.fail_request(event.request_id, devtools.network.ErrorReason.BLOCKED_BY_CLIENT)
+            )
+            return
+        body = interaction["body"]
+        if body is not None and not interaction["base64"]:
+            body = base64.b64encode(body.encode("utf-8")).decode("ascii")
+        await session.execute(devtools.fetch.fulfill_request(
+            event.request_id,
+            response_code=interaction["status"],
+            response_headers=[devtools.fetch.HeaderEntry(name, value) for name, value in interaction["headers"]],
+            body=body,
+            response_phrase=interaction["status_text"] or None,
+        ))
+
+    @staticmethod
+    async def _continue(session: Any, devtools: Any, event: Any) -> None:
+        try:
+            await session.execute(devtools.fetch.continue_request(event.request_id))
+        except cdp.BrowserError:
+            # The request was cancelled by the page meanwhile.
+            pass
+
+
+_network_mode: str = config("NETWORK_MODE", default="off")
+
+
+def get_network_mode() -> str:
+    """
+    Return the network mode of the current test session.
+
+    Returns:
+        str: "off", "record" or "replay".
+    """
+    return _network_mode
+
+
+def set_network_mode(mode: str) -> None:
+    """
+    Set the network mode TestDriver sessions start in.
+
+    Args:
+        mode (str): "off", "record" or "replay".
+    """
+    if mode not in NETWORK_MODES:
+        raise ValueError(f"Unknown network mode '{mode}', expected one of {', '.join(NETWORK_MODES)}.")
+    global _network_mode
+    _network_mode = mode
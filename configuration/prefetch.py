@@ -0,0 +1,269 @@
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Optional, Tuple
+
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.driver_factory import build_chrome_options, create_driver
+from utils import test_metrics
+
+
+# Preferences of the template profile: no first-run UI, sync, translation or password prompts.
+TEMPLATE_PREFERENCES = {
+    "browser": {"check_default_browser": False, "has_seen_welcome_page": True},
+    "distribution": {"skip_first_run_ui": True, "suppress_first_run_default_browser_prompt": True},
+    "sync": {"disabled": True},
+    "translate": {"enabled": False},
+    "credentials_enable_service": False,
+    "profile": {"password_manager_enabled": False},
+}
+
+
+class SharedService(Service):
+    """
+    chromedriver service shared by several WebDriver sessions.
+
+    The chromedriver process is started by the first session and keeps running when
+    sessions quit; shutdown() stops it. Driver and browser paths are resolved once
+    instead of once per session.
+
+    Attributes:
+        browser_path (str): Chrome binary resolved by Selenium Manager, if any.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.browser_path = ""
+        self._lock = threading.Lock()
+        self._started = False
+
+    def resolve(self) -> None:
+        """
+        Resolve the chromedriver and Chrome paths, unless already done.
+        """
+        with self._lock:
+            if self.path:
+                return
+            finder = DriverFinder(self, build_chrome_options())
+            self.browser_path = finder.get_browser_path()
+            self.path = self.env_path() or finder.get_driver_path()
+
+    def start(self) -> None:
+        with self._lock:
+            if not self._started:
+                super().start()
+                self._started = True
+
+    def stop(self) -> None:
+        # Called by every session's quit(); the process outlives the sessions.
+        pass
+
+    def shutdown(self) -> None:
+        """
+        Stop the chromedriver process.
+        """
+        with self._lock:
+            if self._started:
+                super().stop()
+                self._started = False
+
+
+class ProfileTemplate:
+    """
+    Template Chrome user-data-dir with first-run, sync and component update prompts
+    already settled. Every session gets its own copy, since Chrome locks the profile
+    directory it runs on.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._root: Optional[str] = None
+
+    def clone(self) -> str:
+        """
+        Copy the template into a new directory.
+
+        Returns:
+            str: Path of the new user-data-dir.
+        """
+        with self._lock:
+            if not self._root:
+                self._root = tempfile.mkdtemp(prefix="renk-chrome-profiles-")
+                self._write_template(os.path.join(self._root, "template"))
+        return shutil.copytree(
+            os.path.join(self._root, "template"),
+            tempfile.mkdtemp(prefix="profile-", dir=self._root),
+            dirs_exist_ok=True,
+        )
+
+    def cleanup(self) -> None:
+        """
+        Remove the template and every copy of it.
+        """
+        with self._lock:
+            if self._root:
+                shutil.rmtree(self._root, ignore_errors=True)
+                self._root = None
+
+    @staticmethod
+    def _write_template(path: str) -> None:
+        os.makedirs(os.path.join(path, "Default"))
+        # Chrome skips its first-run flow when this sentinel exists.
+        open(os.path.join(path, "First Run"), "w").close()
+        with open(os.path.join(path, "Default", "Preferences"), "w", encoding="utf-8") as preferences:
+            json.dump(TEMPLATE_PREFERENCES, preferences)
+
+
+shared_service = SharedService()
+profile_template = ProfileTemplate()
+atexit.register(profile_template.cleanup)
+atexit.register(shared_service.shutdown)
+
+
+def launch_driver() -> WebDriver:
+    """
+    Start a session on the shared chromedriver service from a copy of the template profile.
+
+    Returns:
+        WebDriver: A freshly started Chrome WebDriver session.
+    """
+    shared_service.resolve()
+    user_data_dir = profile_template.clone()
+    options = build_chrome_options(user_data_dir=user_data_dir)
+    if shared_service.browser_path:
+        options.binary_location = shared_service.browser_path
+    try:
+        driver = create_driver(service=shared_service, options=options)
+    except Exception:
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+        raise
+    weakref.finalize(driver, shutil.rmtree, user_data_dir, ignore_errors=True)
+    return driver
+
+
+class DriverPrefetcher:
+    """
+    Starts the next WebDriver sessions in the background while the current test runs,
+    so taking a session only waits for whatever startup time is left.
+
+    Without refill, take() does not start a replacement: sessions are only started
+    ahead when prefetch() is called, e.g. by a DriverPool about to recycle a session,
+    so no prefetched browser sits idle next to the pool's warm sessions.
+
+    The startup time each take() saves (session startup minus time spent waiting for
+    it) is recorded as the "driver_startup_saved" test metric.
+
+    Attributes:
+        depth (int): Number of sessions kept starting or ready.
+        refill (bool): Start a replacement for every session taken.
+    """
+
+    def __init__(self, depth: int = 1, refill: bool = True) -> None:
+        """
+        Initialize the DriverPrefetcher and start prefetching.
+
+        Args:
+            depth (int, optional): Number of sessions kept starting or ready. Defaults to 1.
+            refill (bool, optional): Start a replacement for every session taken.
+                Defaults to True.
+        """
+        self.depth = depth
+        self.refill = refill
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=depth, thread_name_prefix="driver-prefetch")
+        self._pending: Deque[Future] = deque()
+        self._closed = False
+        self._fill()
+
+    def take(self) -> WebDriver:
+        """
+        Return a started session, waiting for the oldest prefetched one if needed,
+        and start prefetching its replacement when refilling. A session that failed
+        to start in the background is started again on the spot.
+
+        Returns:
+            WebDriver: A WebDriver session owned by the caller.
+        """
+        with self._lock:
+            future = self._pending.popleft() if self._pending else None
+        if self.refill:
+            self._fill()
+
+        if future is None:
+            return launch_driver()
+        waiting_since = time.perf_counter()
+        try:
+            driver, startup_time = future.result()
+        except Exception:
+            return launch_driver()
+        waited = time.perf_counter() - waiting_since
+        test_metrics.add("driver_startup_saved", round(max(0.0, startup_time - waited), 3))
+        return driver
+
+    def close(self) -> None:
+        """
+        Stop prefetching and quit every session nobody took.
+        """
+        with self._lock:
+            self._closed = True
+            pending, self._pending = list(self._pending), deque()
+        for future in pending:
+            if future.cancel():
+                continue
+            try:
+                driver, _ = future.result()
+            except Exception:
+                continue
+            driver.quit()
+        self._executor.shutdown(wait=True)
+
+    def prefetch(self) -> None:
+        """
+        Start sessions in the background until depth sessions are starting or ready.
+        """
+        self._fill()
+
+    def _fill(self) -> None:
+        with self._lock:
+            while not self._closed and len(self._pending) < self.depth:
+                self._pending.append(self._executor.submit(self._launch))
+
+    @staticmethod
+    def _launch() -> Tuple[WebDriver, float]:
+        started = time.perf_counter()
+        driver = launch_driver()
+        return driver, time.perf_counter() - started
+
+
+_active_prefetcher: Optional[DriverPrefetcher] = None
+
+
+def get_active_prefetcher() -> Optional[DriverPrefetcher]:
+    """
+    Return the prefetcher installed for the current test session, if any.
+
+    Returns:
+        Optional[DriverPrefetcher]: The active prefetcher, or None when sessions start on demand.
+    """
+    return _active_prefetcher
+
+
+def set_active_prefetcher(prefetcher: Optional[DriverPrefetcher]) -> None:
+    """
+    Install the prefetcher that new sessions are taken from.
+
+    Args:
+        prefetcher (Optional[DriverPrefetcher]): The prefetcher to install, or None to disable prefetching.
+    """
+    global _active_prefetcher
+    _active_prefetcher = prefetcher
@@ -1,42 +1,162 @@
-import os
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from decouple import config
-from typing import Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
 from types import TracebackType
 
-from pages.user_profile_page import UserProfilePage
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from configuration.browser_contexts import ContextHost, get_active_context_host
+from configuration.auth_state import (
+    auth_state_cache,
+    capture_auth_state,
+    get_user_password,
+    inject_auth_state,
+)
+from configuration.driver_factory import BLOCKING_PROFILE, create_driver
+from configuration.driver_pool import DriverPool, clean_session, get_active_pool
+from configuration.endpoints import EndpointScheduler, get_active_scheduler
+from configuration.network_blocking import apply_blocking_profile, collect_network_usage
+from configuration.network_replay import Cassette, CassetteMiss, NetworkInterceptor, REPLAY_MISSING, get_network_mode
+from configuration.prefetch import get_active_prefetcher
+from pages.base_page import BasePage, mark_navigation
+from pages.user_profile_page import UserProfilePage, UserProfilePageLocators
 from pages.authentication_page import AuthenticationPage
-from pages.home_page import HomePage
+from pages.home_page import HomePage, HomePageLocators
 from pages.ticket_page import TicketPage
-from utils.helpers import get_test_context_from_stack
+from utils.artifacts import FailureArtifacts, artifact_writer
+from utils import test_metrics
+from utils.command_tracer import command_tracer
+from utils.page_performance import check_budgets, page_performance
+from utils.resource_monitor import ResourceMonitor, check_limits
+from utils.visual_baseline import visual_baseline
+from utils.helpers import get_test_context
+
+
+PageT = TypeVar("PageT", bound=BasePage)
 
+_browser_session_ran = False
+
+
+def browser_session_ran() -> bool:
+    """
+    Return whether a browser session was used in this process.
+
+    Returns:
+        bool: True once a TestDriver or the pooled_driver fixture acquired a session.
+    """
+    return _browser_session_ran
+
+
+def mark_browser_session_ran() -> None:
+    """
+    Record that a browser session was used, so the end of the run flushes artifacts,
+    prunes the artifact store and saves page performance records.
+    """
+    global _browser_session_ran
+    _browser_session_ran = True
 
 
 class TestDriver:
     """
     A context manager for managing a headless Selenium Chrome WebDriver session
     for automated testing. It navigates to a specified URL and provides access to
-    various page objects. On exit, it captures a screenshot with a filename composed
-    of the test context and a timestamp, then quits the driver.
+    various page objects. On exit, if the test failed, it captures a screenshot, the DOM,
+    the browser console log and the URL with a filename composed of the test context and
+    a timestamp, then quits the driver.
+
+    When a DriverPool is active (see conftest.py), the session is leased from the pool
+    instead of being started, and returned to it on exit instead of being quit. Without
+    a pool, the session runs in a new browser context of the active ContextHost when
+    there is one, so many sessions share a single Chrome process, or is taken from the
+    active DriverPrefetcher.
+
+    While the session is in use, the Chrome and chromedriver processes behind it are
+    sampled from /proc; peak RSS, CPU time, threads and file descriptors are reported
+    as test metrics and checked against the RESOURCE_LIMIT_* settings.
+
+    When logged_in_as is given, the session starts on the user profile of that user.
+    The UI login runs once per process; later sessions reuse the cached cookies and
+    web storage until they expire or the server rejects them.
 
     Attributes:
         url (str): The URL to load. Defaults to the TEST_URL from environment variables.
+        pool (Optional[DriverPool]): The pool to lease the session from, if any.
+        context_host (Optional[ContextHost]): The browser hosting the session's context, if any.
+        scheduler (Optional[EndpointScheduler]): Starts the session on one of several
+            chromedriver/Remote endpoints when there is no pool or context host.
+        logged_in_as (Optional[str]): Login of the user the session starts logged in as.
+        capture_artifacts (bool): Capture artifacts on exit even if the test passed.
+            Defaults to the CAPTURE_ARTIFACTS setting.
+        blocking_profile (str): Network blocking profile of the session ("minimal",
+            "no-media" or "full"). Defaults to the BLOCKING_PROFILE setting; tests that
+            check images or fonts should use "full".
+        visual_checks (bool): Compare the final screen of passing tests with its visual
+            baseline. Defaults to the VISUAL_CHECKS setting.
         driver (WebDriver): The Selenium WebDriver instance.
     """
 
-    def __init__(self, url: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        pool: Optional[DriverPool] = None,
+        logged_in_as: Optional[str] = None,
+        capture_artifacts: Optional[bool] = None,
+        blocking_profile: Optional[str] = None,
+        context_host: Optional[ContextHost] = None,
+        scheduler: Optional[EndpointScheduler] = None
+    ) -> None:
         self.url = url if url else config("TEST_URL")
+        self.context_host = context_host if context_host else get_active_context_host()
+        self.pool = pool if pool or context_host else get_active_pool()
+        self.scheduler = scheduler if scheduler else get_active_scheduler()
+        self.logged_in_as = logged_in_as
+        self.capture_artifacts = (
+            capture_artifacts if capture_artifacts is not None
+            else config("CAPTURE_ARTIFACTS", default=False, cast=bool)
+        )
+        self.blocking_profile = blocking_profile if blocking_profile else BLOCKING_PROFILE
+        self.visual_checks = config("VISUAL_CHECKS", default=False, cast=bool)
         self.driver = None
+        self._pages: Dict[type, BasePage] = {}
+        self._resource_monitor: Optional[ResourceMonitor] = None
+        self._interceptor: Optional[NetworkInterceptor] = None
 
     def __enter__(self) -> "TestDriver":
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
+        if get_network_mode() == "replay" and REPLAY_MISSING == "fail":
+            cassette = Cassette.for_current_test()
+            if not cassette.exists:
+                raise CassetteMiss(f"No cassette at {cassette.path}; record it with --network-mode record.")
+        self._pages = {}
+        if self.pool:
+            self.driver = self.pool.lease()
+        elif self.context_host:
+            self.driver = self.context_host.new_context()
+        elif self.scheduler:
+            self.driver = self.scheduler.create_driver()
+        else:
+            prefetcher = get_active_prefetcher()
+            self.driver = prefetcher.take() if prefetcher else create_driver()
+        mark_browser_session_ran()
+        try:
+            command_tracer.attach(self.driver)
+            self._resource_monitor = ResourceMonitor.for_driver(self.driver)
+            if self._resource_monitor:
+                self._resource_monitor.start()
+
+            profile_changed = apply_blocking_profile(self.driver, self.blocking_profile)
+            self._interceptor = self._start_network_interception()
+            # Intercepted sessions reload, so the app's first backend calls are recorded or replayed too.
+            if not self.pool or profile_changed or self.url != self.pool.url or self._interceptor:
+                mark_navigation(self.driver)
+                self.driver.get(self.url)
+
+            self.home_page.wait_until_app_stable()
 
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.implicitly_wait(10)
-        self.driver.get(self.url)
+            if self.logged_in_as:
+                self.log_in(self.logged_in_as)
+        except BaseException:
+            # __exit__ does not run when __enter__ raises, so the session is given back here.
+            self._close_session()
+            raise
         return self
 
     def __exit__(
@@ -45,33 +165,219 @@ class TestDriver:
         exc_value: Optional[BaseException],
         exc_traceback: Optional[TracebackType]
     ) -> None:
-        if self.driver:
-            folder_name, test_name = get_test_context_from_stack()
-            if not test_name:
-                test_name = "no_test_name"
-            if not folder_name:
-                folder_name = "no_folder"
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            screenshots_dir = os.path.join(project_root, "screenshots")
-            os.makedirs(screenshots_dir, exist_ok=True)
-            screenshot_filename = f"{folder_name}_{test_name}_{timestamp}.png"
-            screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
-            self.driver.save_screenshot(screenshot_path)
-            self.driver.quit()
+        if not self.driver:
+            return
+        misses: List[str] = []
+        navigations: List[Dict[str, Any]] = []
+        resource_usage: Dict[str, float] = {}
+        # The session is released even when collecting metrics or artifacts fails.
+        try:
+            for name, value in self.element_cache_stats().items():
+                test_metrics.add(name, value)
+            for name, value in collect_network_usage(self.driver).items():
+                test_metrics.add(name, value)
+            misses = self._stop_network_interception(save=not exc_type)
+            navigations = page_performance.take(self.driver)
+            test_metrics.add("navigations_measured", len(navigations))
+            for name in ("lcp", "cls", "long_task_time"):
+                values = [record["metrics"][name] for record in navigations if name in record["metrics"]]
+                if values:
+                    test_metrics.record(name, max(values))
+            resource_usage = self._stop_resource_monitor()
+            for name, value in resource_usage.items():
+                if name.startswith("peak_"):
+                    test_metrics.record(name, value)
+                else:
+                    test_metrics.add(name, value)
+            if exc_type or self.capture_artifacts:
+                self.save_artifacts(exc_value)
+            if self.visual_checks and not exc_type:
+                self.check_visual("final")
+        finally:
+            self._close_session()
+        if resource_usage and not exc_type:
+            check_limits(resource_usage)
+        if not exc_type:
+            check_budgets(navigations)
+        if misses and not exc_type:
+            raise CassetteMiss("Requests missing from the cassette: " + "; ".join(misses))
+
+    def _stop_resource_monitor(self) -> Dict[str, float]:
+        """
+        Stop the resource monitor of the session, if it is running.
+
+        Returns:
+            Dict[str, float]: The usage summary, empty when nothing was monitored.
+        """
+        if not self._resource_monitor:
+            return {}
+        monitor, self._resource_monitor = self._resource_monitor, None
+        return monitor.stop()
+
+    def _close_session(self) -> None:
+        """
+        Stop whatever still runs on the session, then return the session to its pool
+        or quit it. Used by __exit__ and by __enter__ when the setup fails.
+        """
+        try:
+            self._stop_resource_monitor()
+            if self._interceptor:
+                self._stop_network_interception(save=False)
+        finally:
+            try:
+                if self.pool:
+                    self.pool.release(self.driver)
+                else:
+                    self.driver.quit()
+            finally:
+                command_tracer.detach(self.driver)
+
+    def _start_network_interception(self) -> Optional[NetworkInterceptor]:
+        """
+        Start recording or replaying the backend calls of the session, as set by
+        NETWORK_MODE or --network-mode.
+
+        Returns:
+            Optional[NetworkInterceptor]: The running interceptor, or None when the mode is "off".
+        """
+        mode = get_network_mode()
+        if mode == "off":
+            return None
+        # A new recording replaces the cassette rather than adding to it.
+        cassette = Cassette.for_current_test(load=mode == "replay")
+        return NetworkInterceptor(self.driver, cassette, mode).start()
+
+    def _stop_network_interception(self, save: bool) -> List[str]:
+        """
+        Stop the interceptor and, in record mode, write the cassette.
+
+        Args:
+            save (bool): Write the recorded cassette (only done for passing tests).
+
+        Returns:
+            List[str]: Keys of replayed requests missing from the cassette.
+        """
+        if not self._interceptor:
+            return []
+        interceptor, self._interceptor = self._interceptor, None
+        interceptor.stop()
+        if interceptor.mode == "record" and save:
+            interceptor.cassette.save()
+        return interceptor.misses
+
+    def save_artifacts(self, error: Optional[BaseException] = None) -> None:
+        """
+        Capture a screenshot, the DOM, the browser console log and the current URL,
+        and hand them to the background artifact writer, which stores them under the
+        running test in the artifact store.
+
+        Args:
+            error (Optional[BaseException]): The exception that failed the test, if any.
+        """
+        folder_name, test_name = get_test_context()
+        if not test_name:
+            test_name = "no_test_name"
+        if not folder_name:
+            folder_name = "no_folder"
+
+        def capture(action: Callable[[], Any], default: Any = None) -> Any:
+            try:
+                return action()
+            except WebDriverException:
+                return default
+
+        artifact_writer.submit(folder_name, test_name, FailureArtifacts(
+            screenshot_base64=capture(self.driver.get_screenshot_as_base64),
+            page_source=capture(lambda: self.driver.page_source),
+            console_log=capture(lambda: self.driver.get_log("browser"), []),
+            url=capture(lambda: self.driver.current_url),
+            error=repr(error) if error else None,
+        ))
+
+    def check_visual(self, step: str) -> int:
+        """
+        Compare a screenshot of the current screen with the visual baseline of this
+        test and step. The first capture of a step becomes its baseline.
+
+        Args:
+            step (str): Name of the step within the test, e.g. "pricing_step".
+
+        Returns:
+            int: The Hamming distance between the screenshot and baseline hashes.
+
+        Raises:
+            VisualRegressionError: If the screenshot differs from the baseline beyond
+                the VISUAL_HASH_TOLERANCE and VISUAL_PIXEL_TOLERANCE settings.
+        """
+        folder_name, test_name = get_test_context()
+        key = "/".join([folder_name or "no_folder", test_name or "no_test_name", step])
+        return visual_baseline.check(key, self.driver.get_screenshot_as_png())
+
+    def log_in(self, login: str) -> None:
+        """
+        Bring the session to the user profile of the given user.
+
+        Restores the cached login state when there is one and falls back to the UI
+        login flow when there is none or the server no longer accepts it.
+
+        Args:
+            login (str): Login of a user configured in TEST_USERS.
+        """
+        state = auth_state_cache.get(login)
+        if state:
+            inject_auth_state(self.driver, state)
+            try:
+                index, _ = self.user_profile_page.wait_for_any(
+                    UserProfilePageLocators.USER_FULL_NAME,
+                    HomePageLocators.LOGIN_BUTTON,
+                    timeout=config("AUTH_STATE_CHECK_TIMEOUT", default=5, cast=float)
+                )
+            except TimeoutException:
+                index = -1
+            if index == 0:
+                return
+            auth_state_cache.invalidate(login)
+            clean_session(self.driver, self.url)
+
+        self.home_page.go_to_login_page()
+        self.authentication_page.fill_login_form(login, get_user_password(login))
+        self.authentication_page.click_login_button()
+        self.user_profile_page.is_user_logged_in()
+        auth_state_cache.put(login, capture_auth_state(self.driver))
+
+    def element_cache_stats(self) -> Dict[str, int]:
+        """
+        Sum the element cache counters of the page objects used in this session.
+
+        Returns:
+            Dict[str, int]: Number of cache hits and misses.
+        """
+        return {
+            "element_cache_hits": sum(page.element_cache.hits for page in self._pages.values()),
+            "element_cache_misses": sum(page.element_cache.misses for page in self._pages.values()),
+        }
+
+    def _page(self, page_class: Type[PageT]) -> PageT:
+        """
+        Return the page object of the given class, creating it on first use so its
+        element cache is shared by every access within the session.
+        """
+        if page_class not in self._pages:
+            self._pages[page_class] = page_class(self.driver)
+        return self._pages[page_class]
 
     @property
     def home_page(self) -> HomePage:
-        return HomePage(self.driver)
+        return self._page(HomePage)
 
     @property
     def authentication_page(self) -> AuthenticationPage:
-        return AuthenticationPage(self.driver)
+        return self._page(AuthenticationPage)
 
     @property
     def user_profile_page(self) -> UserProfilePage:
-        return UserProfilePage(self.driver)
+        return self._page(UserProfilePage)
 
     @property
     def ticket_page(self) -> TicketPage:
-        return TicketPage(self.driver)
+        return self._page(TicketPage)
@@ -0,0 +1,267 @@
+import os
+from typing import Iterator, Optional
+
+import pytest
+from decouple import config
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.browser_contexts import ContextHost, set_active_context_host
+from configuration.driver_factory import create_driver
+from configuration.driver_pool import DriverPool, set_active_pool
+from configuration.endpoints import EndpointScheduler, LocalNodes, parse_endpoints, set_active_scheduler
+from configuration.network_replay import NETWORK_MODES, get_network_mode, set_network_mode
+from configuration.prefetch import DriverPrefetcher, set_active_prefetcher
+from configuration.test_driver import browser_session_ran, mark_browser_session_ran
+from stand_in.server import StandInServer
+from utils.artifact_store import apply_retention
+from utils.artifacts import artifact_writer
+from utils.command_tracer import CommandTracePlugin, command_tracer
+from utils.helpers import get_worker_id
+from utils.impact_index import IMPACT_INDEX_PATH, ImpactIndex, ImpactPlugin
+from utils.page_performance import page_performance
+from utils.parallel import WorkerReportPlugin
+from utils.test_metrics import TestMetricsPlugin
+
+
+STAND_IN_KEY = pytest.StashKey[StandInServer]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("driver pool")
+    group.addoption(
+        "--pool-size",
+        type=int,
+        default=config("DRIVER_POOL_SIZE", default=1, cast=int),
+        help="Number of warm WebDriver sessions kept for the run (0 disables pooling).",
+    )
+    group.addoption(
+        "--pool-max-uses",
+        type=int,
+        default=config("DRIVER_POOL_MAX_USES", default=25, cast=int),
+        help="Number of tests a pooled session serves before it is recycled.",
+    )
+    group.addoption(
+        "--prefetch-depth",
+        type=int,
+        default=config("DRIVER_PREFETCH_DEPTH", default=None),
+        help=(
+            "Number of WebDriver sessions started ahead in the background (0 disables prefetching). "
+            "Defaults to 1; with a driver pool, sessions are then only started ahead of recycling."
+        ),
+    )
+
+    group.addoption(
+        "--endpoints",
+        default=config("WEBDRIVER_ENDPOINTS", default=""),
+        metavar="URL[*N],...",
+        help="Start sessions on these chromedriver/Remote endpoints, N sessions each (disables prefetch).",
+    )
+    group.addoption(
+        "--local-nodes",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Start N local chromedriver processes as endpoints for the run (disables prefetch).",
+    )
+    group.addoption(
+        "--browser-contexts",
+        action="store_true",
+        default=config("BROWSER_CONTEXTS", default=False, cast=bool),
+        help=(
+            "Run every TestDriver in its own browser context of one shared Chrome instead of pooled sessions "
+            "(disables pool and prefetch)."
+        ),
+    )
+
+    group = parser.getgroup("stand-in")
+    group.addoption(
+        "--stand-in",
+        action="store_true",
+        default=False,
+        help="Serve a local stand-in of the Renk app for the run and point TEST_URL at it.",
+    )
+
+    group = parser.getgroup("network replay")
+    group.addoption(
+        "--network-mode",
+        choices=NETWORK_MODES,
+        default=get_network_mode(),
+        help="Record backend calls into per-test cassettes, or replay them from the cassettes (also NETWORK_MODE).",
+    )
+
+    group = parser.getgroup("tracing")
+    group.addoption(
+        "--trace-commands",
+        action="store_true",
+        default=False,
+        help="Trace WebDriver commands and page object calls into traces/ (also TRACE_COMMANDS).",
+    )
+
+    group = parser.getgroup("impact")
+    group.addoption(
+        "--changed-since",
+        default=None,
+        metavar="REV",
+        help="Run only the tests affected by changes since a git revision, using the recorded impact index.",
+    )
+
+    group = parser.getgroup("parallel")
+    group.addoption(
+        "--worker-report",
+        default=None,
+        help="Write per-test durations of this process to a JSON file (used by utils.parallel).",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.pluginmanager.register(TestMetricsPlugin(), "test-metrics")
+    config.pluginmanager.register(
+        ImpactPlugin(ImpactIndex(IMPACT_INDEX_PATH), config.getoption("--changed-since")), "impact"
+    )
+    set_network_mode(config.getoption("--network-mode"))
+    if config.getoption("--trace-commands"):
+        command_tracer.enabled = True
+    if command_tracer.enabled:
+        config.pluginmanager.register(CommandTracePlugin(), "command-trace")
+    if config.getoption("--stand-in"):
+        stand_in = StandInServer().start()
+        config.stash[STAND_IN_KEY] = stand_in
+        os.environ["TEST_URL"] = stand_in.url
+    report_path = config.getoption("--worker-report")
+    if report_path:
+        config.pluginmanager.register(WorkerReportPlugin(report_path, get_worker_id()), "worker-report")
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    # Unit-only runs never start a browser and leave the artifact store and perf_metrics/ alone.
+    if not browser_session_ran():
+        return
+    artifact_writer.flush()
+    apply_retention()
+    page_performance.save()
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    stand_in = config.stash.get(STAND_IN_KEY, None)
+    if stand_in:
+        stand_in.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def endpoint_scheduler(request: pytest.FixtureRequest) -> Iterator[Optional[EndpointScheduler]]:
+    """
+    Session-wide scheduler spreading WebDriver sessions across --endpoints and --local-nodes.
+    """
+    endpoints = parse_endpoints(request.config.getoption("--endpoints"))
+    nodes = LocalNodes(request.config.getoption("--local-nodes"))
+    if nodes.count > 0:
+        endpoints.extend(nodes.start())
+    if not endpoints:
+        yield None
+        return
+
+    scheduler = EndpointScheduler(endpoints)
+    set_active_scheduler(scheduler)
+    try:
+        yield scheduler
+    finally:
+        set_active_scheduler(None)
+        nodes.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def driver_prefetcher(
+    request: pytest.FixtureRequest,
+    endpoint_scheduler: Optional[EndpointScheduler]
+) -> Iterator[Optional[DriverPrefetcher]]:
+    """
+    Session-wide prefetcher starting the next WebDriver sessions while tests run.
+    """
+    depth: Optional[int] = request.config.getoption("--prefetch-depth")
+    pooled = request.config.getoption("--pool-size") > 0
+    # Pooled sessions are reused, so by default sessions are only prefetched when the pool asks for one.
+    refill = depth is not None or not pooled
+    if depth is None:
+        depth = 1
+    if depth <= 0 or request.config.getoption("--browser-contexts") or endpoint_scheduler:
+        yield None
+        return
+
+    prefetcher = DriverPrefetcher(depth=depth, refill=refill)
+    set_active_prefetcher(prefetcher)
+    try:
+        yield prefetcher
+    finally:
+        set_active_prefetcher(None)
+        prefetcher.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def driver_pool(
+    request: pytest.FixtureRequest,
+    driver_prefetcher: Optional[DriverPrefetcher],
+    endpoint_scheduler: Optional[EndpointScheduler]
+) -> Iterator[Optional[DriverPool]]:
+    """
+    Session-wide pool of warm WebDriver sessions used by every TestDriver. New and
+    recycled sessions are started through the endpoint scheduler when endpoints are
+    configured, and taken from the prefetcher when prefetching is enabled.
+    """
+    size: int = request.config.getoption("--pool-size")
+    if size <= 0 or request.config.getoption("--browser-contexts"):
+        yield None
+        return
+
+    pool = DriverPool(
+        size=size,
+        max_uses=request.config.getoption("--pool-max-uses"),
+        driver_factory=(
+            endpoint_scheduler.create_driver if endpoint_scheduler
+            else driver_prefetcher.take if driver_prefetcher
+            else create_driver
+        ),
+        prefetch=driver_prefetcher.prefetch if driver_prefetcher and not endpoint_scheduler else None,
+    )
+    set_active_pool(pool)
+    try:
+        yield pool
+    finally:
+        set_active_pool(None)
+        pool.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def context_host(
+    request: pytest.FixtureRequest,
+    endpoint_scheduler: Optional[EndpointScheduler]
+) -> Iterator[Optional[ContextHost]]:
+    """
+    Session-wide Chrome hosting one browser context per TestDriver, with --browser-contexts.
+    """
+    if not request.config.getoption("--browser-contexts"):
+        yield None
+        return
+
+    host = ContextHost(endpoint_scheduler.create_driver) if endpoint_scheduler else ContextHost()
+    set_active_context_host(host)
+    try:
+        yield host
+    finally:
+        set_active_context_host(None)
+        host.close()
+
+
+@pytest.fixture
+def pooled_driver(driver_pool: Optional[DriverPool]) -> Iterator[WebDriver]:
+    """
+    A raw WebDriver session leased from the pool for the duration of one test.
+    """
+    pool = driver_pool if driver_pool else DriverPool(size=1)
+    driver = pool.lease()
+    mark_browser_session_ran()
+    try:
+        yield driver
+    finally:
+        pool.release(driver)
+        if pool is not driver_pool:
+            pool.close()
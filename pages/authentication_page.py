@@ -1,5 +1,6 @@
 from selenium.webdriver.common.by import By
-from pages.base_page import BasePage
+from pages.base_page import AssertionWrapper, BasePage
+from pages.user_profile_page import UserProfilePageLocators
 
 
 class AuthenticationPageLocators:
@@ -37,8 +38,10 @@ class AuthenticationPage(BasePage):
             login (str): The username to be entered.
             password (str): The password to be entered.
         """
-        self.fill(AuthenticationPageLocators.USERNAME_FORM, login)
-        self.fill(AuthenticationPageLocators.PASSWORD_FORM, password)
+        self.fill_many({
+            AuthenticationPageLocators.USERNAME_FORM: login,
+            AuthenticationPageLocators.PASSWORD_FORM: password,
+        })
 
     def click_login_button(self) -> None:
         """
@@ -52,10 +55,18 @@ class AuthenticationPage(BasePage):
         """
         Check if the 'user not found' alert is displayed.
 
+        Fails as soon as the user profile shows up instead of the alert.
+
         Returns:
             bool: True if the alert is displayed, False otherwise.
         """
-        return self.assert_that(AuthenticationPageLocators.USER_NOT_FOUND_ALERT).is_displayed()
+        index, element = self.wait_for_any(
+            AuthenticationPageLocators.USER_NOT_FOUND_ALERT,
+            UserProfilePageLocators.USER_FULL_NAME
+        )
+        if index != 0:
+            raise AssertionError("The user was logged in instead of seeing the 'user not found' alert!")
+        return AssertionWrapper(element).is_displayed()
 
     def is_login_button_displayed(self) -> bool:
         """
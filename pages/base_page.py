@@ -1,19 +1,445 @@
-from typing import Tuple, Any, Callable
-from selenium.common.exceptions import ElementNotVisibleException
-from selenium.webdriver.support.ui import WebDriverWait
+import functools
+import inspect
+import time
+import weakref
+from typing import Tuple, Any, Callable, Collection, Dict, List, Mapping, Optional, Sequence, Union
+from decouple import config
+from selenium.common.exceptions import (
+    ElementNotVisibleException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
+from utils.command_tracer import command_tracer
+from utils.impact_index import method_symbol, usage_recorder
+from utils.page_performance import page_performance
+
+
+Condition = Callable[[WebDriver], Any]
+Locator = Tuple[str, str]
+
+WAIT_TIMEOUT: float = config("WAIT_TIMEOUT", default=10, cast=float)
+WAIT_POLL_FREQUENCY: float = config("WAIT_POLL_FREQUENCY", default=0.05, cast=float)
+WAIT_BACKOFF: float = config("WAIT_BACKOFF", default=1.5, cast=float)
+WAIT_MAX_POLL_FREQUENCY: float = config("WAIT_MAX_POLL_FREQUENCY", default=0.5, cast=float)
+APP_STABLE_QUIET_PERIOD: float = config("APP_STABLE_QUIET_PERIOD", default=0.2, cast=float)
+
+_navigation_counts: "weakref.WeakKeyDictionary[WebDriver, int]" = weakref.WeakKeyDictionary()
+_navigation_started: "weakref.WeakKeyDictionary[WebDriver, Optional[float]]" = weakref.WeakKeyDictionary()
+
+
+def mark_navigation(driver: WebDriver, measure: bool = True, timed: bool = True, reload: bool = True) -> None:
+    """
+    Record that the page shown by a driver may have changed.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        measure (bool, optional): Measure the performance of the navigation once the
+            next wait_until_app_stable() completes. Call before the navigation starts.
+        timed (bool, optional): Report the time until the app is stable as
+            navigation_time. Pass False when that wait happens later, e.g. for a
+            pooled session loaded before it is leased.
+        reload (bool, optional): A new document is loaded (driver.get, refresh), which
+            invalidates the element caches of every page object using the driver. Pass
+            False for actions that may only change the route of the single-page app,
+            e.g. a click; cached elements that went away are then detected as stale.
+    """
+    if reload:
+        _navigation_counts[driver] = _navigation_counts.get(driver, 0) + 1
+    if measure:
+        _navigation_started[driver] = time.perf_counter() if timed else None
+    else:
+        _navigation_started.pop(driver, None)
+
+
+# Resolves a Selenium locator (by, value) to the first matching element in the page.
+LOCATE_ELEMENT_JS = """
+function locate(by, value) {
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'class name': return document.getElementsByClassName(value)[0] || null;
+        case 'tag name': return document.getElementsByTagName(value)[0] || null;
+        case 'css selector': return document.querySelector(value);
+        case 'xpath': return document.evaluate(
+            value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        case 'link text': return Array.prototype.find.call(
+            document.getElementsByTagName('a'), function (a) { return a.innerText.trim() === value; }
+        ) || null;
+    }
+    return null;
+}
+"""
+
+# Sets input values the way a user would, so Angular reactive forms see the change:
+# the native value setter bypasses framework property patches, 'input' updates the
+# FormControl value, 'change' and 'blur'/'focusout' mark it dirty and touched.
+# Selects take the option whose value or text matches. Elements without a native
+# value setter (contenteditable, checkboxes, file inputs) are skipped and typed instead.
+FILL_MANY_JS = LOCATE_ELEMENT_JS + """
+var fields = arguments[0];
+var skipped = [];
+var missingOptions = [];
+var TYPED_INPUTS = ['checkbox', 'radio', 'file'];
+fields.forEach(function (field, index) {
+    try {
+        var element = locate(field[0], field[1]);
+        if (!element || element.disabled || element.readOnly || !element.getClientRects().length) {
+            skipped.push(index);
+            return;
+        }
+        var prototype = null;
+        var value = field[2];
+        if (element instanceof HTMLInputElement && TYPED_INPUTS.indexOf(element.type) < 0) {
+            prototype = HTMLInputElement.prototype;
+        } else if (element instanceof HTMLTextAreaElement) {
+            prototype = HTMLTextAreaElement.prototype;
+        } else if (element instanceof HTMLSelectElement) {
+            var option = Array.prototype.find.call(element.options, function (option) {
+                return option.value === value || option.text.trim() === value;
+            });
+            if (!option) {
+                missingOptions.push(index);
+                return;
+            }
+            prototype = HTMLSelectElement.prototype;
+            value = option.value;
+        }
+        if (!prototype) {
+            skipped.push(index);
+            return;
+        }
+        element.focus();
+        Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        element.dispatchEvent(new FocusEvent('blur'));
+        element.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+    } catch (error) {
+        skipped.push(index);
+    }
+});
+return [skipped, missingOptions];
+"""
+
+# Reads the state of many elements at once; null for locators matching nothing.
+SNAPSHOT_JS = LOCATE_ELEMENT_JS + """
+var locators = arguments[0];
+var attributeNames = arguments[1];
+return locators.map(function (locator) {
+    var element = locate(locator[0], locator[1]);
+    if (!element) { return null; }
+    var style = window.getComputedStyle(element);
+    var attributes = {};
+    attributeNames.forEach(function (name) { attributes[name] = element.getAttribute(name); });
+    return {
+        displayed: element.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0',
+        enabled: !element.disabled,
+        selected: !!(element.selected || element.checked),
+        text: (element.innerText || element.textContent || '').trim(),
+        value: element.value === undefined ? null : String(element.value),
+        attributes: attributes
+    };
+});
+"""
+
+
+# Installed in every new document (see driver_factory.create_driver) and, idempotently,
+# by APP_STATE_JS: counts pending XHR/fetch requests and records the last DOM mutation.
+APP_HOOKS_JS = """
+(function () {
+    if (window.__appHooks) { return; }
+    var hooks = window.__appHooks = {pending: 0, lastMutation: Date.now()};
+    var done = function () { hooks.pending = Math.max(hooks.pending - 1, 0); };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            hooks.pending++;
+            var request = fetch.apply(this, arguments);
+            request.then(done, done);
+            return request;
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        hooks.pending++;
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    new MutationObserver(function () { hooks.lastMutation = Date.now(); }).observe(
+        document, {childList: true, subtree: true, attributes: true, characterData: true}
+    );
+    // Read by utils.page_performance.COLLECT_METRICS_JS.
+    var perf = hooks.perf = {measuredAt: 0, lcp: 0, shifts: [], longTasks: []};
+    var observe = function (type, callback) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+                .observe({type: type, buffered: true});
+        } catch (error) {}
+    };
+    if (window.PerformanceObserver) {
+        observe('largest-contentful-paint', function (entry) { perf.lcp = entry.startTime; });
+        observe('layout-shift', function (entry) {
+            if (!entry.hadRecentInput) { perf.shifts.push([entry.startTime, entry.value]); }
+        });
+        observe('longtask', function (entry) { perf.longTasks.push([entry.startTime, entry.duration]); });
+    }
+})();
+"""
+
+APP_STATE_JS = APP_HOOKS_JS + """
+var hooks = window.__appHooks;
+var testabilities = window.getAllAngularTestabilities ? window.getAllAngularTestabilities() : [];
+return {
+    loaded: document.readyState !== 'loading',
+    zonesStable: testabilities.every(function (testability) { return testability.isStable(); }),
+    pendingRequests: hooks.pending,
+    quietFor: (Date.now() - hooks.lastMutation) / 1000,
+    url: window.location.href
+};
+"""
+
+
+# Locator-based expected conditions and their equivalents for an already located element.
+ELEMENT_CONDITIONS: Dict[Callable[[Locator], Condition], Callable[[WebElement], Condition]] = {
+    ec.visibility_of_element_located: ec.visibility_of,
+    ec.element_to_be_clickable: ec.element_to_be_clickable,
+    ec.presence_of_element_located: lambda element: lambda driver: element.tag_name and element,
+}
+
+
+class Wait:
+    """
+    Wait is the single wait engine used by page objects. It polls a condition until
+    it returns a truthy value, starting with a short poll interval that grows by a
+    backoff factor up to a maximum, so fast conditions return almost immediately
+    while slow ones do not flood the driver with commands.
+
+    Page objects rely on it exclusively: the driver implicit wait stays at 0, so
+    timeouts never compound.
+    """
+
+    def __init__(
+        self,
+        timeout: float = WAIT_TIMEOUT,
+        poll_frequency: float = WAIT_POLL_FREQUENCY,
+        backoff: float = WAIT_BACKOFF,
+        max_poll_frequency: float = WAIT_MAX_POLL_FREQUENCY,
+        ignored_exceptions: Tuple[type, ...] = (NoSuchElementException, StaleElementReferenceException),
+    ) -> None:
+        """
+        Initialize the Wait engine.
+
+        Args:
+            timeout (float, optional): Default maximum time to wait, in seconds.
+            poll_frequency (float, optional): Delay before the second poll, in seconds.
+            backoff (float, optional): Factor the poll delay is multiplied by after each poll.
+            max_poll_frequency (float, optional): Upper bound of the poll delay, in seconds.
+            ignored_exceptions (Tuple[type, ...], optional): Exceptions treated as
+                "condition not met yet".
+        """
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.backoff = backoff
+        self.max_poll_frequency = max_poll_frequency
+        self.ignored_exceptions = ignored_exceptions
+
+    def until(
+        self,
+        driver: WebDriver,
+        condition: Condition,
+        timeout: Optional[float] = None,
+        message: str = "",
+    ) -> Any:
+        """
+        Wait until a condition returns a truthy value.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance passed to the condition.
+            condition (Condition): Callable taking the driver and returning a value.
+            timeout (float, optional): Maximum time to wait. Defaults to the engine timeout.
+            message (str, optional): Message of the TimeoutException.
+
+        Returns:
+            Any: The first truthy value returned by the condition.
+
+        Raises:
+            TimeoutException: If the condition is not met in time.
+        """
+        _, value = self.until_any(driver, [condition], timeout, message)
+        return value
+
+    def until_any(
+        self,
+        driver: WebDriver,
+        conditions: Sequence[Condition],
+        timeout: Optional[float] = None,
+        message: str = "",
+    ) -> Tuple[int, Any]:
+        """
+        Wait until any of several conditions returns a truthy value. Conditions are
+        evaluated in order on every poll.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance passed to the conditions.
+            conditions (Sequence[Condition]): Callables taking the driver and returning a value.
+            timeout (float, optional): Maximum time to wait. Defaults to the engine timeout.
+            message (str, optional): Message of the TimeoutException.
+
+        Returns:
+            Tuple[int, Any]: Index of the condition that was met and the value it returned.
+
+        Raises:
+            TimeoutException: If none of the conditions is met in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        delay = self.poll_frequency
+        last_exception: Optional[Exception] = None
+        while True:
+            for index, condition in enumerate(conditions):
+                try:
+                    value = condition(driver)
+                except self.ignored_exceptions as exception:
+                    last_exception = exception
+                    continue
+                if value:
+                    return index, value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message, getattr(last_exception, "screen", None),
+                                       getattr(last_exception, "stacktrace", None))
+            time.sleep(min(delay, remaining))
+            delay = min(delay * self.backoff, self.max_poll_frequency)
+
+
+class ElementCache:
+    """
+    ElementCache keeps the elements a page object located, keyed by locator tuple,
+    so consecutive calls on the same locator skip the lookup.
+
+    The cache is cleared when a new document is loaded (mark_navigation() with
+    reload) or a different URL is noted, and single entries are dropped when the
+    element has gone stale. A hit still checks the element's condition (e.g. one
+    is_displayed call for visibility), but skips the find_element command.
+
+    Attributes:
+        hits (int): Number of waits satisfied by a cached element.
+        misses (int): Number of waits that had to locate the element.
+    """
+
+    def __init__(self, driver: WebDriver) -> None:
+        """
+        Initialize the ElementCache.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance the elements belong to.
+        """
+        self.driver: WebDriver = driver
+        self.hits: int = 0
+        self.misses: int = 0
+        self._elements: Dict[Locator, WebElement] = {}
+        self._navigation_count: int = _navigation_counts.get(driver, 0)
+        self._url: Optional[str] = None
+
+    def get(self, locator: Locator) -> Optional[WebElement]:
+        """
+        Return the cached element of a locator.
+
+        Args:
+            locator (Locator): Locator tuple of the element.
+
+        Returns:
+            Optional[WebElement]: The cached element, or None.
+        """
+        navigation_count = _navigation_counts.get(self.driver, 0)
+        if navigation_count != self._navigation_count:
+            self._elements.clear()
+            self._navigation_count = navigation_count
+        return self._elements.get(locator)
+
+    def put(self, locator: Locator, element: WebElement) -> None:
+        """
+        Cache the element found for a locator.
+
+        Args:
+            locator (Locator): Locator tuple of the element.
+            element (WebElement): The located element.
+        """
+        self._elements[locator] = element
+
+    def invalidate(self, locator: Optional[Locator] = None) -> None:
+        """
+        Drop one cached element, or all of them.
+
+        Args:
+            locator (Locator, optional): Locator tuple to drop. Defaults to all.
+        """
+        if locator is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(locator, None)
+
+    def note_url(self, url: str) -> None:
+        """
+        Tell the cache which URL the browser shows; a change clears the cache.
+
+        Args:
+            url (str): The current URL.
+        """
+        if url != self._url:
+            self._elements.clear()
+            self._url = url
+
+
+def uninstrumented(method: Callable) -> Callable:
+    """
+    Mark a public page object method that sends no WebDriver command, so that it is
+    neither recorded nor traced (see BasePage).
+    """
+    method.instrumented = False
+    return method
+
 
 class BasePage:
     """
     BasePage encapsulates common Selenium WebDriver interactions for page objects.
     It provides methods to click elements, fill input fields, wait for elements,
     and perform assertions on elements.
+
+    Located elements are kept in a per-page ElementCache and re-used by later
+    calls on the same locator until they go stale or a new document loads. Actions
+    on an element that goes stale between the wait and the action are retried once
+    on a freshly located element.
+
+    All waiting goes through a single Wait engine. Page objects may override the
+    timeout of individual locators in TIMEOUTS, e.g. for elements that appear only
+    after a slow backend call.
+
+    Navigations waited for with wait_until_app_stable() are measured by
+    utils.page_performance and checked against the PERFORMANCE_BUDGETS of the page
+    class, e.g. {"lcp": 2.5} for a largest contentful paint under 2.5 seconds.
+
+    Public methods of BasePage and its subclasses are instrumented, except those
+    marked uninstrumented because they send no WebDriver command: their calls are
+    recorded by utils.impact_index and, when TRACE_COMMANDS is enabled, traced by
+    utils.command_tracer.
     """
 
+    TIMEOUTS: Dict[Locator, float] = {}
+    PERFORMANCE_BUDGETS: Dict[str, float] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _instrument_public_methods(cls)
+
     def __init__(self, driver: WebDriver) -> None:
         """
         Initialize the BasePage with a Selenium WebDriver instance.
@@ -22,84 +448,361 @@ class BasePage:
             driver (WebDriver): The Selenium WebDriver instance.
         """
         self.driver: WebDriver = driver
+        self.wait: Wait = Wait()
+        self.element_cache: ElementCache = ElementCache(driver)
 
-    def click(self, locator: Tuple[str, str], timeout: int = 10) -> None:
+    @uninstrumented
+    def timeout_for(self, locator: Locator, timeout: Optional[float] = None) -> float:
+        """
+        Resolve the timeout to use for a locator.
+
+        Args:
+            locator (Locator): Locator tuple to find the element.
+            timeout (float, optional): Explicit timeout, which takes precedence over
+                the TIMEOUTS override and the engine default.
+
+        Returns:
+            float: The timeout in seconds.
+        """
+        if timeout is not None:
+            return timeout
+        return self.TIMEOUTS.get(locator, self.wait.timeout)
+
+    def click(self, locator: Locator, timeout: Optional[float] = None) -> None:
         """
         Click an element after waiting for it to be clickable.
 
         Args:
-            locator (Tuple[str, str]): Locator tuple to find the element.
-            timeout (int, optional): Maximum time to wait for the element. Defaults to 10.
+            locator (Locator): Locator tuple to find the element.
+            timeout (float, optional): Maximum time to wait for the element.
+                Defaults to the locator timeout.
         """
-        element: WebElement = self.wait_for_element(
-            locator, exp_con=ec.element_to_be_clickable, timeout=timeout
-        )
-        element.click()
+        self._act(locator, lambda element: element.click(), timeout)
+        mark_navigation(self.driver, reload=False)
 
-    def click_with_action_chains(self, locator: Tuple[str, str], timeout: int = 10) -> None:
+    def click_with_action_chains(self, locator: Locator, timeout: Optional[float] = None) -> None:
         """
         Click an element using ActionChains. Useful for complex elements like dropdowns or hover menus.
 
         Args:
-            locator (Tuple[str, str]): Locator tuple to find the element.
-            timeout (int, optional): Maximum time to wait for the element. Defaults to 10.
+            locator (Locator): Locator tuple to find the element.
+            timeout (float, optional): Maximum time to wait for the element.
+                Defaults to the locator timeout.
         """
-        element: WebElement = self.wait_for_element(
-            locator, exp_con=ec.element_to_be_clickable, timeout=timeout
+        self._act(
+            locator, lambda element: ActionChains(self.driver).move_to_element(element).click().perform(), timeout
         )
-        actions = ActionChains(self.driver)
-        actions.move_to_element(element).click().perform()
+        mark_navigation(self.driver, reload=False)
 
-    def fill(self, locator: Tuple[str, str], text: str, clear_first: bool = True) -> None:
+    def fill(
+        self,
+        locator: Locator,
+        text: str,
+        clear_first: bool = True,
+        timeout: Optional[float] = None
+    ) -> None:
         """
         Fill an input field with text after waiting for it to be clickable.
 
         Args:
-            locator (Tuple[str, str]): Locator tuple to find the input element.
+            locator (Locator): Locator tuple to find the input element.
             text (str): The text to enter.
             clear_first (bool, optional): Whether to clear the field before typing. Defaults to True.
+            timeout (float, optional): Maximum time to wait for the element.
+                Defaults to the locator timeout.
         """
-        element: WebElement = self.wait_for_element(
-            locator, exp_con=ec.element_to_be_clickable, timeout=10
-        )
-        if clear_first:
-            element.clear()
-        element.send_keys(text)
+        def type_text(element: WebElement) -> None:
+            if clear_first:
+                element.clear()
+            element.send_keys(text)
+
+        self._act(locator, type_text, timeout)
+
+    def _act(self, locator: Locator, action: Callable[[WebElement], Any], timeout: Optional[float]) -> None:
+        # The element may be re-rendered between the wait and the action, e.g. by a
+        # change detection run; one retry on a freshly located element covers that.
+        element: WebElement = self.wait_for_element(locator, exp_con=ec.element_to_be_clickable, timeout=timeout)
+        try:
+            action(element)
+        except StaleElementReferenceException:
+            self.element_cache.invalidate(locator)
+            action(self.wait_for_element(locator, exp_con=ec.element_to_be_clickable, timeout=timeout))
+
+    def fill_many(
+        self,
+        values: Mapping[Union[Locator, str], str],
+        typed: Collection[Union[Locator, str]] = (),
+    ) -> None:
+        """
+        Fill several input, textarea and select fields in a single script execution.
+
+        Fields are given by locator tuple or by their Angular ``formcontrolname``.
+        The script dispatches the input, change and blur events Angular needs to
+        update the form's value and validity; a select takes the option whose value
+        or text matches. Fields listed in typed (e.g. masked inputs that react to key
+        events), other elements (e.g. contenteditable), and fields that are not yet
+        present, visible and enabled, fall back to fill(), which waits and types key by key.
+
+        Args:
+            values (Mapping[Union[Locator, str], str]): Text to enter by locator or formcontrolname.
+            typed (Collection[Union[Locator, str]], optional): Fields that must be typed key by key.
+
+        Raises:
+            ValueError: If a select has no option matching the given text.
+        """
+        fields: List[Tuple[Locator, str]] = [
+            (self.form_control(field) if isinstance(field, str) else field, text)
+            for field, text in values.items()
+        ]
+        typed_locators = {self.form_control(field) if isinstance(field, str) else field for field in typed}
+        scripted = [(locator, text) for locator, text in fields if locator not in typed_locators]
+
+        skipped: List[int] = []
+        missing_options: List[int] = []
+        if scripted:
+            skipped, missing_options = self.driver.execute_script(
+                FILL_MANY_JS, [[locator[0], locator[1], text] for locator, text in scripted]
+            )
+        if missing_options:
+            unmatched = [f"{scripted[index][0]} = {scripted[index][1]!r}" for index in missing_options]
+            raise ValueError(f"No option matches: {', '.join(unmatched)}")
+        fallback = [scripted[index] for index in skipped]
+        fallback += [(locator, text) for locator, text in fields if locator in typed_locators]
+        for locator, text in fallback:
+            self.fill(locator, text)
+
+    def snapshot(
+        self,
+        locators: Union[type, Mapping[str, Locator], Sequence[Locator]],
+        attributes: Sequence[str] = (),
+        until_present: bool = False,
+        timeout: Optional[float] = None,
+    ) -> "Snapshot":
+        """
+        Read presence, visibility, enabled and selected state, text, value and the given
+        attributes of many elements in a single script execution.
+
+        Args:
+            locators (Union[type, Mapping[str, Locator], Sequence[Locator]]): A locator class
+                such as UserProfilePageLocators (every locator attribute is read), a mapping
+                of names to locators, or a sequence of locators.
+            attributes (Sequence[str], optional): Names of HTML attributes to read.
+            until_present (bool, optional): Wait until every element is present before
+                returning. Defaults to False, which reads the page as it is.
+            timeout (float, optional): Maximum time to wait when until_present is set.
+                Defaults to the engine timeout.
+
+        Returns:
+            Snapshot: The state of every element, by name.
+
+        Raises:
+            TimeoutException: If until_present is set and an element does not appear in time.
+        """
+        if isinstance(locators, type):
+            named = {
+                name: value for name, value in vars(locators).items()
+                if not name.startswith("_") and isinstance(value, tuple) and len(value) == 2
+            }
+        elif isinstance(locators, Mapping):
+            named = dict(locators)
+        else:
+            named = {f"{by}={value}": (by, value) for by, value in locators}
+        arguments = ([list(locator) for locator in named.values()], list(attributes))
+
+        def read(driver: WebDriver) -> Optional[List[Optional[Dict[str, Any]]]]:
+            states = driver.execute_script(SNAPSHOT_JS, *arguments)
+            return states if not until_present or all(states) else None
+
+        if until_present:
+            states = self.wait.until(
+                self.driver, read, timeout, f"Elements of {', '.join(named)} are not all present"
+            )
+        else:
+            states = read(self.driver)
+        return Snapshot({
+            name: ElementState(locator, state) for (name, locator), state in zip(named.items(), states)
+        })
+
+    @staticmethod
+    def form_control(name: str) -> Locator:
+        """
+        Build the locator of an Angular reactive form control.
+
+        Args:
+            name (str): The formcontrolname of the control.
+
+        Returns:
+            Locator: A CSS locator matching the control.
+        """
+        return By.CSS_SELECTOR, f"[formcontrolname='{name}']"
 
     def wait_for_element(
         self,
-        locator: Tuple[str, str],
-        exp_con: Callable[[Tuple[str, str]], Any] = ec.visibility_of_element_located,
-        timeout: int = 10,
+        locator: Locator,
+        exp_con: Callable[[Locator], Condition] = ec.visibility_of_element_located,
+        timeout: Optional[float] = None,
     ) -> WebElement:
         """
         Wait for an element to meet a specified expected condition.
 
+        For the element conditions in ELEMENT_CONDITIONS, a cached element that
+        still meets the condition is returned without locating it again.
+
         Args:
-            locator (Tuple[str, str]): Locator tuple to find the element.
-            exp_con (Callable[[Tuple[str, str]], Any], optional): Expected condition function.
+            locator (Locator): Locator tuple to find the element.
+            exp_con (Callable[[Locator], Condition], optional): Expected condition function.
                 Defaults to ec.visibility_of_element_located.
-            timeout (int, optional): Maximum time to wait for the element. Defaults to 10.
+            timeout (float, optional): Maximum time to wait for the element.
+                Defaults to the locator timeout.
 
         Returns:
             WebElement: The located web element once the expected condition is satisfied.
         """
-        return WebDriverWait(self.driver, timeout).until(exp_con(locator))
+        element_condition = ELEMENT_CONDITIONS.get(exp_con)
+        if element_condition is None:
+            condition = exp_con(locator)
+        else:
+            cached = self.element_cache.get(locator)
+            if cached is not None:
+                try:
+                    if element_condition(cached)(self.driver):
+                        self.element_cache.hits += 1
+                        return cached
+                except StaleElementReferenceException:
+                    pass
+                self.element_cache.invalidate(locator)
+            self.element_cache.misses += 1
 
-    def assert_that(self, locator: Tuple[str, str]) -> "AssertionWrapper":
+            def condition(driver: WebDriver) -> Any:
+                element = exp_con(locator)(driver)
+                if isinstance(element, WebElement):
+                    self.element_cache.put(locator, element)
+                return element
+
+        return self.wait.until(
+            self.driver,
+            condition,
+            timeout=self.timeout_for(locator, timeout),
+            message=f"Timed out waiting for {getattr(exp_con, '__name__', exp_con)} on {locator}",
+        )
+
+    def wait_until_app_stable(
+        self,
+        timeout: Optional[float] = None,
+        quiet_period: float = APP_STABLE_QUIET_PERIOD,
+    ) -> None:
+        """
+        Wait until the Angular application is ready for interaction: the document is
+        parsed, Angular's zones are stable (when the app exposes its testabilities),
+        no XHR/fetch request is pending, and the DOM has not changed for quiet_period.
+
+        Args:
+            timeout (float, optional): Maximum time to wait. Defaults to the engine timeout.
+            quiet_period (float, optional): Seconds without DOM mutations required.
+                Defaults to APP_STABLE_QUIET_PERIOD.
+        """
+        last_state: Dict[str, Any] = {}
+
+        def app_stable(driver: WebDriver) -> Any:
+            state = driver.execute_script(APP_STATE_JS)
+            last_state.update(state)
+            return (
+                state["loaded"] and state["zonesStable"] and state["pendingRequests"] == 0
+                and state["quietFor"] >= quiet_period and state
+            )
+
+        try:
+            state = self.wait.until(self.driver, app_stable, timeout=timeout)
+        except TimeoutException as exception:
+            message = f"Timed out waiting for the application to be stable: {last_state}"
+            raise TimeoutException(message) from exception
+        self.element_cache.note_url(state["url"])
+        if self.driver in _navigation_started:
+            started = _navigation_started.pop(self.driver)
+            page_performance.measure(
+                self.driver, type(self).__name__, self.PERFORMANCE_BUDGETS,
+                None if started is None else time.perf_counter() - started,
+            )
+
+    def wait_for_any(
+        self,
+        *conditions: Union[Locator, Condition],
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Wait until any of several conditions is met. Locator tuples are waited on
+        for visibility; callables are used as expected conditions as they are.
+
+        This is the primitive for checks with several possible outcomes, e.g. an
+        error alert or a successful redirect, which should return as soon as either
+        outcome is visible instead of waiting for the full timeout.
+
+        Args:
+            *conditions (Union[Locator, Condition]): Locators or expected conditions.
+            timeout (float, optional): Maximum time to wait. Defaults to the longest
+                timeout of the given locators.
+
+        Returns:
+            Tuple[int, Any]: Index of the condition that was met and its value.
+        """
+        resolved = [
+            ec.visibility_of_element_located(condition) if isinstance(condition, tuple) else condition
+            for condition in conditions
+        ]
+        if timeout is None:
+            timeout = max(
+                self.timeout_for(condition) if isinstance(condition, tuple) else self.wait.timeout
+                for condition in conditions
+            )
+        return self.wait.until_any(
+            self.driver, resolved, timeout=timeout,
+            message=f"Timed out waiting for any of {conditions}",
+        )
+
+    def assert_that(self, locator: Locator, timeout: Optional[float] = None) -> "AssertionWrapper":
         """
         Wrap an element in an AssertionWrapper to perform assertions.
 
         Args:
-            locator (Tuple[str, str]): Locator tuple to find the element.
+            locator (Locator): Locator tuple to find the element.
+            timeout (float, optional): Maximum time to wait for the element.
+                Defaults to the locator timeout.
 
         Returns:
             AssertionWrapper: A wrapper for making assertions on the element.
         """
-        element: WebElement = self.wait_for_element(locator)
+        element: WebElement = self.wait_for_element(locator, timeout=timeout)
         return AssertionWrapper(element)
 
 
+def _instrumented(method: Callable) -> Callable:
+    symbol = method_symbol(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        usage_recorder.record(symbol, list(args) + list(kwargs.values()))
+        if not command_tracer.enabled:
+            return method(self, *args, **kwargs)
+        with command_tracer.method_span(f"{type(self).__name__}.{method.__name__}", args, kwargs):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _instrument_public_methods(cls: type) -> None:
+    """
+    Wrap the public methods defined by a page class, once each, so that their calls,
+    and the locators passed to them, are recorded for impact-based test selection and,
+    while command tracing is enabled, appear as spans around the WebDriver commands
+    they send.
+    """
+    for name, value in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(value) and getattr(value, "instrumented", True):
+            setattr(cls, name, _instrumented(value))
+
+
+_instrument_public_methods(BasePage)
+
+
 class AssertionWrapper:
     """
     AssertionWrapper provides assertion methods on a WebElement.
@@ -127,3 +830,169 @@ class AssertionWrapper:
         if not self.element.is_displayed():
             raise AssertionError(ElementNotVisibleException(str(self.element)))
         return True
+
+
+class ElementState:
+    """
+    State of one element captured by BasePage.snapshot.
+
+    Attributes:
+        locator (Locator): The locator of the element.
+        present (bool): Whether the locator matched an element.
+        displayed (bool): Whether the element is rendered and not hidden.
+        enabled (bool): Whether the element is not disabled.
+        selected (bool): Whether the element is a selected option or checked input.
+        text (str): The element's visible text, stripped.
+        value (Optional[str]): The value of an input, select or textarea, otherwise None.
+        attributes (Dict[str, Optional[str]]): The requested HTML attributes.
+    """
+
+    def __init__(self, locator: Locator, state: Optional[Dict[str, Any]]) -> None:
+        self.locator = locator
+        self.present = state is not None
+        state = state or {}
+        self.displayed: bool = state.get("displayed", False)
+        self.enabled: bool = state.get("enabled", False)
+        self.selected: bool = state.get("selected", False)
+        self.text: str = state.get("text", "")
+        self.value: Optional[str] = state.get("value")
+        self.attributes: Dict[str, Optional[str]] = state.get("attributes", {})
+
+
+class Snapshot:
+    """
+    States of several elements captured in one round trip by BasePage.snapshot, with
+    assertions that check many elements at once and report every mismatch together.
+
+    Elements are looked up by name (e.g. "LAST_NAME" for a locator class) or by locator.
+    """
+
+    def __init__(self, states: Dict[str, ElementState]) -> None:
+        """
+        Initialize the Snapshot.
+
+        Args:
+            states (Dict[str, ElementState]): Element states by name.
+        """
+        self.states = states
+
+    def __getitem__(self, key: Union[str, Locator]) -> ElementState:
+        return self.states[self._name(key)]
+
+    def _name(self, key: Union[str, Locator]) -> str:
+        if isinstance(key, tuple):
+            name = next((name for name, state in self.states.items() if state.locator == key), None)
+        else:
+            name = key if key in self.states else None
+        if name is None:
+            raise KeyError(f"{key!r} is not in the snapshot, which holds: {', '.join(self.states)}")
+        return name
+
+    def _names(self, keys: Sequence[Union[str, Locator]]) -> List[str]:
+        if not keys:
+            return list(self.states)
+        return [self._name(key) for key in keys]
+
+    def _check(self, failures: List[str], what: str) -> bool:
+        if failures:
+            raise AssertionError(f"Expected {what}: " + "; ".join(failures))
+        return True
+
+    def assert_present(self, *keys: Union[str, Locator]) -> bool:
+        """
+        Assert that elements are present (all of them when no key is given).
+
+        Returns:
+            bool: True if every element is present.
+
+        Raises:
+            AssertionError: Listing every missing element.
+        """
+        return self._check([name for name in self._names(keys) if not self.states[name].present], "present")
+
+    def assert_absent(self, *keys: Union[str, Locator]) -> bool:
+        """
+        Assert that elements are not present (all of them when no key is given).
+
+        Returns:
+            bool: True if no element is present.
+
+        Raises:
+            AssertionError: Listing every element that is present.
+        """
+        return self._check([name for name in self._names(keys) if self.states[name].present], "absent")
+
+    def assert_displayed(self, *keys: Union[str, Locator]) -> bool:
+        """
+        Assert that elements are displayed (all of them when no key is given).
+
+        Returns:
+            bool: True if every element is displayed.
+
+        Raises:
+            AssertionError: Listing every element that is missing or hidden.
+        """
+        return self._check([name for name in self._names(keys) if not self.states[name].displayed], "displayed")
+
+    def assert_enabled(self, *keys: Union[str, Locator]) -> bool:
+        """
+        Assert that elements are present and enabled (all of them when no key is given).
+
+        Returns:
+            bool: True if every element is enabled.
+
+        Raises:
+            AssertionError: Listing every element that is missing or disabled.
+        """
+        return self._check([name for name in self._names(keys) if not self.states[name].enabled], "enabled")
+
+    def assert_disabled(self, *keys: Union[str, Locator]) -> bool:
+        """
+        Assert that elements are present and disabled (all of them when no key is given).
+
+        Returns:
+            bool: True if every element is disabled.
+
+        Raises:
+            AssertionError: Listing every element that is missing or enabled.
+        """
+        return self._check(
+            [name for name in self._names(keys) if not self.states[name].present or self.states[name].enabled],
+            "disabled",
+        )
+
+    def assert_text(self, expected: Mapping[Union[str, Locator], str]) -> bool:
+        """
+        Assert the visible text of elements.
+
+        Args:
+            expected (Mapping[Union[str, Locator], str]): Expected text by name or locator.
+
+        Returns:
+            bool: True if every element shows the expected text.
+
+        Raises:
+            AssertionError: Listing every element with a different text.
+        """
+        failures = [
+            f"{key} is {self[key].text!r}, not {text!r}" for key, text in expected.items() if self[key].text != text
+        ]
+        return self._check(failures, "texts")
+
+    def assert_values(self, expected: Mapping[Union[str, Locator], str]) -> bool:
+        """
+        Assert the values of form fields.
+
+        Args:
+            expected (Mapping[Union[str, Locator], str]): Expected value by name or locator.
+
+        Returns:
+            bool: True if every field holds the expected value.
+
+        Raises:
+            AssertionError: Listing every field with a different value.
+        """
+        failures = [
+            f"{key} is {self[key].value!r}, not {value!r}" for key, value in expected.items() if self[key].value != value
+        ]
+        return self._check(failures, "values")
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -17,6 +19,10 @@ class HomePage(BasePage):
     Page Object Model for the Home Page.
     """
 
+    # The first load of the application and the route change to the login page. LCP is
+    # only measured under the "full" blocking profile, which loads images.
+    PERFORMANCE_BUDGETS: Dict[str, float] = {"lcp": 2.5, "cls": 0.1, "navigation_time": 5.0}
+
     def __init__(self, driver: WebDriver) -> None:
         """
         Initialize the HomePage with a Selenium WebDriver instance.
@@ -37,6 +43,7 @@ class HomePage(BasePage):
             None
         """
         self.click(HomePageLocators.LOGIN_BUTTON)
+        self.wait_until_app_stable()
 
     # Assertions
 
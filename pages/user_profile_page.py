@@ -1,3 +1,5 @@
+from typing import Dict, Tuple
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
@@ -32,6 +34,28 @@ class UserProfilePage(BasePage):
     Page Object Model for the User Profile Page.
     """
 
+    # Client-side route changes to the settings and ticket views.
+    PERFORMANCE_BUDGETS: Dict[str, float] = {"navigation_time": 3.0, "cls": 0.1, "long_task_time": 0.5}
+
+    # Inputs with an input mask, which only formats text typed key by key.
+    MASKED_FIELDS: Tuple[Tuple[str, str], ...] = (
+        UserProfilePageLocators.PHONE_NUMBER,
+        UserProfilePageLocators.POSTAL_CODE,
+    )
+
+    # Fields of the profile settings form by the argument names of fill_profile_form.
+    PROFILE_FORM: Dict[str, Tuple[str, str]] = {
+        "last_name": UserProfilePageLocators.LAST_NAME,
+        "first_name": UserProfilePageLocators.FIRST_NAME,
+        "email": UserProfilePageLocators.EMAIL,
+        "phone_number": UserProfilePageLocators.PHONE_NUMBER,
+        "city": UserProfilePageLocators.CITY,
+        "street": UserProfilePageLocators.STREET,
+        "building": UserProfilePageLocators.BUILDING,
+        "apartment_number": UserProfilePageLocators.APARTMENT_NUMBER,
+        "postal_code": UserProfilePageLocators.POSTAL_CODE,
+    }
+
     def __init__(self, driver: WebDriver) -> None:
         """
         Initialize the UserProfilePage with a Selenium WebDriver instance.
@@ -50,12 +74,14 @@ class UserProfilePage(BasePage):
         """
         self.click_with_action_chains(UserProfilePageLocators.USER_FULL_NAME)
         self.click_with_action_chains(UserProfilePageLocators.SETTINGS_BUTTON)
+        self.wait_until_app_stable()
 
     def go_to_ticket_page(self) -> None:
         """
         Navigate to the ticket page by clicking on the tickets button.
         """
         self.click_with_action_chains(UserProfilePageLocators.TICKETS_BUTTON)
+        self.wait_until_app_stable()
 
     # Helper Functions
 
@@ -85,15 +111,20 @@ class UserProfilePage(BasePage):
             apartment_number (str): Apartment number.
             postal_code (str): Postal code.
         """
-        self.fill(UserProfilePageLocators.LAST_NAME, last_name)
-        self.fill(UserProfilePageLocators.FIRST_NAME, first_name)
-        self.fill(UserProfilePageLocators.EMAIL, email)
-        self.fill(UserProfilePageLocators.PHONE_NUMBER, phone_number)
-        self.fill(UserProfilePageLocators.CITY, city)
-        self.fill(UserProfilePageLocators.STREET, street)
-        self.fill(UserProfilePageLocators.BUILDING, building)
-        self.fill(UserProfilePageLocators.APARTMENT_NUMBER, apartment_number)
-        self.fill(UserProfilePageLocators.POSTAL_CODE, postal_code)
+        self.fill_many(
+            {
+                UserProfilePageLocators.LAST_NAME: last_name,
+                UserProfilePageLocators.FIRST_NAME: first_name,
+                UserProfilePageLocators.EMAIL: email,
+                UserProfilePageLocators.PHONE_NUMBER: phone_number,
+                UserProfilePageLocators.CITY: city,
+                UserProfilePageLocators.STREET: street,
+                UserProfilePageLocators.BUILDING: building,
+                UserProfilePageLocators.APARTMENT_NUMBER: apartment_number,
+                UserProfilePageLocators.POSTAL_CODE: postal_code,
+            },
+            typed=self.MASKED_FIELDS
+        )
 
     # Assertions
 
@@ -115,6 +146,29 @@ class UserProfilePage(BasePage):
         """
         return self.assert_that(UserProfilePageLocators.PROFILE_DETAILS).is_displayed()
 
+    def is_profile_form_displayed(self) -> bool:
+        """
+        Assert that every field of the profile form is displayed, reading them all in a single round trip.
+
+        Returns:
+            bool: True if every field is displayed, otherwise an AssertionError is raised.
+        """
+        return self.snapshot(self.PROFILE_FORM, until_present=True).assert_displayed()
+
+    def is_profile_form_filled_with(self, **values: str) -> bool:
+        """
+        Assert the values of profile form fields, reading them all in a single round trip.
+
+        Args:
+            **values (str): Expected values by the argument names of fill_profile_form,
+                e.g. city="Warszawa".
+
+        Returns:
+            bool: True if every field holds its expected value, otherwise an AssertionError is raised.
+        """
+        snapshot = self.snapshot({name: self.PROFILE_FORM[name] for name in values}, until_present=True)
+        return snapshot.assert_values(values)
+
     def is_save_button_disabled(self) -> bool:
         """
         Check whether the 'Save Changes' button is disabled.
@@ -0,0 +1,273 @@
+// Minimal single-page application reproducing the parts of the Renk frontend the
+// page objects in pages/*.py interact with. Routes: /, /login, /profile,
+// /profile/settings and /tickets.
+(function () {
+    'use strict';
+
+    var root = document.querySelector('app-root');
+    var profile;
+    var ticketTypes;
+
+    // Backend
+
+    function api(method, path, body) {
+        return fetch(path, {
+            method: method,
+            credentials: 'same-origin',
+            headers: body ? {'Content-Type': 'application/json'} : {},
+            body: body ? JSON.stringify(body) : undefined
+        }).then(function (response) {
+            return response.text().then(function (text) {
+                var data = text ? JSON.parse(text) : null;
+                if (!response.ok) {
+                    var error = new Error(data && data.message ? data.message : response.statusText);
+                    error.status = response.status;
+                    throw error;
+                }
+                return data;
+            });
+        });
+    }
+
+    function loadProfile() {
+        if (profile !== undefined) {
+            return Promise.resolve(profile);
+        }
+        return api('GET', '/api/profile').then(
+            function (data) { profile = data; return profile; },
+            function () { profile = null; return profile; }
+        );
+    }
+
+    // Rendering
+
+    function escape(text) {
+        return String(text).replace(/[&<>"']/g, function (character) {
+            return '&#' + character.charCodeAt(0) + ';';
+        });
+    }
+
+    function header() {
+        var logo = '<img class="gapmap-logo large-sc-hide ng-star-inserted" src="/assets/logo.png" ' +
+            'alt="Renk" width="120" height="32">';
+        if (!profile) {
+            return '<header class="app-header">' + logo +
+                '<button class="login-btn" type="button">Zaloguj się</button></header>';
+        }
+        return '<header class="app-header">' + logo +
+            '<div class="user-menu">' +
+            '<span class="full-name">' + escape(profile.firstName + ' ' + profile.lastName) + '</span>' +
+            '<div class="user-menu-items" hidden>' +
+            '<a href="/profile/settings" data-link>Ustawienia</a> ' +
+            '<a href="/" class="logout-link">Wyloguj</a>' +
+            '</div></div></header>';
+    }
+
+    function show(content) {
+        root.innerHTML = header() + '<main class="app-content">' + content + '</main>';
+    }
+
+    function navigate(path) {
+        history.pushState(null, '', path);
+        render();
+    }
+
+    function render() {
+        var path = window.location.pathname.replace(/\/+$/, '') || '/';
+        return loadProfile().then(function () {
+            var routes = {
+                '/': renderHome,
+                '/login': renderLogin,
+                '/profile': renderProfile,
+                '/profile/settings': renderSettings,
+                '/tickets': renderTickets
+            };
+            var protectedRoute = path.indexOf('/profile') === 0 || path === '/tickets';
+            if (protectedRoute && !profile) {
+                return navigate('/login');
+            }
+            if (path === '/login' && profile) {
+                return navigate('/profile');
+            }
+            return (routes[path] || renderHome)();
+        });
+    }
+
+    function renderHome() {
+        // The home page is served pre-rendered for anonymous users; keep that markup.
+        if (!profile && root.querySelector('.login-btn') && root.querySelector('.app-content h1')) {
+            return;
+        }
+        show('<h1>Renk</h1><p>Bilety komunikacji miejskiej.</p>');
+    }
+
+    function renderLogin() {
+        show(
+            '<h1>Logowanie</h1>' +
+            '<form class="login-form" novalidate>' +
+            '<label>Login <input id="username" name="username" autocomplete="username"></label>' +
+            '<label>Hasło <input id="password" name="password" type="password"></label>' +
+            '<div class="server-error-slot"></div>' +
+            '<button type="submit"><span> Zaloguj </span></button>' +
+            '</form>'
+        );
+        var form = root.querySelector('.login-form');
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            var slot = form.querySelector('.server-error-slot');
+            slot.innerHTML = '';
+            api('POST', '/api/auth/login', {
+                login: form.querySelector('#username').value,
+                password: form.querySelector('#password').value
+            }).then(function () {
+                profile = undefined;
+                navigate('/profile');
+            }, function (error) {
+                slot.innerHTML = '<app-server-error><div role="alert">' + escape(error.message) +
+                    '</div></app-server-error>';
+            });
+        });
+    }
+
+    function renderProfile() {
+        show(
+            '<h1>Mój profil</h1>' +
+            '<p>Witaj, ' + escape(profile.firstName) + '!</p>' +
+            '<button type="button" class="tickets-btn">Bilety</button>'
+        );
+    }
+
+    var PROFILE_FIELDS = [
+        ['lastName', 'Nazwisko', /\S/],
+        ['firstName', 'Imię', /\S/],
+        ['email', 'E-mail', /^[^@\s]+@[^@\s]+\.[^@\s]+$/],
+        ['phoneNumber', 'Telefon', /^\d{9}$/],
+        ['city', 'Miasto', /\S/],
+        ['street', 'Ulica', /\S/],
+        ['building', 'Numer budynku', /\S/],
+        ['apartmentNumber', 'Numer lokalu', /^.*$/],
+        ['postalCode', 'Kod pocztowy', /^\d{2}-\d{3}$/]
+    ];
+
+    function renderSettings() {
+        var inputs = PROFILE_FIELDS.map(function (field) {
+            return '<label>' + field[1] + ' <input formcontrolname="' + field[0] + '" value="' +
+                escape(profile[field[0]] || '') + '"></label>';
+        }).join('');
+        show(
+            '<table class="profile-details"><tr><th>Szczegóły profilu</th></tr></table>' +
+            '<form class="profile-form" novalidate>' + inputs +
+            '<button type="submit" class="custom-fill-primary-btn" disabled><span>Zapisz zmiany</span></button>' +
+            '</form>'
+        );
+        var form = root.querySelector('.profile-form');
+        var save = form.querySelector('.custom-fill-primary-btn');
+
+        function values() {
+            var result = {};
+            PROFILE_FIELDS.forEach(function (field) {
+                result[field[0]] = form.querySelector('[formcontrolname="' + field[0] + '"]').value;
+            });
+            return result;
+        }
+
+        function update() {
+            var current = values();
+            var dirty = PROFILE_FIELDS.some(function (field) {
+                return current[field[0]] !== (profile[field[0]] || '');
+            });
+            var valid = PROFILE_FIELDS.every(function (field) { return field[2].test(current[field[0]]); });
+            save.disabled = !(dirty && valid);
+        }
+
+        form.addEventListener('input', update);
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            api('PUT', '/api/profile', values()).then(function (data) {
+                profile = data;
+                update();
+            });
+        });
+    }
+
+    function renderTickets() {
+        show(
+            '<h2>Kup bilet</h2>' +
+            '<section class="ticket-step">' +
+            '<label for="ticketType">Rodzaj biletu</label> ' +
+            '<div id="ticketType" class="ticket-select" role="combobox" tabindex="0">Wybierz</div>' +
+            '<div class="ticket-options"></div>' +
+            '<button type="button" class="next-btn" disabled><span>Dalej</span></button>' +
+            '</section>'
+        );
+        var select = root.querySelector('#ticketType');
+        var options = root.querySelector('.ticket-options');
+        var next = root.querySelector('.next-btn');
+        var selected = null;
+
+        var loaded = ticketTypes ? Promise.resolve(ticketTypes) : api('GET', '/api/ticket-types').then(
+            function (data) { ticketTypes = data; return data; }
+        );
+
+        select.addEventListener('click', function () {
+            if (options.innerHTML) {
+                options.innerHTML = '';
+                return;
+            }
+            loaded.then(function (types) {
+                options.innerHTML = '<tui-data-list role="listbox">' + types.map(function (type) {
+                    return '<button type="button" role="option" data-id="' + type.id + '"><label> ' +
+                        escape(type.name) + ' </label></button>';
+                }).join('') + '</tui-data-list>';
+            });
+        });
+
+        options.addEventListener('click', function (event) {
+            var option = event.target.closest('button[data-id]');
+            if (!option) {
+                return;
+            }
+            selected = ticketTypes.filter(function (type) { return type.id === option.dataset.id; })[0];
+            select.textContent = selected.name;
+            options.innerHTML = '';
+            next.disabled = false;
+        });
+
+        next.addEventListener('click', function () {
+            var prices = selected.prices.map(function (price) {
+                return '<tr><td>' + escape(price.label) + '</td><td>' + price.amount.toFixed(2) + ' zł</td></tr>';
+            }).join('');
+            root.querySelector('.ticket-step').outerHTML =
+                '<section class="pricing-step">' +
+                '<div class="tabs"><button type="button" class="tab-active"><span>Cennik</span></button></div>' +
+                '<h3>' + escape(selected.name) + '</h3>' +
+                '<table class="prices">' + prices + '</table>' +
+                '</section>';
+        });
+    }
+
+    // Global event handling
+
+    document.addEventListener('click', function (event) {
+        var target = event.target;
+        if (target.closest('.login-btn')) {
+            navigate('/login');
+        } else if (target.closest('.full-name')) {
+            root.querySelector('.user-menu-items').hidden = !root.querySelector('.user-menu-items').hidden;
+        } else if (target.closest('.logout-link')) {
+            event.preventDefault();
+            api('POST', '/api/auth/logout').then(function () {
+                profile = null;
+                navigate('/');
+            });
+        } else if (target.closest('a[data-link]')) {
+            event.preventDefault();
+            navigate(target.closest('a[data-link]').getAttribute('href'));
+        } else if (target.closest('.tickets-btn')) {
+            navigate('/tickets');
+        }
+    });
+
+    window.addEventListener('popstate', render);
+    render();
+})();
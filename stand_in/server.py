@@ -0,0 +1,332 @@
+"""
+Hermetic local stand-in of the Renk web application.
+
+Serves a small single-page application whose DOM matches the locators in
+pages/*.py, backed by an in-memory fake of the auth, profile and ticket API.
+Point TEST_URL at it (or run pytest with --stand-in) to run the suite offline.
+
+Usage:
+    python -m stand_in.server [--port PORT]
+"""
+import argparse
+import base64
+import copy
+import json
+import mimetypes
+import os
+import secrets
+import threading
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from decouple import config
+
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app")
+SESSION_COOKIE = "renk_session"
+
+# 1x1 transparent PNG served for image assets such as the header logo.
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+SEED_PROFILE: Dict[str, str] = {
+    "lastName": "Kowalski",
+    "firstName": "Jan",
+    "email": "jan.kowalski@example.com",
+    "phoneNumber": "123456789",
+    "city": "Warszawa",
+    "street": "Kwiatowa",
+    "building": "10",
+    "apartmentNumber": "2",
+    "postalCode": "00-001",
+}
+
+TICKET_TYPES: List[Dict[str, Any]] = [
+    {"id": "time", "name": "BILET CZASOWY", "prices": [{"label": "60 minut", "amount": 4.40}]},
+    {"id": "single", "name": "BILET JEDNORAZOWY", "prices": [{"label": "1 przejazd", "amount": 3.40}]},
+    {"id": "season", "name": "BILET OKRESOWY", "prices": [{"label": "30 dni", "amount": 110.00}]},
+]
+
+
+def load_users() -> Dict[str, str]:
+    """
+    Read the users the stand-in accepts from the TEST_USERS setting.
+
+    Returns:
+        Dict[str, str]: Password by login.
+    """
+    users = {}
+    for entry in config("TEST_USERS", default="").split(","):
+        login, _, password = entry.strip().partition(":")
+        if login:
+            users[login] = password
+    return users
+
+
+class StandInState:
+    """
+    In-memory backend state: users, sessions, profiles and tickets.
+    """
+
+    def __init__(self, users: Dict[str, str]) -> None:
+        """
+        Initialize the StandInState with seed data.
+
+        Args:
+            users (Dict[str, str]): Password by login.
+        """
+        self.users = users
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, str] = {}
+        self.profiles: Dict[str, Dict[str, str]] = {}
+        self.tickets: Dict[str, List[Dict[str, Any]]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Restore every profile and ticket list to the seed data. Sessions are kept.
+        """
+        with self.lock:
+            self.profiles = {login: copy.deepcopy(SEED_PROFILE) for login in self.users}
+            self.tickets = {login: [] for login in self.users}
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes /api/* to the fake backend, /assets/* to static files, and every other
+    path to the single-page application.
+    """
+
+    server: "StandInHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    # Dispatch
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str) -> None:
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/api/"):
+            self._handle_api(method, path)
+        elif method != "GET":
+            self._send_json(HTTPStatus.METHOD_NOT_ALLOWED, {"message": "Method not allowed"})
+        elif path.startswith("/assets/"):
+            self._send_asset(path[len("/assets/"):])
+        else:
+            self._send_file(os.path.join(APP_DIR, "index.html"))
+
+    # API
+
+    def _handle_api(self, method: str, path: str) -> None:
+        state = self.server.state
+        if (method, path) == ("POST", "/api/auth/login"):
+            body = self._read_json()
+            login, password = body.get("login"), body.get("password")
+            if login not in state.users or state.users[login] != password:
+                self._send_json(HTTPStatus.UNAUTHORIZED, {"message": "Nie znaleziono użytkownika."})
+                return
+            token = secrets.token_hex(16)
+            with state.lock:
+                state.sessions[token] = login
+            self._send_json(
+                HTTPStatus.OK,
+                {"login": login},
+                cookie=f"{SESSION_COOKIE}={token}; Path=/; HttpOnly; SameSite=Lax",
+            )
+            return
+        if (method, path) == ("POST", "/api/test/reset"):
+            state.reset()
+            self._send_json(HTTPStatus.OK, {})
+            return
+
+        token = self._session_token()
+        with state.lock:
+            login = state.sessions.get(token)
+        if login is None:
+            self._send_json(HTTPStatus.UNAUTHORIZED, {"message": "Sesja wygasła."})
+            return
+
+        if (method, path) == ("POST", "/api/auth/logout"):
+            with state.lock:
+                state.sessions.pop(token, None)
+            self._send_json(HTTPStatus.OK, {}, cookie=f"{SESSION_COOKIE}=; Path=/; Max-Age=0")
+        elif (method, path) == ("GET", "/api/profile"):
+            with state.lock:
+                self._send_json(HTTPStatus.OK, dict(state.profiles[login], login=login))
+        elif (method, path) == ("PUT", "/api/profile"):
+            body = self._read_json()
+            with state.lock:
+                profile = state.profiles[login]
+                profile.update({key: str(value) for key, value in body.items() if key in SEED_PROFILE})
+                self._send_json(HTTPStatus.OK, dict(profile, login=login))
+        elif (method, path) == ("GET", "/api/ticket-types"):
+            self._send_json(HTTPStatus.OK, TICKET_TYPES)
+        elif (method, path) == ("GET", "/api/tickets"):
+            with state.lock:
+                self._send_json(HTTPStatus.OK, state.tickets[login])
+        elif (method, path) == ("POST", "/api/tickets"):
+            body = self._read_json()
+            if body.get("ticketType") not in {ticket_type["id"] for ticket_type in TICKET_TYPES}:
+                self._send_json(HTTPStatus.BAD_REQUEST, {"message": "Nieznany typ biletu."})
+                return
+            ticket = {"id": secrets.token_hex(4), "ticketType": body["ticketType"]}
+            with state.lock:
+                state.tickets[login].append(ticket)
+            self._send_json(HTTPStatus.CREATED, ticket)
+        elif method == "DELETE" and path.startswith("/api/tickets/"):
+            ticket_id = path[len("/api/tickets/"):]
+            with state.lock:
+                state.tickets[login] = [ticket for ticket in state.tickets[login] if ticket["id"] != ticket_id]
+            self._send_json(HTTPStatus.NO_CONTENT, None)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"message": "Not found"})
+
+    def _session_token(self) -> Optional[str]:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    # Responses
+
+    def _send_json(self, status: HTTPStatus, body: Any, cookie: Optional[str] = None) -> None:
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        headers = [("Content-Type", "application/json"), ("Cache-Control", "no-store")]
+        if cookie:
+            headers.append(("Set-Cookie", cookie))
+        self._send(status, payload, headers)
+
+    def _send_asset(self, name: str) -> None:
+        if name.endswith(".png"):
+            self._send(HTTPStatus.OK, PIXEL_PNG, [("Content-Type", "image/png")])
+            return
+        path = os.path.normpath(os.path.join(APP_DIR, name))
+        if not path.startswith(APP_DIR + os.sep) or not os.path.isfile(path):
+            self._send(HTTPStatus.NOT_FOUND, b"", [])
+            return
+        self._send_file(path)
+
+    def _send_file(self, path: str) -> None:
+        with open(path, "rb") as asset:
+            content = asset.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self._send(HTTPStatus.OK, content, [("Content-Type", f"{content_type}; charset=utf-8")])
+
+    def _send(self, status: HTTPStatus, payload: bytes, headers: List[Tuple[str, str]]) -> None:
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that carries the shared StandInState.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], state: StandInState) -> None:
+        super().__init__(address, StandInRequestHandler)
+        self.state = state
+
+
+class StandInServer:
+    """
+    Runs the stand-in in a background thread of the current process.
+
+    Attributes:
+        url (str): Base URL of the running server, ending with '/'.
+        state (StandInState): The fake backend state.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Initialize the StandInServer.
+
+        Args:
+            host (str, optional): Interface to bind. Defaults to 127.0.0.1.
+            port (int, optional): Port to bind; 0 picks a free one. Defaults to 0.
+        """
+        self.state = StandInState(load_users())
+        self._server = StandInHTTPServer((host, port), self.state)
+        self._thread: Optional[threading.Thread] = None
+        self.url = f"http://{host}:{self._server.server_address[1]}/"
+
+    def start(self) -> "StandInServer":
+        """
+        Start serving in a daemon thread.
+
+        Returns:
+            StandInServer: self, for chaining.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Serve in the calling thread until interrupted.
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        """
+        Stop serving and release the port.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m stand_in.server", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    server = StandInServer(args.host, args.port)
+    print(f"Renk stand-in serving on {server.url} (set TEST_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+from configuration.browser_contexts import ContextHost, get_active_context_host
+from configuration.test_driver import TestDriver
+
+
+def test_browser_contexts_are_isolated():
+    host = get_active_context_host() or ContextHost()
+    try:
+        with TestDriver(context_host=host, logged_in_as="Testowy_1") as first, \
+                TestDriver(context_host=host) as second:
+            first.driver.add_cookie({"name": "isolation_probe", "value": "first"})
+            first.driver.execute_script("window.localStorage.setItem('isolation_probe', 'first');")
+
+            assert second.driver.get_cookie("isolation_probe") is None
+            assert second.driver.execute_script("return window.localStorage.getItem('isolation_probe');") is None
+
+            second.home_page.go_to_login_page()
+            second.authentication_page.is_login_button_displayed()
+            first.user_profile_page.is_user_logged_in()
+    finally:
+        if host is not get_active_context_host():
+            host.close()
@@ -0,0 +1,36 @@
+from urllib.parse import quote
+
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage
+
+
+FORM = """<!DOCTYPE html>
+<form>
+  <input id="name">
+  <textarea id="notes"></textarea>
+  <select id="city"><option value="">-</option><option value="waw">Warszawa</option></select>
+  <div id="bio" contenteditable="true"></div>
+</form>
+<script>
+  window.changed = [];
+  document.addEventListener('change', function (event) { window.changed.push(event.target.id); });
+</script>"""
+
+
+def test_fill_many_fills_every_field_type(pooled_driver):
+    pooled_driver.get("data:text/html;charset=utf-8," + quote(FORM))
+
+    BasePage(pooled_driver).fill_many({
+        (By.ID, "name"): "Jan",
+        (By.ID, "notes"): "First line",
+        (By.ID, "city"): "Warszawa",
+        (By.ID, "bio"): "Tester",
+    })
+
+    values = pooled_driver.execute_script(
+        "return ['name', 'notes', 'city'].map(function (id) { return document.getElementById(id).value; });"
+    )
+    assert values == ["Jan", "First line", "waw"]
+    assert pooled_driver.find_element(By.ID, "bio").text == "Tester"
+    assert pooled_driver.execute_script("return window.changed;") == ["name", "notes", "city"]
@@ -0,0 +1,44 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, Tuple
+
+import pytest
+
+
+Responses = Dict[str, Tuple[int, str, str]]
+
+
+@pytest.fixture
+def web_server() -> Iterator[Callable[[Responses], str]]:
+    """
+    Start a local HTTP server answering GET requests with fixed responses.
+
+    Yields:
+        Callable[[Responses], str]: Takes (status, content type, body) by path and
+            returns the base URL of the server.
+    """
+    servers = []
+
+    def serve(responses: Responses) -> str:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                status, content_type, body = responses[self.path]
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
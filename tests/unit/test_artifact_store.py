@@ -0,0 +1,84 @@
+import io
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.artifact_store import ArtifactStore
+
+
+def screenshot(seed: int = 1) -> bytes:
+    pixels = np.random.default_rng(seed).integers(0, 256, (60, 80, 3)).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def pixels_of(png: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(str(tmp_path / "store"))
+
+
+def test_identical_artifacts_share_one_blob(store):
+    first = store.put("run-1", "", "home", "test_logo", "screenshot", screenshot())
+    second = store.put("run-2", "gw1", "home", "test_logo", "screenshot", screenshot())
+
+    assert first == second
+    assert len(store.artifacts()) == 2
+    assert len(os.listdir(os.path.join(store.root, "blobs", first[:2]))) == 1
+    original, stored = store.disk_usage()
+    assert original == 2 * len(screenshot())
+    assert stored < original
+
+
+@pytest.mark.parametrize("kind, data", [("screenshot", screenshot()), ("dom", b"<html><body>Renk</body></html>")])
+def test_extracted_artifacts_are_lossless(store, kind, data):
+    store.put("run-1", "", "home", "test_logo", kind, data)
+    [row] = store.artifacts()
+
+    _, content = store.extract(row["id"])
+
+    if kind == "screenshot":
+        assert np.array_equal(pixels_of(content), pixels_of(data))
+    else:
+        assert content == data
+
+
+def test_missing_artifact_raises_key_error(store):
+    with pytest.raises(KeyError, match="42"):
+        store.extract(42)
+
+
+def test_listing_filters_by_run_and_test(store):
+    store.put("run-1", "", "home", "test_logo", "dom", b"a")
+    store.put("run-2", "", "user", "test_settings", "dom", b"b")
+
+    assert [row["test"] for row in store.artifacts(run_id="run-2")] == ["test_settings"]
+    assert [row["run_id"] for row in store.artifacts(test="logo")] == ["run-1"]
+    assert [run["run_id"] for run in store.runs()] == ["run-2", "run-1"]
+
+
+def test_prune_drops_the_oldest_runs_and_their_orphaned_blobs(store):
+    for run, seed in (("run-1", 1), ("run-2", 2), ("run-3", 3)):
+        store.put(run, "", "home", "test_logo", "screenshot", screenshot(seed))
+
+    assert store.prune(max_runs=2, dry_run=True) == ["run-1"]
+    assert len(store.runs()) == 3
+
+    assert store.prune(max_runs=2) == ["run-1"]
+    assert [run["run_id"] for run in store.runs()] == ["run-3", "run-2"]
+    blobs = [name for _, _, names in os.walk(os.path.join(store.root, "blobs")) for name in names]
+    assert len(blobs) == 2
+
+
+def test_prune_by_size_keeps_the_current_run(store):
+    for run, seed in (("run-1", 1), ("run-2", 2)):
+        store.put(run, "", "home", "test_logo", "screenshot", screenshot(seed))
+
+    assert store.prune(max_mb=1e-6, keep_run="run-1") == ["run-2"]
+    assert [run["run_id"] for run in store.runs()] == ["run-1"]
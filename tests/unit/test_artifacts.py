@@ -0,0 +1,109 @@
+import base64
+import io
+import json
+import threading
+
+import pytest
+from PIL import Image
+
+from utils.artifact_store import ArtifactStore
+from utils.artifacts import ArtifactWriter, FailureArtifacts
+from utils.helpers import get_test_context
+
+
+class BlockingStore(ArtifactStore):
+    """
+    A store whose writes wait until released, or fail when told to.
+    """
+
+    def __init__(self, root: str) -> None:
+        super().__init__(root)
+        self.released = threading.Event()
+        self.failure = None
+
+    def put(self, *args, **kwargs) -> str:
+        self.released.wait(5)
+        if self.failure:
+            raise self.failure
+        return super().put(*args, **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlockingStore(str(tmp_path / "store"))
+
+
+@pytest.fixture
+def writer(store):
+    writer = ArtifactWriter(max_workers=1, store=store)
+    yield writer
+    store.released.set()
+    writer.shutdown()
+
+
+def png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def failure(screenshot: bytes = png()) -> FailureArtifacts:
+    return FailureArtifacts(
+        screenshot_base64=base64.b64encode(screenshot).decode("ascii") if screenshot else None,
+        page_source="<html>Renk</html>",
+        console_log=[{"level": "SEVERE", "message": "boom"}],
+        url="http://app.test/profile",
+        error="AssertionError: no profile",
+    )
+
+
+def test_writes_happen_in_the_background_until_flushed(store, writer, monkeypatch):
+    monkeypatch.setenv("TEST_RUN_ID", "run-1")
+    monkeypatch.setenv("TEST_WORKER_ID", "gw0")
+    future = writer.submit("profile", "test_edit_profile", failure())
+
+    assert not future.done()
+    store.released.set()
+    writer.flush()
+
+    artifacts = {row["kind"]: row for row in store.artifacts(run_id="run-1")}
+    assert sorted(artifacts) == ["details", "dom", "screenshot"]
+    assert (artifacts["dom"]["worker"], artifacts["dom"]["test"]) == ("gw0", "test_edit_profile")
+    assert store.extract(artifacts["screenshot"]["id"])[1] == png()
+    details = json.loads(store.extract(artifacts["details"]["id"])[1])
+    assert details == {
+        "url": "http://app.test/profile",
+        "error": "AssertionError: no profile",
+        "console": [{"level": "SEVERE", "message": "boom"}],
+    }
+
+
+def test_missing_screenshot_is_skipped(store, writer, monkeypatch):
+    monkeypatch.setenv("TEST_RUN_ID", "run-2")
+    store.released.set()
+    writer.submit("home", "test_logo", failure(screenshot=b""))
+    writer.flush()
+
+    assert sorted(row["kind"] for row in store.artifacts(run_id="run-2")) == ["details", "dom"]
+
+
+def test_flush_reraises_a_failed_write_once(store, writer):
+    store.failure = OSError("disk full")
+    store.released.set()
+    writer.submit("home", "test_logo", failure())
+
+    with pytest.raises(OSError, match="disk full"):
+        writer.flush()
+    writer.flush()
+
+
+@pytest.mark.parametrize("current_test, context", [
+    ("tests/home/test_home_page.py::test_home_page (call)", ("home", "test_home_page")),
+    ("tests/profile/test_profile.py::TestProfile::test_edit[Testowy_1-a b] (setup)",
+     ("profile", "test_edit_Testowy_1-a_b")),
+    ("", ("", "")),
+])
+def test_test_context_comes_from_the_current_node_id(monkeypatch, current_test, context):
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", current_test)
+
+    assert get_test_context() == context
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import configuration.auth_state as auth_state
+import configuration.test_driver as test_driver_module
+from configuration.auth_state import AuthState, AuthStateCache, capture_auth_state, inject_auth_state
+from configuration.driver_pool import DriverPool
+from pages.home_page import HomePage
+
+
+SESSION_COOKIE = {
+    "name": "sid", "value": "abc", "domain": "app.test", "path": "/", "expires": -1, "size": 6,
+    "httpOnly": True, "secure": False, "session": True, "sameSite": "Lax", "priority": "Medium",
+}
+PERSISTENT_COOKIE = {
+    "name": "theme", "value": "dark", "domain": ".app.test", "path": "/", "expires": 1900000000.5,
+    "httpOnly": False, "secure": True, "session": False, "priority": "Medium",
+}
+
+
+class BrowserDriver:
+    """
+    A session with or without CDP, recording how state is written to it.
+    """
+
+    def __init__(self, cdp: bool = True) -> None:
+        self.cdp = cdp
+        self.cdp_calls: List[Any] = []
+        self.added_cookies: List[Dict[str, Any]] = []
+        self.scripts: List[Any] = []
+        self.visited: List[str] = []
+        self.current_url = "http://app.test/profile"
+        self.caps = {}
+        self.command_executor = SimpleNamespace()
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        if not self.cdp:
+            raise WebDriverException("CDP is not available")
+        self.cdp_calls.append((command, params))
+        return {"cookies": [SESSION_COOKIE]}
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        return [{"name": "sid", "value": "abc", "path": "/", "domain": "app.test", "secure": False, "httpOnly": True}]
+
+    def add_cookie(self, cookie: Dict[str, Any]) -> None:
+        self.added_cookies.append(cookie)
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        self.scripts.append(args)
+        return {"local": {"token": "t"}, "session": {}}
+
+    def get(self, url: str) -> None:
+        self.visited.append(url)
+
+    def quit(self) -> None:
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch) -> List[float]:
+    now = [1000.0]
+    monkeypatch.setattr(auth_state.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cached_state_expires_after_the_ttl(clock):
+    cache = AuthStateCache(ttl=60)
+    state = AuthState([], {}, {}, "http://app.test/profile")
+    cache.put("alice", state)
+    clock[0] += 60
+    assert cache.get("alice") is state
+    clock[0] += 1
+    assert cache.get("alice") is None
+    clock[0] -= 61
+    assert cache.get("alice") is None
+
+
+def test_cache_is_keyed_by_login(clock):
+    cache = AuthStateCache(ttl=60)
+    alice = AuthState([], {}, {}, "http://app.test/alice")
+    bob = AuthState([], {}, {}, "http://app.test/bob")
+    cache.put("alice", alice)
+    cache.put("bob", bob)
+    cache.invalidate("alice")
+    assert cache.get("alice") is None
+    assert cache.get("bob") is bob
+
+
+def test_capture_falls_back_to_webdriver_cookies():
+    state = capture_auth_state(BrowserDriver(cdp=False))
+    assert state.cookies[0]["name"] == "sid"
+    assert state.local_storage == {"token": "t"}
+    assert state.landing_url == "http://app.test/profile"
+
+
+def test_inject_sets_cdp_cookies_without_session_expiry():
+    driver = BrowserDriver()
+    inject_auth_state(driver, AuthState([SESSION_COOKIE, PERSISTENT_COOKIE], {"token": "t"}, {}, "http://app.test/p"))
+    (command, params), = driver.cdp_calls
+    assert command == "Network.setCookies"
+    assert "expires" not in params["cookies"][0]
+    assert params["cookies"][1]["expires"] == 1900000000.5
+    assert "priority" not in params["cookies"][1]
+    assert driver.visited == ["http://app.test/p"]
+
+
+def test_inject_falls_back_to_webdriver_cookie_fields():
+    driver = BrowserDriver(cdp=False)
+    inject_auth_state(driver, AuthState([SESSION_COOKIE, PERSISTENT_COOKIE], {}, {}, "http://app.test/p"))
+    assert driver.added_cookies == [
+        {"name": "sid", "value": "abc", "path": "/", "domain": "app.test", "secure": False, "httpOnly": True,
+         "sameSite": "Lax"},
+        {"name": "theme", "value": "dark", "path": "/", "domain": ".app.test", "secure": True, "httpOnly": False,
+         "expiry": 1900000000},
+    ]
+
+
+def test_failed_login_returns_the_session_to_the_pool(monkeypatch):
+    def fail(self, login):
+        raise WebDriverException("login failed")
+
+    monkeypatch.setattr(test_driver_module, "apply_blocking_profile", lambda driver, profile: False)
+    monkeypatch.setattr(HomePage, "wait_until_app_stable", lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(test_driver_module.TestDriver, "log_in", fail)
+    pool = DriverPool(url="http://app.test/", size=1, driver_factory=BrowserDriver, lease_timeout=0.05)
+    released = []
+    monkeypatch.setattr(pool, "release", released.append)
+    with pytest.raises(WebDriverException, match="login failed"):
+        with test_driver_module.TestDriver(url="http://app.test/", pool=pool, logged_in_as="alice"):
+            pass
+    assert len(released) == 1
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from benchmarks import run
+from benchmarks.run import StepTimer, find_regressions, load_history
+
+
+def run_with(steps):
+    return {"timestamp": "2026-01-01T00:00:00", "steps": steps}
+
+
+def test_step_timer_records_one_sample_per_block(monkeypatch):
+    clock = iter([1.0, 1.25, 2.0, 2.5, 3.0, 3.75])
+    monkeypatch.setattr(run.time, "perf_counter", lambda: next(clock))
+    timer = StepTimer()
+
+    for _ in range(2):
+        with timer.step("first_get"):
+            pass
+    with pytest.raises(RuntimeError):
+        with timer.step("teardown"):
+            raise RuntimeError("driver gone")
+
+    assert timer.samples["first_get"] == [0.25, 0.5]
+    assert timer.samples["teardown"] == []
+
+
+def test_summary_holds_percentiles_of_steps_with_samples():
+    timer = StepTimer()
+    timer.samples["login_flow"] = [0.1, 0.2, 0.3, 0.4, 1.0]
+
+    assert timer.summary() == {"login_flow": {"p50": 0.3, "p95": 0.88, "samples": 5}}
+
+
+def test_regression_is_reported_against_the_median_of_recent_runs():
+    history = [
+        run_with({"login_flow": {"p50": 9.0, "p95": 9.0}}),
+        run_with({"login_flow": {"p50": 1.0, "p95": 2.0}}),
+        run_with({"login_flow": {"p50": 1.2, "p95": 2.0}}),
+        run_with({"login_flow": {"p50": 1.1, "p95": 2.2}, "first_get": {"p50": 0.5, "p95": 0.6}}),
+    ]
+    summary = {
+        "login_flow": {"p50": 1.5, "p95": 2.3, "samples": 5},
+        "first_get": {"p50": 0.5, "p95": 0.6, "samples": 5},
+        "teardown": {"p50": 0.1, "p95": 0.1, "samples": 5},
+    }
+
+    assert find_regressions(summary, history, threshold=0.2, baseline_runs=3) == [
+        "login_flow p50: 1500 ms vs baseline 1100 ms (+36%, threshold 20%)",
+    ]
+    assert find_regressions(summary, history, threshold=0.5, baseline_runs=3) == []
+
+
+def test_history_is_empty_until_written(tmp_path):
+    path = tmp_path / "history.json"
+    assert load_history(str(path)) == []
+
+    path.write_text(json.dumps([run_with({})]), encoding="utf-8")
+    assert load_history(str(path)) == [run_with({})]
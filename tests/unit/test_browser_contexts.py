@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from configuration import browser_contexts
+from configuration.browser_contexts import ContextHost
+
+
+class HostDriver:
+    """
+    The host session, creating numbered contexts and targets.
+    """
+
+    def __init__(self) -> None:
+        self.caps = {"goog:chromeOptions": {"debuggerAddress": "localhost:9222"}}
+        self.service = SimpleNamespace(service_url="http://localhost:9515")
+        self.commands: List[Any] = []
+        self.quit_calls = 0
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.commands.append((command, params))
+        number = len(self.commands)
+        return {"browserContextId": f"context-{number}", "targetId": f"target-{number}"}
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+class AttachedDriver:
+    """
+    Stands in for ContextDriver, recording the commands sent to its own session.
+    """
+
+    fail = False
+
+    def __init__(self, host: ContextHost, context_id: str, window_handle: str) -> None:
+        self.host = host
+        self.context_id = context_id
+        self.window_handle = window_handle
+        self.commands: List[str] = []
+        self.quit_calls = 0
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        if self.fail:
+            raise WebDriverException("target closed")
+        self.commands.append(command)
+        return {}
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+        self.host.dispose(self.context_id)
+
+
+@pytest.fixture
+def host(monkeypatch):
+    monkeypatch.setattr(browser_contexts, "ContextDriver", AttachedDriver)
+    return ContextHost(driver_factory=HostDriver)
+
+
+def test_new_context_attaches_a_session_to_a_new_window(host):
+    context = host.new_context()
+
+    assert host.driver.commands == [
+        ("Target.createBrowserContext", {}),
+        ("Target.createTarget", {"url": "about:blank", "browserContextId": "context-1", "newWindow": True}),
+    ]
+    assert (context.context_id, context.window_handle) == ("context-1", "target-2")
+    assert context.commands == ["Network.enable", "Network.setBlockedURLs", "Page.addScriptToEvaluateOnNewDocument"]
+    assert (host.debugger_address, host.service_url) == ("localhost:9222", "http://localhost:9515")
+
+
+def test_quit_disposes_of_the_context(host):
+    context = host.new_context()
+    context.quit()
+
+    assert host.driver.commands[-1] == ("Target.disposeBrowserContext", {"browserContextId": "context-1"})
+    host.close()
+    assert context.quit_calls == 1
+    assert host.driver.quit_calls == 1
+
+
+def test_close_quits_every_context_and_the_host(host):
+    first, second = host.new_context(), host.new_context()
+    host.close()
+
+    assert (first.quit_calls, second.quit_calls, host.driver.quit_calls) == (1, 1, 1)
+    assert [params for command, params in host.driver.commands if command == "Target.disposeBrowserContext"] == [
+        {"browserContextId": "context-1"}, {"browserContextId": "context-3"},
+    ]
+
+
+def test_context_is_disposed_of_when_its_setup_fails(host, monkeypatch):
+    monkeypatch.setattr(AttachedDriver, "fail", True)
+
+    with pytest.raises(WebDriverException):
+        host.new_context()
+    assert host.driver.commands[-1] == ("Target.disposeBrowserContext", {"browserContextId": "context-1"})
+    host.close()
+    assert host.driver.quit_calls == 1
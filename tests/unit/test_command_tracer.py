@@ -0,0 +1,68 @@
+import json
+import pytest
+from selenium.webdriver.common.by import By
+
+from pages import base_page
+from pages.base_page import BasePage
+from utils.command_tracer import CommandTracer
+
+
+class Executor:
+    """
+    A command executor answering every command with an empty value.
+    """
+
+    def execute(self, command: str, params: dict) -> dict:
+        return {"value": None}
+
+
+class Driver:
+    def __init__(self) -> None:
+        self.command_executor = Executor()
+
+
+class TicketPage(BasePage):
+    def read_title(self) -> None:
+        self.driver.command_executor.execute("getTitle", {})
+        self.timeout_for((By.ID, "title"))
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = CommandTracer(enabled=True)
+    monkeypatch.setattr(base_page, "command_tracer", tracer)
+    return tracer
+
+
+def test_page_methods_are_wrapped_once():
+    assert TicketPage.read_title.__wrapped__.__qualname__ == "TicketPage.read_title"
+    assert not hasattr(TicketPage.read_title.__wrapped__, "__wrapped__")
+    assert not hasattr(BasePage.timeout_for, "__wrapped__")
+
+
+def test_commands_nest_under_the_page_method_span(tracer, tmp_path):
+    driver = Driver()
+    tracer.attach(driver)
+
+    TicketPage(driver).read_title()
+    tracer.detach(driver)
+
+    tracer.export(str(tmp_path / "trace.json"), {"test": "test_trace"})
+    with open(tmp_path / "trace.json", encoding="utf-8") as trace_file:
+        trace = json.load(trace_file)
+    span, command = sorted(trace["traceEvents"], key=lambda event: event["cat"])
+    assert (span["name"], span["cat"]) == ("TicketPage.read_title", "page")
+    assert (command["name"], command["cat"]) == ("getTitle", "webdriver")
+    assert span["ts"] <= command["ts"] and command["ts"] + command["dur"] <= span["ts"] + span["dur"]
+    assert trace["otherData"] == {"test": "test_trace", "commands": {"getTitle": 1}, "round_trips": 1, "seconds": 0.0}
+
+
+def test_disabled_tracer_records_nothing(monkeypatch):
+    tracer = CommandTracer(enabled=False)
+    monkeypatch.setattr(base_page, "command_tracer", tracer)
+    driver = Driver()
+    tracer.attach(driver)
+
+    TicketPage(driver).read_title()
+
+    assert tracer.summary()["round_trips"] == 0
@@ -0,0 +1,168 @@
+import threading
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import configuration.test_driver as test_driver_module
+from configuration.driver_pool import DriverPool, PoolTimeout, clean_session, is_session_healthy
+
+
+URL = "http://app.test/"
+
+
+class FakeDriver:
+    """
+    A session recording the commands the pool sends to it.
+    """
+
+    def __init__(self) -> None:
+        self.handles = ["main"]
+        self.crashed = False
+        self.quit_calls = 0
+        self.commands: List[str] = []
+        self.switch_to = SimpleNamespace(window=lambda handle: self.commands.append(f"switch {handle}"))
+        self.caps = {}
+        self.command_executor = SimpleNamespace()
+
+    @property
+    def current_window_handle(self) -> str:
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        return self.handles[0]
+
+    @property
+    def window_handles(self) -> List[str]:
+        return list(self.handles)
+
+    def close(self) -> None:
+        self.commands.append("close")
+
+    def execute_script(self, script: str) -> None:
+        self.commands.append("clear storage")
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.commands.append(command)
+        return {}
+
+    def get_log(self, log_type: str) -> list:
+        return []
+
+    def get(self, url: str) -> None:
+        self.commands.append(f"get {url}")
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+class Factory:
+    """
+    Starts FakeDrivers and remembers them.
+    """
+
+    def __init__(self) -> None:
+        self.started: List[FakeDriver] = []
+
+    def __call__(self) -> FakeDriver:
+        driver = FakeDriver()
+        self.started.append(driver)
+        return driver
+
+
+@pytest.fixture
+def factory() -> Factory:
+    return Factory()
+
+
+def test_is_session_healthy():
+    driver = FakeDriver()
+    assert is_session_healthy(driver)
+    driver.crashed = True
+    assert not is_session_healthy(driver)
+
+
+def test_clean_session_closes_extra_windows_clears_state_and_reloads():
+    driver = FakeDriver()
+    driver.handles = ["main", "popup"]
+    clean_session(driver, URL)
+    assert driver.commands == [
+        "switch popup", "close", "switch main", "clear storage",
+        "Network.clearBrowserCookies", "Storage.clearDataForOrigin", f"get {URL}",
+    ]
+
+
+def test_released_session_is_cleaned_and_reused(factory):
+    pool = DriverPool(url=URL, size=1, driver_factory=factory)
+    driver = pool.lease()
+    pool.release(driver)
+    assert pool.lease() is driver
+    assert len(factory.started) == 1
+    assert driver.commands.count(f"get {URL}") == 2
+
+
+def test_session_is_recycled_after_max_uses(factory):
+    pool = DriverPool(url=URL, size=1, max_uses=2, driver_factory=factory)
+    first = pool.lease()
+    pool.release(first)
+    assert pool.lease() is first
+    pool.release(first)
+    assert first.quit_calls == 1
+    second = pool.lease()
+    assert second is not first
+    assert len(factory.started) == 2
+
+
+def test_unhealthy_sessions_are_dropped(factory):
+    pool = DriverPool(url=URL, size=1, driver_factory=factory)
+    first = pool.lease()
+    pool.release(first)
+    first.crashed = True
+    second = pool.lease()
+    assert second is not first
+    assert first.quit_calls == 1
+
+    second.crashed = True
+    pool.release(second)
+    assert second.quit_calls == 1
+    assert pool.lease() is factory.started[2]
+
+
+def test_lease_times_out_when_every_session_is_leased(factory):
+    pool = DriverPool(url=URL, size=1, driver_factory=factory, lease_timeout=0.05)
+    pool.lease()
+    with pytest.raises(PoolTimeout, match="within 0.05s"):
+        pool.lease()
+
+
+def test_close_wakes_blocked_leasers(factory):
+    pool = DriverPool(url=URL, size=1, driver_factory=factory, lease_timeout=10)
+    driver = pool.lease()
+    errors = []
+
+    def lease() -> None:
+        try:
+            pool.lease()
+        except RuntimeError as error:
+            errors.append(error)
+
+    waiter = threading.Thread(target=lease)
+    waiter.start()
+    pool.close()
+    waiter.join(timeout=2)
+    assert not waiter.is_alive()
+    assert [str(error) for error in errors] == ["The driver pool has been closed."]
+    pool.release(driver)
+    assert driver.quit_calls == 1
+
+
+def test_failed_setup_returns_the_session_to_the_pool(factory, monkeypatch):
+    def fail(driver, profile):
+        raise WebDriverException("Network.setBlockedURLs failed")
+
+    monkeypatch.setattr(test_driver_module, "apply_blocking_profile", fail)
+    pool = DriverPool(url=URL, size=1, driver_factory=factory, lease_timeout=0.05)
+    with pytest.raises(WebDriverException):
+        with test_driver_module.TestDriver(url=URL, pool=pool):
+            pass
+    assert pool.lease() is factory.started[0]
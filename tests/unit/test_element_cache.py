@@ -0,0 +1,105 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from pages.base_page import BasePage, mark_navigation
+
+
+BUTTON = (By.ID, "next")
+
+
+class FakeElement(WebElement):
+    """
+    A displayed, enabled element that can be made stale.
+    """
+
+    def __init__(self, driver: "FakeDriver", stale_on_click: bool = False) -> None:
+        super().__init__(driver, f"element-{len(driver.found)}")
+        self.stale = False
+        self.stale_on_click = stale_on_click
+        self.clicks = 0
+
+    def _check(self) -> None:
+        if self.stale:
+            raise StaleElementReferenceException("stale")
+
+    def is_displayed(self) -> bool:
+        self._check()
+        return True
+
+    def is_enabled(self) -> bool:
+        self._check()
+        return True
+
+    def click(self) -> None:
+        if self.stale_on_click:
+            self.stale = True
+        self._check()
+        self.clicks += 1
+
+
+class FakeDriver:
+    """
+    A session creating a new element for every find_element command.
+    """
+
+    def __init__(self, stale_on_first_click: bool = False) -> None:
+        self.found = []
+        self.stale_on_first_click = stale_on_first_click
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        element = FakeElement(self, stale_on_click=self.stale_on_first_click and not self.found)
+        self.found.append(element)
+        return element
+
+
+def test_clicks_reuse_the_cached_element():
+    driver = FakeDriver()
+    page = BasePage(driver)
+
+    page.click(BUTTON)
+    page.click(BUTTON)
+
+    assert len(driver.found) == 1
+    assert driver.found[0].clicks == 2
+    assert (page.element_cache.hits, page.element_cache.misses) == (1, 1)
+
+
+def test_new_documents_clear_the_cache():
+    driver = FakeDriver()
+    page = BasePage(driver)
+    page.click(BUTTON)
+
+    mark_navigation(driver)
+    page.click(BUTTON)
+
+    assert len(driver.found) == 2
+
+
+def test_stale_cached_element_is_located_again():
+    driver = FakeDriver()
+    page = BasePage(driver)
+    page.click(BUTTON)
+    driver.found[0].stale = True
+
+    page.click(BUTTON)
+
+    assert [element.clicks for element in driver.found] == [1, 1]
+    assert (page.element_cache.hits, page.element_cache.misses) == (0, 2)
+
+
+def test_element_going_stale_before_the_action_is_retried():
+    driver = FakeDriver(stale_on_first_click=True)
+
+    BasePage(driver).click(BUTTON)
+
+    assert [element.clicks for element in driver.found] == [0, 1]
+
+
+def test_second_stale_action_fails():
+    driver = FakeDriver()
+    driver.find_element = lambda by, value: FakeElement(driver, stale_on_click=True)
+
+    with pytest.raises(StaleElementReferenceException):
+        BasePage(driver).click(BUTTON)
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from configuration.endpoints import Endpoint, EndpointScheduler, EndpointUnavailable, parse_endpoints
+
+
+def scheduler_for(endpoints, slots_dir, **kwargs) -> EndpointScheduler:
+    return EndpointScheduler(endpoints, slots_dir=str(slots_dir), poll_interval=0.01, **kwargs)
+
+
+def soon(seconds: float = 0.2) -> float:
+    return time.monotonic() + seconds
+
+
+def test_parse_endpoints():
+    endpoints = parse_endpoints("http://127.0.0.1:9515*2, http://grid:4444/wd/hub/ ,")
+
+    assert [(endpoint.url, endpoint.capacity) for endpoint in endpoints] == [
+        ("http://127.0.0.1:9515", 2), ("http://grid:4444/wd/hub", 1),
+    ]
+
+
+def test_ties_rotate_round_robin(tmp_path):
+    scheduler = scheduler_for([Endpoint("http://a"), Endpoint("http://b"), Endpoint("http://c")], tmp_path)
+    used = []
+
+    for _ in range(4):
+        endpoint = scheduler.acquire(soon())
+        used.append(endpoint.url)
+        scheduler.release(endpoint)
+
+    assert used == ["http://a", "http://b", "http://c", "http://a"]
+
+
+def test_least_loaded_endpoint_wins(tmp_path):
+    scheduler = scheduler_for([Endpoint("http://a", 2), Endpoint("http://b", 4)], tmp_path)
+
+    used = [scheduler.acquire(soon()).url for _ in range(4)]
+
+    # Free shares: a 2/2 = b 4/4, then a 1/2 < b 4/4, a 1/2 < b 3/4, a 1/2 = b 2/4.
+    assert used == ["http://a", "http://b", "http://b", "http://a"]
+
+
+def test_schedulers_of_other_workers_share_the_load(tmp_path):
+    first = scheduler_for([Endpoint("http://a"), Endpoint("http://b")], tmp_path)
+    second = scheduler_for([Endpoint("http://a"), Endpoint("http://b")], tmp_path)
+
+    assert first.acquire(soon()).url == "http://a"
+    assert second.acquire(soon()).url == "http://b"
+
+
+def test_full_endpoints_time_out(tmp_path):
+    first = scheduler_for([Endpoint("http://a")], tmp_path)
+    second = scheduler_for([Endpoint("http://a")], tmp_path)
+    endpoint = first.acquire(soon())
+
+    with pytest.raises(EndpointUnavailable):
+        second.acquire(soon(0.05))
+
+    first.release(endpoint)
+    assert second.acquire(soon()).url == "http://a"
+
+
+def test_failing_endpoint_leaves_rotation_until_ready(tmp_path, monkeypatch):
+    broken, working = Endpoint("http://a"), Endpoint("http://b")
+    scheduler = scheduler_for([broken, working], tmp_path, max_failures=2, retry_after=0)
+    monkeypatch.setattr(Endpoint, "is_ready", lambda endpoint: False)
+    for _ in range(2):
+        scheduler.release(scheduler.acquire(soon()), failed=True)
+        scheduler.release(scheduler.acquire(soon()))
+
+    assert not broken.healthy
+    scheduler.release(scheduler.acquire(soon()))
+    assert scheduler.acquire(soon()).url == "http://b"
+
+    monkeypatch.setattr(Endpoint, "is_ready", lambda endpoint: True)
+    assert scheduler.acquire(soon()).url == "http://a"
+    assert broken.healthy
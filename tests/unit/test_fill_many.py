@@ -0,0 +1,48 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from pages.base_page import FILL_MANY_JS, BasePage
+
+
+LAST_NAME = (By.CSS_SELECTOR, "[formcontrolname='lastName']")
+BIO = (By.ID, "bio")
+PHONE = (By.ID, "phone")
+
+
+class ScriptDriver:
+    """
+    A session answering FILL_MANY_JS with fixed skipped and unmatched field indexes.
+    """
+
+    def __init__(self, skipped: list, missing_options: list) -> None:
+        self.result = [skipped, missing_options]
+        self.fields = None
+
+    def execute_script(self, script: str, *args):
+        assert script == FILL_MANY_JS
+        self.fields = args[0]
+        return self.result
+
+
+@pytest.fixture
+def typed(monkeypatch):
+    typed = []
+    monkeypatch.setattr(BasePage, "fill", lambda page, locator, text: typed.append((locator, text)))
+    return typed
+
+
+def test_skipped_and_typed_fields_are_filled_key_by_key(typed):
+    driver = ScriptDriver(skipped=[1], missing_options=[])
+
+    BasePage(driver).fill_many({"lastName": "Kowalski", BIO: "Tester", PHONE: "123456789"}, typed=[PHONE])
+
+    assert driver.fields == [["css selector", "[formcontrolname='lastName']", "Kowalski"], ["id", "bio", "Tester"]]
+    assert typed == [(BIO, "Tester"), (PHONE, "123456789")]
+
+
+def test_select_without_a_matching_option_fails(typed):
+    driver = ScriptDriver(skipped=[], missing_options=[0])
+
+    with pytest.raises(ValueError, match="'Gdańsk'"):
+        BasePage(driver).fill_many({(By.ID, "city"): "Gdańsk"})
+    assert typed == []
@@ -0,0 +1,131 @@
+import ast
+import os
+
+import pytest
+
+from pages.base_page import BasePage
+from pages.home_page import HomePageLocators
+from utils import impact_index
+from utils.impact_index import ImpactIndex, select_tests, usage_recorder
+
+
+HOME_PAGE = "pages/home_page.py"
+BASE_PAGE = "pages/base_page.py"
+LOGO_TEST = "tests/home/test_is_header_logo_present.py::test_is_header_logo_present"
+LOGIN_TEST = "tests/authentication/test_login_button.py::test_login_button"
+TICKET_TEST = "tests/tickets/test_is_pricing_step_displayed.py::test_is_pricing_step_displayed"
+CLICK_TEST = "tests/forms/test_click.py::test_click"
+
+
+class Driver:
+    pass
+
+
+class CheckoutPage(BasePage):
+    def click_pay(self, locator: tuple) -> None:
+        pass
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ImpactIndex(str(tmp_path / "index.json"))
+    index.update(LOGO_TEST, {f"{HOME_PAGE}::HomePage.is_header_logo_present"}, replace=True)
+    index.update(LOGIN_TEST, {f"{HOME_PAGE}::HomePage.go_to_login_page"}, replace=True)
+    return index
+
+
+def changes(monkeypatch, paths, lines=()):
+    monkeypatch.setattr(impact_index, "changed_files", lambda revision: list(paths))
+    monkeypatch.setattr(impact_index, "changed_lines", lambda revision, path: set(lines))
+
+
+def lines_of(symbol: str) -> range:
+    return impact_index.page_symbols(HOME_PAGE)[f"{HOME_PAGE}::{symbol}"]
+
+
+def member_lines(path: str, class_name: str, member_name: str) -> range:
+    with open(os.path.join(impact_index.PROJECT_ROOT, path), encoding="utf-8") as source:
+        tree = ast.parse(source.read())
+    cls = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == class_name)
+    member = next(node for node in cls.body if getattr(node, "name", None) == member_name)
+    return range(member.lineno, member.end_lineno + 1)
+
+
+def test_page_methods_record_the_method_and_its_locators():
+    usage_recorder.start()
+    CheckoutPage(Driver()).click_pay(HomePageLocators.LOGIN_BUTTON)
+    used = usage_recorder.stop()
+
+    assert used == {
+        "tests/unit/test_impact_index.py::CheckoutPage.click_pay",
+        f"{HOME_PAGE}::HomePageLocators.LOGIN_BUTTON",
+    }
+
+
+def test_changed_method_selects_its_users_and_unknown_tests(index, monkeypatch):
+    changes(monkeypatch, [HOME_PAGE], lines_of("HomePage.go_to_login_page"))
+
+    assert select_tests(index, [LOGO_TEST, LOGIN_TEST, TICKET_TEST], "HEAD") == {LOGIN_TEST, TICKET_TEST}
+
+
+def test_module_level_change_selects_every_user_of_the_module(index, monkeypatch):
+    changes(monkeypatch, [HOME_PAGE], [1])
+
+    assert select_tests(index, [LOGO_TEST, LOGIN_TEST], "HEAD") == {LOGO_TEST, LOGIN_TEST}
+
+
+def test_changed_test_file_selects_its_tests(index, monkeypatch):
+    changes(monkeypatch, ["tests/home/test_is_header_logo_present.py", "README.md"])
+
+    assert select_tests(index, [LOGO_TEST, LOGIN_TEST], "HEAD") == {LOGO_TEST}
+
+
+def test_change_outside_pages_and_tests_runs_everything(index, monkeypatch):
+    changes(monkeypatch, ["configuration/driver_factory.py"])
+
+    assert select_tests(index, [LOGO_TEST, LOGIN_TEST], "HEAD") is None
+
+
+def test_failed_tests_add_to_their_usage(index):
+    index.update(LOGO_TEST, {f"{HOME_PAGE}::HomePage.__init__"}, replace=False)
+
+    assert index.tests[LOGO_TEST] == [f"{HOME_PAGE}::HomePage.__init__", f"{HOME_PAGE}::HomePage.is_header_logo_present"]
+
+
+def test_saves_of_parallel_workers_are_merged(tmp_path):
+    path = str(tmp_path / "index.json")
+    first, second = ImpactIndex(path), ImpactIndex(path)
+    first.update(LOGO_TEST, {"a"}, replace=True)
+    second.update(LOGIN_TEST, {"b"}, replace=True)
+    second.update("tests/removed/test_removed.py::test_removed", {"c"}, replace=True)
+
+    first.save()
+    second.save()
+
+    assert ImpactIndex(path).tests == {LOGO_TEST: ["a"], LOGIN_TEST: ["b"]}
+
+
+@pytest.mark.parametrize("class_name, member_name", [
+    ("Wait", "until"),
+    ("ElementCache", "get"),
+    ("AssertionWrapper", "is_displayed"),
+    ("Snapshot", "assert_text"),
+    ("BasePage", "_act"),
+    ("BasePage", "__init__"),
+    ("BasePage", "timeout_for"),
+    ("BasePage", "form_control"),
+])
+def test_change_to_an_unrecorded_member_selects_every_user_of_the_module(index, monkeypatch, class_name, member_name):
+    index.update(CLICK_TEST, {f"{BASE_PAGE}::BasePage.click"}, replace=True)
+    changes(monkeypatch, [BASE_PAGE], member_lines(BASE_PAGE, class_name, member_name))
+
+    assert select_tests(index, [LOGO_TEST, CLICK_TEST], "HEAD") == {CLICK_TEST}
+
+
+def test_recorded_symbols_are_public_page_methods_and_locators():
+    symbols = impact_index.page_symbols(BASE_PAGE)
+
+    assert f"{BASE_PAGE}::BasePage.click" in symbols
+    assert not [symbol for symbol in symbols if "::BasePage." not in symbol]
+    assert not {f"{BASE_PAGE}::BasePage.{name}" for name in ("_act", "timeout_for", "form_control")} & set(symbols)
+    assert f"{HOME_PAGE}::HomePageLocators.LOGIN_BUTTON" in impact_index.page_symbols(HOME_PAGE)
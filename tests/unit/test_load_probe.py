@@ -0,0 +1,81 @@
+import time
+from typing import List
+
+import pytest
+
+from benchmarks import load_probe
+from benchmarks.load_probe import LoadRecorder, VirtualUser, run_user
+
+
+class Browser:
+    """
+    A session that counts the scripts it ran and whether it was quit.
+    """
+
+    def __init__(self, responds: bool = True) -> None:
+        self.responds = responds
+        self.quit_calls = 0
+
+    def execute_script(self, script: str) -> int:
+        if not self.responds:
+            raise ConnectionResetError("browser gone")
+        return 1
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+def test_summary_computes_percentiles_histogram_and_error_rate():
+    recorder = LoadRecorder()
+    for milliseconds in (40, 80, 150, 300, 12000):
+        recorder.record_step("log_in", milliseconds / 1000)
+    recorder.record_step("log_in", 0.6, TimeoutError("no profile"))
+    recorder.record_iteration("login", failed=False)
+    recorder.record_iteration("login", failed=True)
+
+    summary = recorder.summary(elapsed=4)
+    step = summary["steps"]["log_in"]
+
+    assert step["count"] == 6
+    assert step["errors"] == {"TimeoutError": 1}
+    assert step["error_rate"] == round(1 / 6, 4)
+    assert (step["p50"], step["max"]) == (0.225, 12.0)
+    assert step["p95"] == pytest.approx(9.15)
+    assert step["histogram"] == {
+        "<=50ms": 1, "<=100ms": 1, "<=200ms": 1, "<=500ms": 1, "<=1000ms": 1,
+        "<=2000ms": 0, "<=5000ms": 0, "<=10000ms": 0, ">10000ms": 1,
+    }
+    assert summary["scenarios"] == {"login": {"iterations": 2, "failures": 1, "per_second": 0.5}}
+
+
+def test_user_keeps_running_after_unexpected_errors(monkeypatch):
+    browsers: List[Browser] = []
+    starts = iter([OSError("chromedriver missing"), Browser(responds=False), Browser()])
+
+    def create_driver() -> Browser:
+        result = next(starts)
+        if isinstance(result, Exception):
+            raise result
+        browsers.append(result)
+        return result
+
+    calls = []
+
+    def flaky(user: VirtualUser) -> None:
+        calls.append(user.driver)
+        if len(calls) == 1:
+            raise KeyError("ticket")
+
+    monkeypatch.setattr(load_probe, "create_driver", create_driver)
+    monkeypatch.setitem(load_probe.SCENARIOS, "probe", (("flaky", flaky),))
+    recorder = LoadRecorder()
+
+    run_user(recorder, "http://app.test/", "Testowy_1", "probe", 0, time.monotonic() + 60, 4, (0, 0))
+
+    summary = recorder.summary(elapsed=1)
+    assert summary["steps"]["start_session"]["errors"] == {"OSError": 1}
+    assert summary["steps"]["flaky"]["errors"] == {"KeyError": 1}
+    assert summary["steps"]["flaky"]["count"] == 3
+    assert summary["scenarios"]["probe"] == {"iterations": 4, "failures": 2, "per_second": 4.0}
+    assert [browser.quit_calls for browser in browsers] == [1, 1]
+    assert calls == [browsers[0], browsers[1], browsers[1]]
@@ -0,0 +1,69 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from configuration.network_blocking import (
+    BLOCKING_PROFILES,
+    apply_blocking_profile,
+    blocks_images,
+    collect_network_usage,
+)
+
+
+class CdpDriver:
+    """
+    A session recording CDP commands and returning canned performance log entries.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]] = ()) -> None:
+        self.commands: List[Any] = []
+        self.events = list(events)
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.commands.append((command, params))
+        return {}
+
+    def get_log(self, log_type: str) -> List[Dict[str, str]]:
+        entries = [{"message": json.dumps({"message": event})} for event in self.events]
+        self.events = []
+        return entries
+
+
+def test_profile_is_sent_once_per_session():
+    driver = CdpDriver()
+
+    assert apply_blocking_profile(driver, "no-media")
+    assert not apply_blocking_profile(driver, "no-media")
+    assert apply_blocking_profile(driver, "full")
+    assert driver.commands == [
+        ("Network.enable", {}),
+        ("Network.setBlockedURLs", {"urls": list(BLOCKING_PROFILES["no-media"])}),
+        ("Network.enable", {}),
+        ("Network.setBlockedURLs", {"urls": []}),
+    ]
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="Unknown blocking profile 'none'"):
+        apply_blocking_profile(CdpDriver(), "none")
+
+
+def test_image_blocking_by_profile():
+    assert blocks_images("minimal")
+    assert blocks_images("no-media")
+    assert not blocks_images("full")
+    assert not blocks_images(None)
+
+
+def test_network_usage_counts_loaded_and_blocked_requests():
+    driver = CdpDriver([
+        {"method": "Network.requestWillBeSent", "params": {"requestId": "1", "request": {"url": "https://renk/"}}},
+        {"method": "Network.loadingFinished", "params": {"requestId": "1", "encodedDataLength": 5120}},
+        {"method": "Network.loadingFinished", "params": {"requestId": "2", "encodedDataLength": 880}},
+        {"method": "Network.loadingFailed", "params": {"requestId": "3", "blockedReason": "inspector"}},
+        {"method": "Network.loadingFailed", "params": {"requestId": "4", "errorText": "net::ERR_ABORTED"}},
+    ])
+
+    assert collect_network_usage(driver) == {"loaded_requests": 2, "loaded_bytes": 6000, "blocked_requests": 1}
+    assert collect_network_usage(driver) == {"loaded_requests": 0, "loaded_bytes": 0, "blocked_requests": 0}
@@ -0,0 +1,122 @@
+import base64
+import json
+from types import SimpleNamespace
+
+import trio
+from selenium.webdriver.common.bidi import cdp
+
+from configuration.network_replay import Cassette, NetworkInterceptor, request_key
+
+
+devtools = cdp.import_devtools("133")
+
+
+class RecordingSession:
+    """
+    A DevTools session that records the commands sent to it.
+    """
+
+    def __init__(self) -> None:
+        self.commands = []
+
+    async def execute(self, command):
+        self.commands.append(next(command))
+        return None
+
+
+def paused(method: str, url: str, post_data: str = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        request_id=devtools.fetch.RequestId("interception-1"),
+        request=SimpleNamespace(method=method, url=url, post_data=post_data),
+    )
+
+
+def replay(cassette: Cassette, event: SimpleNamespace, on_missing: str = "fail"):
+    interceptor = NetworkInterceptor(
+        SimpleNamespace(current_window_handle="TARGET"), cassette, "replay", on_missing=on_missing
+    )
+    session = RecordingSession()
+    trio.run(interceptor._replay, session, devtools, event)
+    return interceptor, session.commands
+
+
+def interaction(key: str, body: str, status: int = 200) -> dict:
+    return {"key": key, "status": status, "status_text": "OK", "headers": [["Content-Type", "application/json"]],
+            "body": body, "base64": False}
+
+
+def test_request_key_matches_method_url_and_body():
+    login = request_key("POST", "https://renk/api/auth/login", '{"login": "a"}')
+
+    assert login == request_key("POST", "https://renk/api/auth/login", '{"login": "a"}')
+    assert login != request_key("POST", "https://renk/api/auth/login", '{"login": "b"}')
+    assert login != request_key("PUT", "https://renk/api/auth/login", '{"login": "a"}')
+    assert request_key("GET", "https://renk/api/profile", None) == "GET https://renk/api/profile#"
+
+
+def test_next_response_replays_in_order_then_repeats_the_last(tmp_path):
+    cassette = Cassette(str(tmp_path / "test.json"))
+    for body in ("first", "second"):
+        cassette.add(interaction("GET /api/tickets#", body))
+    cassette.add(interaction("GET /api/profile#", "profile"))
+
+    bodies = [cassette.next_response("GET /api/tickets#")["body"] for _ in range(4)]
+
+    assert bodies == ["first", "second", "second", "second"]
+    assert cassette.next_response("GET /api/profile#")["body"] == "profile"
+    assert cassette.next_response("GET /api/unknown#") is None
+
+
+def test_saved_cassette_loads_back(tmp_path):
+    path = str(tmp_path / "home" / "test.json")
+    cassette = Cassette(path)
+    cassette.add(interaction("GET /api/profile#", "profile"))
+    cassette.save()
+
+    assert Cassette(path).exists
+    assert Cassette(path).next_response("GET /api/profile#")["body"] == "profile"
+
+
+def test_new_recording_replaces_the_cassette(tmp_path):
+    path = str(tmp_path / "test.json")
+    stale = Cassette(path)
+    stale.add(interaction("GET /api/profile#", "stale"))
+    stale.save()
+
+    recording = Cassette(path, load=False)
+    recording.add(interaction("GET /api/profile#", "fresh"))
+    recording.save()
+
+    with open(path, encoding="utf-8") as cassette_file:
+        assert [item["body"] for item in json.load(cassette_file)["interactions"]] == ["fresh"]
+
+
+def test_replay_fulfills_recorded_requests(tmp_path):
+    cassette = Cassette(str(tmp_path / "test.json"))
+    cassette.add(interaction(request_key("GET", "https://renk/api/profile", None), '{"city": "Warszawa"}'))
+
+    interceptor, commands = replay(cassette, paused("GET", "https://renk/api/profile"))
+
+    assert interceptor.misses == []
+    assert [command["method"] for command in commands] == ["Fetch.fulfillRequest"]
+    assert commands[0]["params"]["responseCode"] == 200
+    assert base64.b64decode(commands[0]["params"]["body"]) == b'{"city": "Warszawa"}'
+
+
+def test_replay_miss_fails_the_request_and_is_reported(tmp_path):
+    interceptor, commands = replay(
+        Cassette(str(tmp_path / "test.json")), paused("POST", "https://renk/api/tickets", "{}")
+    )
+
+    assert interceptor.misses == [request_key("POST", "https://renk/api/tickets", "{}")]
+    assert [command["method"] for command in commands] == ["Fetch.failRequest"]
+    assert commands[0]["params"]["errorReason"] == "BlockedByClient"
+
+
+def test_replay_miss_passes_through_when_configured(tmp_path):
+    interceptor, commands = replay(
+        Cassette(str(tmp_path / "test.json")), paused("GET", "https://renk/api/tickets"), on_missing="passthrough"
+    )
+
+    assert interceptor.misses == []
+    assert [command["method"] for command in commands] == ["Fetch.continueRequest"]
@@ -0,0 +1,100 @@
+import pytest
+
+from configuration.network_blocking import apply_blocking_profile
+from pages import base_page
+from pages.base_page import APP_STATE_JS, mark_navigation
+from pages.home_page import HomePage
+from utils.page_performance import (
+    COLLECT_METRICS_JS,
+    PagePerformance,
+    PerformanceBudgetWarning,
+    check_budgets,
+)
+
+
+DOCUMENT_LOAD = {
+    "url": "http://renk/", "documentLoad": True, "ttfb": 0.1, "fcp": 0.4, "lcp": 3.2,
+    "cls": 0.01, "long_tasks": 0, "long_task_time": 0,
+}
+
+
+class StableAppDriver:
+    """
+    A session whose app is always stable and which reports fixed navigation metrics.
+    """
+
+    def __init__(self, metrics: dict) -> None:
+        self.metrics = metrics
+        self.cdp_commands = []
+
+    def execute_script(self, script: str, *args):
+        if script == APP_STATE_JS:
+            return {"loaded": True, "zonesStable": True, "pendingRequests": 0, "quietFor": 1.0, "url": "http://renk/"}
+        if script == COLLECT_METRICS_JS:
+            return dict(self.metrics)
+        raise AssertionError("unexpected script")
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.cdp_commands.append(command)
+        return {"metrics": [{"name": "LayoutCount", "value": 3}]}
+
+
+@pytest.fixture
+def recorder(monkeypatch, tmp_path):
+    recorder = PagePerformance(True, str(tmp_path))
+    monkeypatch.setattr(base_page, "page_performance", recorder)
+    return recorder
+
+
+def test_pooled_load_is_measured_without_navigation_time(recorder):
+    driver = StableAppDriver(DOCUMENT_LOAD)
+    apply_blocking_profile(driver, "full")
+    mark_navigation(driver, timed=False)
+
+    HomePage(driver).wait_until_app_stable()
+
+    [record] = recorder.take(driver)
+    assert record["page"] == "HomePage"
+    assert record["document_load"]
+    assert "navigation_time" not in record["metrics"]
+    assert record["metrics"]["lcp"] == 3.2
+    assert record["violations"] == ["HomePage lcp=3.2 exceeds the budget of 2.5"]
+
+
+def test_timed_navigation_reports_navigation_time(recorder):
+    driver = StableAppDriver(DOCUMENT_LOAD)
+    mark_navigation(driver)
+
+    HomePage(driver).wait_until_app_stable()
+
+    [record] = recorder.take(driver)
+    assert record["metrics"]["navigation_time"] >= 0
+
+
+def test_lcp_is_skipped_when_images_are_blocked(recorder):
+    driver = StableAppDriver(DOCUMENT_LOAD)
+    apply_blocking_profile(driver, "minimal")
+    mark_navigation(driver, timed=False)
+
+    HomePage(driver).wait_until_app_stable()
+
+    [record] = recorder.take(driver)
+    assert "lcp" not in record["metrics"]
+    assert record["metrics"]["fcp"] == 0.4
+    assert record["blocking_profile"] == "minimal"
+    assert record["violations"] == []
+
+
+def test_unmarked_wait_is_not_measured(recorder):
+    driver = StableAppDriver(DOCUMENT_LOAD)
+
+    HomePage(driver).wait_until_app_stable()
+
+    assert recorder.take(driver) == []
+
+
+def test_budget_violations_warn_by_default():
+    records = [{"violations": ["HomePage lcp=3.2 exceeds the budget of 2.5"]}]
+
+    with pytest.warns(PerformanceBudgetWarning, match="lcp=3.2"):
+        assert check_budgets(records) == records[0]["violations"]
@@ -0,0 +1,69 @@
+import pytest
+
+from utils import parallel
+from utils.parallel import CollectionError, assign_longest_first, collect_tests, merge_reports
+
+
+def test_longest_tests_are_spread_first():
+    timings = {"a": 8.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}
+
+    assignment = assign_longest_first(list(timings), timings, 2)
+
+    assert assignment == [["a", "d"], ["b", "c", "e"]]
+    assert [sum(timings[node_id] for node_id in worker) for worker in assignment] == [11.0, 10.0]
+
+
+def test_unknown_tests_take_the_median_duration():
+    timings = {"a": 1.0, "b": 3.0, "c": 9.0}
+
+    assignment = assign_longest_first(["a", "b", "c", "new"], timings, 2)
+
+    # "new" counts as the median, 3.0.
+    assert assignment == [["c"], ["b", "new", "a"]]
+
+
+def test_without_any_timing_tests_are_dealt_round_robin():
+    assert assign_longest_first(["a", "b", "c"], {}, 2) == [["a", "c"], ["b"]]
+
+
+def test_merged_report_counts_busy_and_idle_time():
+    reports = [
+        {"worker": "gw10", "tests": {"t1": {"duration": 2.0, "outcome": "passed"}}},
+        {"worker": "gw2", "tests": {
+            "t2": {"duration": 4.0, "outcome": "failed"}, "t3": {"duration": 1.0, "outcome": "passed"},
+        }},
+    ]
+
+    report = merge_reports(reports, 100.0, 106.0)
+
+    assert report == {"wall": 6.0, "workers": [
+        {"worker": "gw2", "tests": 2, "busy": 5.0, "idle": 1.0, "failed": ["t2"]},
+        {"worker": "gw10", "tests": 1, "busy": 2.0, "idle": 4.0, "failed": []},
+    ]}
+
+
+def test_collect_tests_lists_node_ids():
+    assert collect_tests(["tests/unit/test_parallel.py"], ["-k", "merged_report"]) == [
+        "tests/unit/test_parallel.py::test_merged_report_counts_busy_and_idle_time"
+    ]
+
+
+def test_collect_tests_fails_on_collection_errors(tmp_path):
+    broken = tmp_path / "test_broken.py"
+    broken.write_text("import missing_module_for_the_test\n")
+
+    with pytest.raises(CollectionError) as error:
+        collect_tests([str(broken)], ["-p", "no:cacheprovider"])
+
+    assert error.value.exit_code == pytest.ExitCode.INTERRUPTED
+    assert "missing_module_for_the_test" in error.value.output
+
+
+def test_runner_stops_when_collection_fails(monkeypatch, capsys):
+    def fail(paths, pytest_args):
+        raise CollectionError(2, "ImportError while importing test module\n")
+
+    monkeypatch.setattr(parallel, "collect_tests", fail)
+
+    assert parallel.main(["tests"]) == 2
+    assert "ImportError while importing test module" in capsys.readouterr().err
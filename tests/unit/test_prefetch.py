@@ -0,0 +1,127 @@
+import threading
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from configuration import prefetch
+from configuration.driver_pool import DriverPool
+from configuration.prefetch import DriverPrefetcher
+
+
+class Browser:
+    """
+    A started session that remembers whether it was quit.
+    """
+
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.quit_calls = 0
+        self.current_window_handle = "main"
+        self.window_handles = ["main"]
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+
+    def execute_script(self, script: str) -> None:
+        pass
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        return {}
+
+    def get_log(self, log_type: str) -> list:
+        return []
+
+    def get(self, url: str) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+class Launcher:
+    """
+    Replaces launch_driver, numbering sessions and failing the ones it is told to.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.launched: List[Browser] = []
+        self.failures: List[BaseException] = []
+
+    def __call__(self) -> Browser:
+        with self.lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            browser = Browser(len(self.launched) + 1)
+            self.launched.append(browser)
+            return browser
+
+
+@pytest.fixture
+def launcher(monkeypatch) -> Launcher:
+    launcher = Launcher()
+    monkeypatch.setattr(prefetch, "launch_driver", launcher)
+    return launcher
+
+
+def pending(prefetcher: DriverPrefetcher) -> int:
+    for future in list(prefetcher._pending):
+        future.exception()
+    return len(prefetcher._pending)
+
+
+def test_depth_sessions_are_kept_starting(launcher):
+    prefetcher = DriverPrefetcher(depth=2)
+    assert pending(prefetcher) == 2
+
+    assert prefetcher.take().number == 1
+    assert pending(prefetcher) == 2
+    assert len(launcher.launched) == 3
+    prefetcher.close()
+
+
+def test_failed_background_start_is_retried_on_the_spot(launcher):
+    launcher.failures.append(OSError("chromedriver not found"))
+    prefetcher = DriverPrefetcher(depth=1)
+    pending(prefetcher)
+
+    browser = prefetcher.take()
+    assert browser in launcher.launched
+    prefetcher.close()
+
+
+def test_without_refill_sessions_start_on_request_only(launcher):
+    prefetcher = DriverPrefetcher(depth=1, refill=False)
+    prefetcher.take()
+    assert pending(prefetcher) == 0
+
+    prefetcher.prefetch()
+    prefetcher.prefetch()
+    assert pending(prefetcher) == 1
+    assert prefetcher.take().number == 2
+    prefetcher.close()
+
+
+def test_close_quits_sessions_nobody_took(launcher):
+    launcher.failures.append(RuntimeError("session not created"))
+    prefetcher = DriverPrefetcher(depth=2)
+    pending(prefetcher)
+
+    prefetcher.close()
+    assert [browser.quit_calls for browser in launcher.launched] == [1]
+    assert pending(prefetcher) == 0
+
+
+def test_pool_prefetches_the_replacement_of_a_session_on_its_last_use(launcher):
+    prefetcher = DriverPrefetcher(depth=1, refill=False)
+    pool = DriverPool(url="http://app.test/", size=1, max_uses=2, driver_factory=prefetcher.take,
+                      prefetch=prefetcher.prefetch)
+    first = pool.lease()
+    assert pending(prefetcher) == 0
+
+    pool.release(first)
+    assert pool.lease() is first
+    assert pending(prefetcher) == 1
+    pool.release(first)
+    assert first.quit_calls == 1
+    assert pool.lease().number == 2
+    prefetcher.close()
@@ -0,0 +1,91 @@
+import warnings
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from utils import resource_monitor
+from utils.resource_monitor import (
+    ResourceLimitExceeded,
+    ResourceLimitWarning,
+    ResourceMonitor,
+    check_limits,
+    process_tree,
+    sample_processes,
+)
+
+
+@pytest.fixture
+def proc(tmp_path, monkeypatch):
+    """
+    A fake /proc: chromedriver (100) started Chrome (200) from its second thread,
+    Chrome started a renderer (300), and 900 is an unrelated process.
+    """
+    monkeypatch.setattr(resource_monitor, "PROC_DIR", str(tmp_path))
+    monkeypatch.setattr(resource_monitor, "CLOCK_TICKS", 100)
+    monkeypatch.setattr(resource_monitor, "PAGE_SIZE", 4096)
+
+    def add(pid: int, children: List[List[int]], ticks: int, threads: int, rss_pages: int, fds: int) -> None:
+        base = tmp_path / str(pid)
+        for tid, thread_children in enumerate(children, start=pid):
+            (base / "task" / str(tid)).mkdir(parents=True)
+            (base / "task" / str(tid) / "children").write_text(" ".join(map(str, thread_children)))
+        (base / "fd").mkdir()
+        for fd in range(fds):
+            (base / "fd" / str(fd)).write_text("")
+        # Fields from state on; the command name contains spaces and parentheses.
+        fields = ["S", "1"] + ["0"] * 9 + [str(ticks), "0", "0", "0", "20", "0", str(threads), "0", "0", "0",
+                                            str(rss_pages)]
+        (base / "stat").write_text(f"{pid} (Chrome (main) x) " + " ".join(fields))
+
+    add(100, [[], [200]], ticks=50, threads=2, rss_pages=256, fds=3)
+    add(200, [[300]], ticks=150, threads=1, rss_pages=512, fds=4)
+    add(300, [[]], ticks=100, threads=1, rss_pages=256, fds=1)
+    add(900, [[]], ticks=999, threads=9, rss_pages=999, fds=9)
+    return tmp_path
+
+
+def test_process_tree_follows_the_children_of_every_thread(proc):
+    assert process_tree(100) == {100, 200, 300}
+    assert process_tree(200) == {200, 300}
+    assert process_tree(404) == set()
+
+
+def test_sample_sums_the_stat_fields_and_open_fds(proc):
+    assert sample_processes({100, 200, 300, 404}) == {
+        "rss": 1024 * 4096, "cpu": 3.0, "threads": 4, "fds": 8,
+    }
+
+
+def test_monitor_samples_the_tree_under_chromedriver(proc, monkeypatch):
+    monkeypatch.setattr(resource_monitor, "RESOURCE_MONITOR_ENABLED", True)
+    driver = SimpleNamespace(caps={}, service=SimpleNamespace(process=SimpleNamespace(pid=100)))
+    monitor = ResourceMonitor.for_driver(driver)
+    monitor.interval = 60
+    monitor.start()
+    (proc / "300" / "fd" / "1").write_text("")
+
+    assert monitor.stop() == {
+        "peak_rss_mb": 4.0, "cpu_seconds": 0.0, "peak_threads": 4, "peak_fds": 9, "fd_growth": 1, "thread_growth": 0,
+    }
+
+
+def test_monitor_needs_a_process_to_watch(proc, monkeypatch):
+    monkeypatch.setattr(resource_monitor, "RESOURCE_MONITOR_ENABLED", True)
+
+    assert ResourceMonitor.for_driver(SimpleNamespace(caps={})) is None
+
+
+def test_limits_warn_or_fail(monkeypatch):
+    monkeypatch.setitem(resource_monitor.RESOURCE_LIMITS, "peak_rss_mb", 100)
+    monkeypatch.setitem(resource_monitor.RESOURCE_LIMITS, "fd_growth", 0)
+
+    with pytest.warns(ResourceLimitWarning, match="peak_rss_mb=150 exceeds the limit of 100"):
+        assert check_limits({"peak_rss_mb": 150, "fd_growth": 40}) == ["peak_rss_mb=150 exceeds the limit of 100"]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert check_limits({"peak_rss_mb": 100}) == []
+
+    monkeypatch.setattr(resource_monitor, "RESOURCE_LIMIT_ACTION", "fail")
+    with pytest.raises(ResourceLimitExceeded):
+        check_limits({"peak_rss_mb": 150})
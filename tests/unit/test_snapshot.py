@@ -0,0 +1,96 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from pages.base_page import SNAPSHOT_JS, BasePage
+
+
+class FormLocators:
+    LAST_NAME = (By.ID, "lastName")
+    CITY = (By.ID, "city")
+    SAVE_BUTTON = (By.ID, "save")
+    TIMEOUT = 5
+
+
+def field(value: str = None, text: str = "", displayed: bool = True, enabled: bool = True) -> dict:
+    return {"displayed": displayed, "enabled": enabled, "selected": False, "text": text, "value": value,
+            "attributes": {"class": "field"}}
+
+
+class SnapshotDriver:
+    """
+    A session answering SNAPSHOT_JS with queued element states, the last one repeated.
+    """
+
+    def __init__(self, *reads: list) -> None:
+        self.reads = list(reads)
+        self.arguments = None
+
+    def execute_script(self, script: str, *args):
+        assert script == SNAPSHOT_JS
+        self.arguments = args
+        return self.reads.pop(0) if len(self.reads) > 1 else self.reads[0]
+
+
+FORM = [field("Kowalski"), field("Warszawa"), field(text="Zapisz", enabled=False)]
+
+
+def test_locator_class_is_read_by_attribute_name():
+    driver = SnapshotDriver(FORM)
+
+    snapshot = BasePage(driver).snapshot(FormLocators, attributes=["class"])
+
+    assert driver.arguments == ([["id", "lastName"], ["id", "city"], ["id", "save"]], ["class"])
+    assert list(snapshot.states) == ["LAST_NAME", "CITY", "SAVE_BUTTON"]
+    assert snapshot["CITY"].value == "Warszawa"
+    assert snapshot[FormLocators.SAVE_BUTTON].text == "Zapisz"
+    assert snapshot["LAST_NAME"].attributes == {"class": "field"}
+
+
+def test_sequences_are_named_by_locator():
+    snapshot = BasePage(SnapshotDriver([field("Kowalski"), None])).snapshot([FormLocators.LAST_NAME, (By.ID, "x")])
+
+    assert list(snapshot.states) == ["id=lastName", "id=x"]
+    assert not snapshot[(By.ID, "x")].present
+
+
+def test_assertions_pass_and_return_true():
+    snapshot = BasePage(SnapshotDriver(FORM)).snapshot(FormLocators)
+
+    assert snapshot.assert_present()
+    assert snapshot.assert_displayed()
+    assert snapshot.assert_enabled("LAST_NAME", FormLocators.CITY)
+    assert snapshot.assert_disabled("SAVE_BUTTON")
+    assert snapshot.assert_values({"LAST_NAME": "Kowalski", FormLocators.CITY: "Warszawa"})
+    assert snapshot.assert_text({"SAVE_BUTTON": "Zapisz"})
+
+
+def test_failed_assertions_list_every_mismatch():
+    snapshot = BasePage(SnapshotDriver([field("Nowak"), None, field(displayed=False)])).snapshot(FormLocators)
+
+    with pytest.raises(AssertionError, match=r"^Expected displayed: CITY; SAVE_BUTTON$"):
+        snapshot.assert_displayed()
+    with pytest.raises(AssertionError, match="LAST_NAME is 'Nowak', not 'Kowalski'; CITY is None, not 'Warszawa'"):
+        snapshot.assert_values({"LAST_NAME": "Kowalski", "CITY": "Warszawa"})
+    assert snapshot.assert_absent("CITY")
+
+
+@pytest.mark.parametrize("key", ["PHONE", (By.ID, "phone")])
+def test_unknown_keys_raise_a_descriptive_key_error(key):
+    snapshot = BasePage(SnapshotDriver(FORM)).snapshot(FormLocators)
+
+    with pytest.raises(KeyError, match="not in the snapshot, which holds: LAST_NAME, CITY, SAVE_BUTTON"):
+        snapshot.assert_displayed(key)
+    with pytest.raises(KeyError, match="not in the snapshot"):
+        snapshot[key]
+
+
+def test_until_present_waits_for_every_element():
+    snapshot = BasePage(SnapshotDriver([None, None, None], FORM)).snapshot(FormLocators, until_present=True)
+
+    assert snapshot.assert_present()
+
+
+def test_until_present_times_out():
+    with pytest.raises(TimeoutException, match="LAST_NAME, CITY, SAVE_BUTTON"):
+        BasePage(SnapshotDriver([None, None, None])).snapshot(FormLocators, until_present=True, timeout=0.1)
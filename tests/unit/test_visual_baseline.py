@@ -0,0 +1,88 @@
+import io
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils import visual_baseline as vb
+
+
+def png_of(pixels: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(pixels.astype(np.uint8)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def blocks(seed: int = 1) -> np.ndarray:
+    """
+    A 240x160 screen of random gray 20x20 blocks.
+    """
+    cells = np.random.default_rng(seed).integers(0, 256, (8, 12))
+    return np.repeat(np.repeat(cells, 20, axis=0), 20, axis=1)[:, :, None].repeat(3, axis=2)
+
+
+def test_phash_is_stable_under_small_changes_and_differs_for_other_images():
+    base = blocks()
+    noisy = base + np.random.default_rng(0).integers(-3, 4, base.shape)
+    other = blocks(2)
+    hashes = vb.phash_many(np.stack([vb.downscale(png_of(image)) for image in (base, noisy, other)]))
+
+    distances = vb.hamming_distances(hashes[:1].repeat(2), hashes[1:])
+
+    assert distances[0] <= vb.VISUAL_HASH_TOLERANCE
+    assert distances[1] > vb.VISUAL_HASH_TOLERANCE
+
+
+def test_hamming_distance_counts_differing_bits():
+    hashes = np.array([0b1011, 2 ** 64 - 1], dtype=np.uint64)
+    others = np.array([0b0001, 0], dtype=np.uint64)
+
+    assert vb.hamming_distances(hashes, others).tolist() == [2, 64]
+
+
+def test_first_capture_becomes_the_baseline(tmp_path):
+    baseline = vb.VisualBaseline(str(tmp_path))
+
+    assert baseline.check("home/test/final", png_of(blocks())) == 0
+    assert os.path.exists(tmp_path / "home" / "test" / "final.png")
+    assert os.path.exists(tmp_path / "home" / "test" / "final.phash")
+    assert baseline.check("home/test/final", png_of(blocks())) == 0
+
+
+def test_changed_screenshot_fails_and_keeps_the_baseline(tmp_path, monkeypatch):
+    monkeypatch.setattr(vb, "DIFFS_DIR", str(tmp_path / "diffs"))
+    baseline = vb.VisualBaseline(str(tmp_path / "baselines"))
+    original = png_of(blocks())
+    baseline.check("home/test/final", original)
+
+    with pytest.raises(vb.VisualRegressionError, match="home/test/final"):
+        baseline.check("home/test/final", png_of(blocks(2)))
+
+    assert (tmp_path / "baselines" / "home" / "test" / "final.png").read_bytes() == original
+    assert os.path.exists(tmp_path / "diffs" / "home" / "test" / "final.png")
+
+
+def test_missing_hash_file_is_rebuilt_without_replacing_the_baseline(tmp_path, monkeypatch):
+    monkeypatch.setattr(vb, "DIFFS_DIR", str(tmp_path / "diffs"))
+    baseline = vb.VisualBaseline(str(tmp_path))
+    original = png_of(blocks())
+    baseline.check("home/test/final", original)
+    os.remove(tmp_path / "home" / "test" / "final.phash")
+
+    with pytest.raises(vb.VisualRegressionError):
+        baseline.check("home/test/final", png_of(blocks(2)))
+
+    assert (tmp_path / "home" / "test" / "final.png").read_bytes() == original
+    assert os.path.exists(tmp_path / "home" / "test" / "final.phash")
+
+
+def test_baselines_of_separate_instances_do_not_overwrite_each_other(tmp_path):
+    first, second = vb.VisualBaseline(str(tmp_path)), vb.VisualBaseline(str(tmp_path))
+
+    first.check("home/test_a/final", png_of(blocks()))
+    second.check("home/test_b/final", png_of(blocks(2)))
+
+    reloaded = vb.VisualBaseline(str(tmp_path))
+    assert reloaded.check("home/test_a/final", png_of(blocks())) == 0
+    assert reloaded.check("home/test_b/final", png_of(blocks(2))) == 0
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage, Wait
+
+
+SLOW_PANEL = (By.ID, "slow-panel")
+
+
+class Clock:
+    """
+    Replaces time.monotonic and time.sleep, recording every sleep.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 4))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+def after(seconds: float, clock: Clock, value="ready"):
+    return lambda driver: value if clock.now >= seconds else None
+
+
+def test_poll_delay_backs_off_up_to_the_maximum(clock):
+    wait = Wait(timeout=5, poll_frequency=0.1, backoff=2, max_poll_frequency=0.5)
+
+    assert wait.until(None, after(1.5, clock)) == "ready"
+    assert clock.sleeps == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+def test_ignored_exceptions_count_as_not_met(clock):
+    calls = []
+
+    def condition(driver):
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise NoSuchElementException("not yet")
+        return "found"
+
+    assert Wait(poll_frequency=0.1, backoff=1).until(None, condition) == "found"
+    assert len(calls) == 3
+
+
+def test_timeout_stops_at_the_deadline(clock):
+    with pytest.raises(TimeoutException, match="never"):
+        Wait(timeout=10, poll_frequency=0.1).until(None, lambda driver: False, timeout=1, message="never")
+
+    assert clock.now == pytest.approx(1)
+
+
+def test_until_any_returns_the_first_condition_met(clock):
+    index, value = Wait(poll_frequency=0.1, backoff=1).until_any(
+        None, [after(5, clock, "error"), after(0.3, clock, "redirect")]
+    )
+
+    assert (index, value) == (1, "redirect")
+    assert clock.now == pytest.approx(0.3)
+
+
+class Driver:
+    pass
+
+
+class ReportPage(BasePage):
+    TIMEOUTS = {SLOW_PANEL: 30}
+
+
+def test_locator_timeouts_override_the_default():
+    page = ReportPage(Driver())
+
+    assert page.timeout_for(SLOW_PANEL) == 30
+    assert page.timeout_for((By.ID, "other")) == page.wait.timeout
+    assert page.timeout_for(SLOW_PANEL, timeout=2) == 2
@@ -0,0 +1,400 @@
+"""
+Content-addressed store for test artifacts.
+
+Blobs are keyed by the SHA-256 of their original bytes and written once, however
+many tests and runs produce them: screenshots are recompressed to lossless WebP, text
+artifacts are gzipped. An SQLite index maps run, worker, test, kind and time to the
+blobs. Retention limits on runs kept, age and total size are applied after every run.
+
+Usage:
+    python -m utils.artifact_store list [--run RUN] [--test TEXT] [--runs]
+    python -m utils.artifact_store extract ID [DEST]
+    python -m utils.artifact_store prune [--max-runs N] [--max-days D] [--max-mb MB] [--dry-run]
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from decouple import config
+from PIL import Image
+
+from utils.helpers import get_run_id
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STORE_DIR = os.path.join(PROJECT_ROOT, "screenshots")
+
+ARTIFACT_RETENTION_RUNS: int = config("ARTIFACT_RETENTION_RUNS", default=20, cast=int)
+ARTIFACT_RETENTION_DAYS: float = config("ARTIFACT_RETENTION_DAYS", default=14, cast=float)
+ARTIFACT_RETENTION_MB: float = config("ARTIFACT_RETENTION_MB", default=500, cast=float)
+
+# Kind of artifact: (extension of the original, extension of the stored blob).
+KINDS: Dict[str, Tuple[str, str]] = {
+    "screenshot": ("png", "webp"),
+    "dom": ("html", "html.gz"),
+    "details": ("json", "json.gz"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    original_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    test TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    blob TEXT NOT NULL REFERENCES blobs(hash)
+);
+CREATE INDEX IF NOT EXISTS artifacts_run ON artifacts(run_id);
+CREATE INDEX IF NOT EXISTS artifacts_blob ON artifacts(blob);
+"""
+
+
+def compress(kind: str, data: bytes) -> bytes:
+    """
+    Losslessly recompress an artifact for storage.
+
+    Args:
+        kind (str): The artifact kind, a key of KINDS.
+        data (bytes): The original bytes.
+
+    Returns:
+        bytes: Lossless WebP for screenshots, gzip for everything else.
+    """
+    if kind == "screenshot":
+        with Image.open(io.BytesIO(data)) as image:
+            output = io.BytesIO()
+            image.save(output, "WEBP", lossless=True, quality=100, method=4)
+            return output.getvalue()
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(kind: str, data: bytes) -> bytes:
+    """
+    Restore a stored blob to the original format (pixel-identical PNG for screenshots).
+
+    Args:
+        kind (str): The artifact kind, a key of KINDS.
+        data (bytes): The stored bytes.
+
+    Returns:
+        bytes: The artifact in its original format.
+    """
+    if kind == "screenshot":
+        with Image.open(io.BytesIO(data)) as image:
+            output = io.BytesIO()
+            image.save(output, "PNG")
+            return output.getvalue()
+    return gzip.decompress(data)
+
+
+class ArtifactStore:
+    """
+    Content-addressed artifact store rooted at a directory:
+    <root>/blobs/<hash[:2]>/<hash>.<ext> and the index <root>/index.sqlite.
+    Safe to use from several threads and worker processes at once.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        Initialize the ArtifactStore.
+
+        Args:
+            root (str): The store directory.
+        """
+        self.root = root
+        self.index_path = os.path.join(root, "index.sqlite")
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(self.root, exist_ok=True)
+        connection = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._initialized = True
+        return connection
+
+    def put(self, run_id: str, worker: str, folder: str, test: str, kind: str, data: bytes) -> str:
+        """
+        Store an artifact. The blob is compressed and written only if no earlier
+        artifact had the same content.
+
+        Args:
+            run_id (str): The test run.
+            worker (str): The parallel worker id, '' for sequential runs.
+            folder (str): The folder of the test file.
+            test (str): The test name.
+            kind (str): The artifact kind, a key of KINDS.
+            data (bytes): The original bytes.
+
+        Returns:
+            str: The hash of the blob.
+        """
+        blob_hash = hashlib.sha256(data).hexdigest()
+        relative_path = os.path.join("blobs", blob_hash[:2], f"{blob_hash}.{KINDS[kind][1]}")
+        with closing(self._connect()) as connection:
+            known = connection.execute("SELECT 1 FROM blobs WHERE hash = ?", (blob_hash,)).fetchone()
+            # Compress outside the write lock; most artifacts of a run are already known.
+            stored = None if known else compress(kind, data)
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if not connection.execute("SELECT 1 FROM blobs WHERE hash = ?", (blob_hash,)).fetchone():
+                    stored = stored if stored is not None else compress(kind, data)
+                    path = os.path.join(self.root, relative_path)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as blob_file:
+                        blob_file.write(stored)
+                    connection.execute(
+                        "INSERT INTO blobs (hash, path, original_size, stored_size) VALUES (?, ?, ?, ?)",
+                        (blob_hash, relative_path, len(data), len(stored)),
+                    )
+                connection.execute(
+                    "INSERT INTO artifacts (run_id, worker, folder, test, kind, created_at, blob)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, worker, folder, test, kind, time.time(), blob_hash),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return blob_hash
+
+    def artifacts(self, run_id: Optional[str] = None, test: Optional[str] = None) -> List[sqlite3.Row]:
+        """
+        List stored artifacts, newest first.
+
+        Args:
+            run_id (Optional[str]): Only artifacts of this run.
+            test (Optional[str]): Only artifacts of tests whose name contains this text.
+
+        Returns:
+            List[sqlite3.Row]: Artifact rows joined with their blob sizes.
+        """
+        query = (
+            "SELECT artifacts.*, blobs.path, blobs.original_size, blobs.stored_size"
+            " FROM artifacts JOIN blobs ON blobs.hash = artifacts.blob WHERE 1 = 1"
+        )
+        params: List[str] = []
+        if run_id:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        if test:
+            query += " AND test LIKE ?"
+            params.append(f"%{test}%")
+        with closing(self._connect()) as connection:
+            return connection.execute(query + " ORDER BY created_at DESC, id DESC", params).fetchall()
+
+    def runs(self) -> List[sqlite3.Row]:
+        """
+        Summarize the stored runs, newest first.
+
+        Returns:
+            List[sqlite3.Row]: run_id, started/finished timestamps, artifact count and original size.
+        """
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                "SELECT run_id, MIN(created_at) AS started, MAX(created_at) AS finished,"
+                " COUNT(*) AS artifact_count, SUM(blobs.original_size) AS original_size"
+                " FROM artifacts JOIN blobs ON blobs.hash = artifacts.blob"
+                " GROUP BY run_id ORDER BY finished DESC"
+            ).fetchall()
+
+    def disk_usage(self) -> Tuple[int, int]:
+        """
+        Return the size of every stored artifact before storage, and of the blobs on disk.
+
+        Returns:
+            Tuple[int, int]: Original bytes of all artifacts and stored bytes of all blobs.
+        """
+        with closing(self._connect()) as connection:
+            original = connection.execute(
+                "SELECT COALESCE(SUM(original_size), 0) FROM artifacts JOIN blobs ON blobs.hash = artifacts.blob"
+            ).fetchone()[0]
+            stored = connection.execute("SELECT COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()[0]
+        return original, stored
+
+    def extract(self, artifact_id: int) -> Tuple[sqlite3.Row, bytes]:
+        """
+        Read an artifact back in its original format.
+
+        Args:
+            artifact_id (int): The artifact id shown by list.
+
+        Returns:
+            Tuple[sqlite3.Row, bytes]: The artifact row and its content.
+
+        Raises:
+            KeyError: If there is no such artifact.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT artifacts.*, blobs.path FROM artifacts JOIN blobs ON blobs.hash = artifacts.blob"
+                " WHERE artifacts.id = ?",
+                (artifact_id,),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No artifact with id {artifact_id}.")
+        with open(os.path.join(self.root, row["path"]), "rb") as blob_file:
+            return row, decompress(row["kind"], blob_file.read())
+
+    def prune(
+        self,
+        max_runs: int = 0,
+        max_days: float = 0,
+        max_mb: float = 0,
+        keep_run: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> List[str]:
+        """
+        Drop whole runs, oldest first, beyond the retention limits, then delete the
+        blobs no artifact refers to any more. A limit of 0 is disabled.
+
+        Args:
+            max_runs (int, optional): Number of runs to keep.
+            max_days (float, optional): Age in days after which a run is dropped.
+            max_mb (float, optional): Total size of the blobs to stay under.
+            keep_run (Optional[str]): A run that is never dropped, e.g. the current one.
+            dry_run (bool, optional): Only report what would be dropped.
+
+        Returns:
+            List[str]: The dropped run ids.
+        """
+        dropped: List[str] = []
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                runs = connection.execute(
+                    "SELECT run_id, MAX(created_at) AS finished FROM artifacts GROUP BY run_id ORDER BY finished DESC"
+                ).fetchall()
+                for position, run in enumerate(runs):
+                    too_many = max_runs and position >= max_runs
+                    too_old = max_days and run["finished"] < time.time() - max_days * 86400
+                    if (too_many or too_old) and run["run_id"] != keep_run:
+                        dropped.append(run["run_id"])
+                if max_mb:
+                    for run in reversed(runs):
+                        if self._referenced_size(connection, dropped) <= max_mb * 2 ** 20:
+                            break
+                        if run["run_id"] not in dropped and run["run_id"] != keep_run:
+                            dropped.append(run["run_id"])
+                if dry_run:
+                    connection.execute("ROLLBACK")
+                    return dropped
+
+                connection.executemany("DELETE FROM artifacts WHERE run_id = ?", [(run_id,) for run_id in dropped])
+                orphans = connection.execute(
+                    "SELECT hash, path FROM blobs WHERE hash NOT IN (SELECT blob FROM artifacts)"
+                ).fetchall()
+                # Files go before the commit, so a concurrent put() that waits for the lock rewrites them.
+                for orphan in orphans:
+                    try:
+                        os.remove(os.path.join(self.root, orphan["path"]))
+                    except FileNotFoundError:
+                        pass
+                connection.executemany("DELETE FROM blobs WHERE hash = ?", [(orphan["hash"],) for orphan in orphans])
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return dropped
+
+    @staticmethod
+    def _referenced_size(connection: sqlite3.Connection, excluded_runs: List[str]) -> int:
+        placeholders = ", ".join("?" for _ in excluded_runs)
+        return connection.execute(
+            "SELECT COALESCE(SUM(stored_size), 0) FROM blobs WHERE hash IN"
+            f" (SELECT blob FROM artifacts WHERE run_id NOT IN ({placeholders}))",
+            excluded_runs,
+        ).fetchone()[0]
+
+
+artifact_store = ArtifactStore(config("ARTIFACT_STORE_DIR", default=DEFAULT_STORE_DIR))
+
+
+def apply_retention() -> List[str]:
+    """
+    Prune the artifact store with the ARTIFACT_RETENTION_* settings, keeping the current run.
+
+    Returns:
+        List[str]: The dropped run ids.
+    """
+    return artifact_store.prune(
+        max_runs=ARTIFACT_RETENTION_RUNS,
+        max_days=ARTIFACT_RETENTION_DAYS,
+        max_mb=ARTIFACT_RETENTION_MB,
+        keep_run=get_run_id(),
+    )
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 2 ** 20:.1f} MB" if size >= 2 ** 20 else f"{size / 2 ** 10:.1f} kB"
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.artifact_store", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List stored artifacts or runs.")
+    list_parser.add_argument("--run", help="Only artifacts of this run.")
+    list_parser.add_argument("--test", help="Only artifacts of tests whose name contains this text.")
+    list_parser.add_argument("--runs", action="store_true", help="List runs instead of artifacts.")
+
+    extract_parser = commands.add_parser("extract", help="Write an artifact in its original format.")
+    extract_parser.add_argument("id", type=int)
+    extract_parser.add_argument("dest", nargs="?", help="Output file. Defaults to a name built from the artifact.")
+
+    prune_parser = commands.add_parser("prune", help="Apply retention limits.")
+    prune_parser.add_argument("--max-runs", type=int, default=ARTIFACT_RETENTION_RUNS)
+    prune_parser.add_argument("--max-days", type=float, default=ARTIFACT_RETENTION_DAYS)
+    prune_parser.add_argument("--max-mb", type=float, default=ARTIFACT_RETENTION_MB)
+    prune_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "list" and args.runs:
+        for run in artifact_store.runs():
+            print(f"{run['run_id']:<28}{_format_time(run['finished'])}  {run['artifact_count']:>5} artifacts"
+                  f"  {_format_size(run['original_size']):>10}")
+    elif args.command == "list":
+        for row in artifact_store.artifacts(args.run, args.test):
+            print(f"{row['id']:>6}  {_format_time(row['created_at'])}  {row['run_id']:<28}"
+                  f"{row['folder']}/{row['test']}  {row['kind']:<10}{_format_size(row['original_size']):>10}"
+                  f"  {row['blob'][:12]}")
+    elif args.command == "extract":
+        row, content = artifact_store.extract(args.id)
+        dest = args.dest or f"{row['folder']}_{row['test']}_{row['id']}.{KINDS[row['kind']][0]}"
+        with open(dest, "wb") as output:
+            output.write(content)
+        print(dest)
+    elif args.command == "prune":
+        dropped = artifact_store.prune(args.max_runs, args.max_days, args.max_mb, dry_run=args.dry_run)
+        print(f"{'Would drop' if args.dry_run else 'Dropped'} {len(dropped)} run(s): {', '.join(dropped) or '-'}")
+
+    original, stored = artifact_store.disk_usage()
+    print(f"Stored {_format_size(stored)} of blobs for {_format_size(original)} of artifacts.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
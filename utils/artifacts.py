@@ -0,0 +1,105 @@
+import atexit
+import base64
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from decouple import config
+
+from utils.artifact_store import ArtifactStore, artifact_store
+from utils.helpers import get_run_id, get_worker_id
+
+
+class FailureArtifacts:
+    """
+    Raw data captured from a WebDriver session when a test fails. Only cheap driver
+    calls happen while capturing; decoding, compression and writing happen in ArtifactWriter.
+
+    Attributes:
+        screenshot_base64 (Optional[str]): The screenshot as returned by the driver.
+        page_source (Optional[str]): The DOM serialized by the browser.
+        console_log (List[Dict[str, Any]]): Entries of the browser console log.
+        url (Optional[str]): The URL the browser showed.
+        error (Optional[str]): Description of the exception that failed the test.
+    """
+
+    def __init__(
+        self,
+        screenshot_base64: Optional[str],
+        page_source: Optional[str],
+        console_log: List[Dict[str, Any]],
+        url: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        self.screenshot_base64 = screenshot_base64
+        self.page_source = page_source
+        self.console_log = console_log
+        self.url = url
+        self.error = error
+
+
+class ArtifactWriter:
+    """
+    Writes FailureArtifacts to the ArtifactStore on a background thread pool, so
+    driver teardown does not wait for encoding, compression and disk I/O.
+    """
+
+    def __init__(self, max_workers: int, store: ArtifactStore = artifact_store) -> None:
+        """
+        Initialize the ArtifactWriter.
+
+        Args:
+            max_workers (int): Number of writer threads.
+            store (ArtifactStore, optional): The store the artifacts are written to.
+        """
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer")
+        self._pending: List[Future] = []
+
+    def submit(self, folder: str, test: str, artifacts: FailureArtifacts) -> Future:
+        """
+        Schedule the artifacts of a test to be stored in the current run: the
+        screenshot, the DOM and the details (URL, console log and error).
+
+        Args:
+            folder (str): The folder of the test file.
+            test (str): The test name.
+            artifacts (FailureArtifacts): The captured data.
+
+        Returns:
+            Future: Completes once every artifact is stored.
+        """
+        future = self._executor.submit(self._write, folder, test, artifacts)
+        self._pending = [pending for pending in self._pending if not pending.done()]
+        self._pending.append(future)
+        return future
+
+    def flush(self) -> None:
+        """
+        Wait for every scheduled write and re-raise the first write error.
+        """
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def shutdown(self) -> None:
+        """
+        Wait for every scheduled write and stop the writer threads.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _write(self, folder: str, test: str, artifacts: FailureArtifacts) -> None:
+        run_id, worker = get_run_id(), get_worker_id()
+        if artifacts.screenshot_base64:
+            self.store.put(run_id, worker, folder, test, "screenshot", base64.b64decode(artifacts.screenshot_base64))
+        if artifacts.page_source is not None:
+            self.store.put(run_id, worker, folder, test, "dom", artifacts.page_source.encode("utf-8"))
+        details = {"url": artifacts.url, "error": artifacts.error, "console": artifacts.console_log}
+        self.store.put(
+            run_id, worker, folder, test, "details",
+            json.dumps(details, indent=2, ensure_ascii=False).encode("utf-8"),
+        )
+
+
+artifact_writer = ArtifactWriter(max_workers=config("ARTIFACT_WRITER_THREADS", default=2, cast=int))
+atexit.register(artifact_writer.shutdown)
@@ -0,0 +1,240 @@
+"""
+Tracer of the WebDriver commands sent by the tests, nested under the page object
+methods that issued them, exported per test in Chrome trace-event JSON (open the
+files in https://ui.perfetto.dev or chrome://tracing).
+"""
+import functools
+import json
+import os
+import threading
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+import pytest
+from decouple import config
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils import test_metrics
+from utils.helpers import get_worker_id
+
+
+TRACES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "traces")
+LOCATOR_COMMANDS = ("findElement", "findElements", "findChildElement", "findChildElements")
+SCRIPT_COMMANDS = ("executeScript", "executeAsyncScript")
+
+
+def describe_command(command: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize the parameters of a WebDriver command for the trace.
+
+    Args:
+        command (str): The WebDriver command name, e.g. "findElement".
+        params (Optional[Dict[str, Any]]): The command parameters.
+
+    Returns:
+        Dict[str, Any]: The locator, URL, script or CDP method of the command, if any.
+    """
+    params = params or {}
+    if command in LOCATOR_COMMANDS:
+        return {"locator": f"{params.get('using')}={params.get('value')}"}
+    if command == "get":
+        return {"url": params.get("url")}
+    if command in SCRIPT_COMMANDS:
+        script = " ".join(params.get("script", "").split())
+        return {"script": script[:120]}
+    if command == "executeCdpCommand":
+        return {"cdp": params.get("cmd")}
+    return {}
+
+
+class CommandTracer:
+    """
+    Records WebDriver commands and page object method spans as Chrome trace events.
+
+    Commands are recorded by wrapping the execute method of a driver's command
+    executor between attach() and detach(); page object spans come from the
+    instrumented methods of pages.base_page.BasePage (see method_span()). Spans and
+    commands of the same thread nest by time.
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        """
+        Initialize the CommandTracer.
+
+        Args:
+            enabled (bool): Whether to record anything.
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._command_counts: Counter = Counter()
+        self._command_seconds = 0.0
+        self._attached: "weakref.WeakKeyDictionary[Any, List[Any]]" = weakref.WeakKeyDictionary()
+
+    def reset(self) -> None:
+        """
+        Drop everything recorded so far.
+        """
+        with self._lock:
+            self._events = []
+            self._command_counts = Counter()
+            self._command_seconds = 0.0
+
+    def attach(self, driver: WebDriver) -> None:
+        """
+        Start recording the commands sent by a driver. Drivers sharing one command
+        executor may be attached several times; each attach needs a detach.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+        """
+        if not self.enabled:
+            return
+        executor = driver.command_executor
+        with self._lock:
+            if executor in self._attached:
+                self._attached[executor][1] += 1
+                return
+            original = executor.execute
+            self._attached[executor] = [original, 1]
+        executor.execute = self._traced(original)
+
+    def detach(self, driver: WebDriver) -> None:
+        """
+        Stop recording the commands sent by a driver.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+        """
+        executor = driver.command_executor
+        with self._lock:
+            if executor not in self._attached:
+                return
+            self._attached[executor][1] -= 1
+            if self._attached[executor][1]:
+                return
+            original, _ = self._attached.pop(executor)
+        executor.execute = original
+
+    def method_span(self, name: str, args: tuple, kwargs: Dict[str, Any]) -> ContextManager[None]:
+        """
+        Record a page object method call as one "page" trace event, with its arguments.
+
+        Args:
+            name (str): Event name, e.g. "TicketPage.click_next_button".
+            args (tuple): Positional arguments of the call.
+            kwargs (Dict[str, Any]): Keyword arguments of the call.
+        """
+        arguments = ", ".join([repr(arg) for arg in args] + [f"{key}={value!r}" for key, value in kwargs.items()])
+        return self.span(name, "page", {"arguments": arguments[:200]})
+
+    @contextmanager
+    def span(self, name: str, category: str, args: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        """
+        Record the body of the with-block as one trace event.
+
+        Args:
+            name (str): Event name.
+            category (str): Event category, e.g. "page" or "webdriver".
+            args (Optional[Dict[str, Any]]): Details shown with the event.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._complete(name, category, started, args or {})
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the number of round trips by command and the total time spent in them.
+
+        Returns:
+            Dict[str, Any]: "commands" (count by command name), "round_trips" and "seconds".
+        """
+        with self._lock:
+            return {
+                "commands": dict(self._command_counts.most_common()),
+                "round_trips": sum(self._command_counts.values()),
+                "seconds": round(self._command_seconds, 3),
+            }
+
+    def export(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Write the recorded events as a Chrome trace-event JSON file.
+
+        Args:
+            path (str): Output file path.
+            metadata (Optional[Dict[str, Any]]): Extra data stored with the trace.
+        """
+        with self._lock:
+            events = list(self._events)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": dict(metadata or {}, **self.summary()),
+                },
+                trace_file,
+            )
+
+    def _traced(self, execute: Callable[[str, Dict[str, Any]], Any]) -> Callable[[str, Dict[str, Any]], Any]:
+        @functools.wraps(execute)
+        def traced_execute(command: str, params: Dict[str, Any]) -> Any:
+            with self.span(command, "webdriver", describe_command(command, params)):
+                return execute(command, params)
+        return traced_execute
+
+    def _complete(self, name: str, category: str, started: float, args: Dict[str, Any]) -> None:
+        finished = time.perf_counter()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((started - self._origin) * 1e6, 1),
+            "dur": round((finished - started) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+            if category == "webdriver":
+                self._command_counts[name] += 1
+                self._command_seconds += finished - started
+
+
+command_tracer = CommandTracer(enabled=config("TRACE_COMMANDS", default=False, cast=bool))
+
+
+class CommandTracePlugin:
+    """
+    pytest plugin that starts a fresh trace for every test, writes it to
+    traces/<worker>/<test node id>.json and adds the number of WebDriver round trips
+    and their total time to the test metrics.
+    """
+
+    __test__ = False
+
+    def __init__(self, tracer: CommandTracer = command_tracer) -> None:
+        self.tracer = tracer
+
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        self.tracer.reset()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item: pytest.Item):
+        yield
+        summary = self.tracer.summary()
+        if not summary["round_trips"]:
+            return
+        test_metrics.add("webdriver_round_trips", summary["round_trips"])
+        test_metrics.add("webdriver_seconds", summary["seconds"])
+        file_name = item.nodeid.replace("::", "__").replace("/", "_").replace(".py", "")
+        file_name = "".join(character if character.isalnum() or character in "_-." else "_" for character in file_name)
+        self.tracer.export(os.path.join(TRACES_DIR, get_worker_id(), f"{file_name}.json"), {"test": item.nodeid})
@@ -1,24 +1,141 @@
-import inspect
+import contextlib
 import os
+import re
+from datetime import datetime
+from typing import IO, Iterator, Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-def get_test_context_from_stack() -> (str, str):
+
+def get_worker_id() -> str:
+    """
+    Return the identifier of the parallel worker running this process.
+
+    Returns:
+      The worker id (e.g. 'gw0') set by the parallel runner, or '' for sequential runs.
     """
-    Inspects the call stack to find:
+    return os.environ.get("TEST_WORKER_ID", os.environ.get("PYTEST_XDIST_WORKER", ""))
+
+
+def get_run_id() -> str:
+    """
+    Return the identifier of the current test run, shared by every worker of a
+    parallel run through the TEST_RUN_ID environment variable.
+
+    Returns:
+      The TEST_RUN_ID set by the parallel runner or an earlier call, or a new
+      timestamp-based id, which is then exported to child processes.
+    """
+    return os.environ.setdefault("TEST_RUN_ID", datetime.now().strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}")
+
+
+def get_test_context() -> (str, str):
+    """
+    Reads the node id of the running test from PYTEST_CURRENT_TEST to find:
       1) The folder name in which that test file resides.
-      2) The first function name that starts with 'test_' (the test function).
+      2) The test function name, with any parametrization made filename-safe.
+
+    Returns:
+      (folder_name, function_name), or ("", "") outside of a pytest test.
+    """
+    # e.g. 'tests/home/test_home_page.py::test_home_page (call)'
+    current_test = os.environ.get("PYTEST_CURRENT_TEST", "")
+    node_id = current_test.rsplit(" ", 1)[0]
+    if "::" not in node_id:
+        return "", ""
+    path, _, test_name = node_id.partition("::")
+    # e.g. 'home' from 'tests/home/test_home_page.py'
+    folder_name = os.path.basename(os.path.dirname(path))
+    test_name = re.sub(r"[^\w.-]+", "_", test_name.split("::")[-1]).strip("_")
+    return folder_name, test_name
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Computes a percentile with linear interpolation between the closest ranks.
+
+    Args:
+      values: The samples.
+      q: The percentile, between 0 and 100.
 
     Returns:
-      (folder_name, function_name)
-    """
-    frames = inspect.stack()
-    for frame_info in frames:
-        func_name = frame_info.function
-        if func_name.startswith("test_"):
-            # e.g. 'test_home_page' from /path/to/repo/tests/home/test_home_page.py
-            filename = frame_info.filename
-            # e.g. 'home' from '/path/to/repo/tests/home'
-            folder_name = os.path.basename(os.path.dirname(filename))
-            return folder_name, func_name
-
-    return "", ""
\ No newline at end of file
+      The percentile of the samples, or 0.0 when there are none.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _lock(lock_file: IO, blocking: bool) -> bool:
+    lock_file.seek(0)
+    try:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+
+def _unlock(lock_file: IO) -> None:
+    lock_file.seek(0)
+    if fcntl:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def try_lock_file(path: str) -> Optional[IO]:
+    """
+    Take an exclusive lock on a file without waiting. The lock is held by the returned
+    handle, across processes of the machine, until unlock_file() or the process ends.
+
+    Args:
+      path: The lock file, created if missing.
+
+    Returns:
+      The open handle holding the lock, or None if another handle holds it.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    lock_file = open(path, "a+")
+    if _lock(lock_file, blocking=False):
+        return lock_file
+    lock_file.close()
+    return None
+
+
+def unlock_file(lock_file: IO) -> None:
+    """
+    Release a lock taken with try_lock_file().
+    """
+    _unlock(lock_file)
+    lock_file.close()
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on <path>.lock, shared by every process of the machine,
+    e.g. around a read-merge-write of a file the parallel workers all update.
+
+    Args:
+      path: The file to guard.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a+") as lock_file:
+        _lock(lock_file, blocking=True)
+        try:
+            yield
+        finally:
+            _unlock(lock_file)
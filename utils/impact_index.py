@@ -0,0 +1,378 @@
+"""
+Impact-based test selection.
+
+Every run records which page object methods and locator constants each test used,
+in a persistent index (IMPACT_INDEX, default .impact_index.json). With
+--changed-since <git rev>, pytest then runs only the tests whose test file, or whose
+used page methods, locators or page modules, changed since that revision.
+"""
+import ast
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import re
+import subprocess
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import pytest
+from decouple import config
+
+from utils.helpers import file_lock
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPACT_INDEX_PATH: str = os.path.join(PROJECT_ROOT, config("IMPACT_INDEX", default=".impact_index.json"))
+PAGES_DIR = "pages/"
+TESTS_DIR = "tests/"
+# Changes to these files never affect which tests pass.
+IGNORED_PATTERNS = (r"\.md$", r"^benchmarks/", r"^\.gitignore$")
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def _relative_path(path: str) -> str:
+    return os.path.relpath(os.path.abspath(path), PROJECT_ROOT).replace(os.sep, "/")
+
+
+def _module_path(symbol: str) -> str:
+    return symbol.split("::", 1)[0]
+
+
+class UsageRecorder:
+    """
+    Collects the page object methods and locator constants used by the running test.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._used: Optional[Set[str]] = None
+        self._locator_names: Optional[Dict[tuple, List[str]]] = None
+
+    def start(self) -> None:
+        """
+        Start collecting for a new test.
+        """
+        with self._lock:
+            self._used = set()
+
+    def stop(self) -> Set[str]:
+        """
+        Stop collecting.
+
+        Returns:
+            Set[str]: Symbols used since start(), e.g. "pages/ticket_page.py::TicketPage.click_next_button".
+        """
+        with self._lock:
+            used, self._used = self._used or set(), None
+        return used
+
+    def record(self, method_symbol: str, arguments: Iterable[Any]) -> None:
+        """
+        Record a page method call and the locator constants passed to it.
+
+        Args:
+            method_symbol (str): Symbol of the called method.
+            arguments (Iterable[Any]): Positional and keyword argument values of the call.
+        """
+        if self._used is None:
+            return
+        symbols = {method_symbol}
+        for locator in self._locators_in(arguments):
+            symbols.update(self.locator_names().get(locator, ()))
+        with self._lock:
+            if self._used is not None:
+                self._used.update(symbols)
+
+    def locator_names(self) -> Dict[tuple, List[str]]:
+        """
+        Map every locator constant of the *Locators classes in pages/ to its symbols.
+
+        Returns:
+            Dict[tuple, List[str]]: Symbols (e.g. "pages/ticket_page.py::TicketPageLocators.NEXT_BUTTON") by locator.
+        """
+        if self._locator_names is None:
+            import pages
+
+            names: Dict[tuple, List[str]] = {}
+            for module_info in pkgutil.iter_modules(pages.__path__, "pages."):
+                module = importlib.import_module(module_info.name)
+                for class_name, cls in vars(module).items():
+                    if not (inspect.isclass(cls) and class_name.endswith("Locators") and cls.__module__ == module.__name__):
+                        continue
+                    for name, value in vars(cls).items():
+                        if isinstance(value, tuple) and len(value) == 2:
+                            names.setdefault(value, []).append(
+                                f"{_relative_path(module.__file__)}::{class_name}.{name}"
+                            )
+            self._locator_names = names
+        return self._locator_names
+
+    @staticmethod
+    def _locators_in(values: Iterable[Any]) -> Iterable[tuple]:
+        for value in values:
+            if isinstance(value, tuple) and len(value) == 2 and all(isinstance(part, str) for part in value):
+                yield value
+            elif isinstance(value, dict):
+                yield from UsageRecorder._locators_in(value.keys())
+                yield from UsageRecorder._locators_in(value.values())
+            elif isinstance(value, (list, tuple)):
+                yield from UsageRecorder._locators_in(value)
+
+
+usage_recorder = UsageRecorder()
+
+
+def method_symbol(method: Callable) -> str:
+    """
+    Return the symbol page object method calls are recorded under with usage_recorder.record().
+
+    Args:
+        method (Callable): The method, as defined in its class.
+
+    Returns:
+        str: e.g. "pages/ticket_page.py::TicketPage.click_next_button".
+    """
+    return f"{_relative_path(inspect.getsourcefile(method))}::{method.__qualname__}"
+
+
+class ImpactIndex:
+    """
+    Persistent mapping of test node ids to the symbols they used.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the ImpactIndex, loading the file if it exists.
+
+        Args:
+            path (str): The index JSON file.
+        """
+        self.path = path
+        self.tests: Dict[str, List[str]] = self._load()
+        self._updated: Set[str] = set()
+
+    def _load(self) -> Dict[str, List[str]]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as index_file:
+            return json.load(index_file)
+
+    def update(self, node_id: str, used: Set[str], replace: bool) -> None:
+        """
+        Store the symbols a test used.
+
+        Args:
+            node_id (str): The test node id.
+            used (Set[str]): The symbols it used.
+            replace (bool): Replace the previous entry (for passed tests) instead of
+                adding to it (for failed tests, which may have stopped early).
+        """
+        if not replace:
+            used = used | set(self.tests.get(node_id, ()))
+        self.tests[node_id] = sorted(used)
+        self._updated.add(node_id)
+
+    def save(self) -> None:
+        """
+        Write the tests updated by this run into the index, dropping tests whose file
+        no longer exists. The file is re-read under a lock first, so parallel workers
+        keep each other's entries.
+        """
+        with file_lock(self.path):
+            tests = self._load()
+            tests.update((node_id, self.tests[node_id]) for node_id in self._updated)
+            tests = {
+                node_id: used for node_id, used in tests.items()
+                if os.path.exists(os.path.join(PROJECT_ROOT, node_id.split("::", 1)[0]))
+            }
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as index_file:
+                json.dump(tests, index_file, indent=1, sort_keys=True)
+            os.replace(temporary_path, self.path)
+        self.tests = tests
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout
+
+
+def changed_files(revision: str) -> List[str]:
+    """
+    List the files changed between a revision and the working tree, untracked files included.
+
+    Args:
+        revision (str): A git revision, e.g. "HEAD~3" or "origin/main".
+
+    Returns:
+        List[str]: Paths relative to the project root.
+    """
+    tracked = _git("diff", "--name-only", revision, "--", ".").splitlines()
+    untracked = _git("ls-files", "--others", "--exclude-standard").splitlines()
+    return sorted(set(tracked) | set(untracked))
+
+
+def changed_lines(revision: str, path: str) -> Set[int]:
+    """
+    Find the lines of the working tree version of a file that changed since a revision.
+    Deletions count as a change of the line following them.
+
+    Args:
+        revision (str): A git revision.
+        path (str): Path relative to the project root.
+
+    Returns:
+        Set[int]: Changed line numbers, 1-based.
+    """
+    lines: Set[int] = set()
+    for line in _git("diff", "-U0", revision, "--", path).splitlines():
+        match = HUNK_HEADER.match(line)
+        if match:
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            lines.update(range(start, start + count) if count else (start, start + 1))
+    return lines
+
+
+def _base_names(node: ast.ClassDef) -> Set[str]:
+    return {base.id if isinstance(base, ast.Name) else getattr(base, "attr", "") for base in node.bases}
+
+
+def page_symbols(path: str) -> Dict[str, range]:
+    """
+    Find the symbols of a page module that usage_recorder can record: the public,
+    undecorated methods of page classes (BasePage and its subclasses) and the
+    constants of locator classes.
+
+    Other members, such as private methods, static methods, methods marked
+    @uninstrumented, class attributes of page classes and members of helper classes
+    (Wait, ElementCache, ...), are never recorded, so they are left out and a change
+    to them counts as a change to the whole module.
+
+    Args:
+        path (str): Path relative to the project root.
+
+    Returns:
+        Dict[str, range]: Line range by symbol, e.g. "pages/home_page.py::HomePage.go_to_login_page".
+    """
+    with open(os.path.join(PROJECT_ROOT, path), encoding="utf-8") as source:
+        tree = ast.parse(source.read())
+    page_classes = {"BasePage"}
+    symbols = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if _base_names(node) & page_classes:
+            page_classes.add(node.name)
+        for member in node.body:
+            if node.name in page_classes and isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if member.name.startswith("_") or member.decorator_list:
+                    continue
+                names = [member.name]
+            elif node.name.endswith("Locators") and isinstance(member, (ast.Assign, ast.AnnAssign)):
+                targets = member.targets if isinstance(member, ast.Assign) else [member.target]
+                names = [target.id for target in targets if isinstance(target, ast.Name)]
+            else:
+                continue
+            for name in names:
+                symbols[f"{path}::{node.name}.{name}"] = range(member.lineno, member.end_lineno + 1)
+    return symbols
+
+
+def select_tests(index: ImpactIndex, node_ids: Iterable[str], revision: str) -> Optional[Set[str]]:
+    """
+    Select the tests affected by the changes since a revision.
+
+    Page modules are compared symbol by symbol: a changed page method or locator
+    selects the tests that used it, while any other change to a page module (imports,
+    module constants, class attributes, helper classes, private or uninstrumented
+    methods) selects every test that used that module. Changes to
+    anything outside pages/ and tests/ (configuration, utilities, settings) select
+    every test.
+
+    Args:
+        index (ImpactIndex): Recorded usage of earlier runs.
+        node_ids (Iterable[str]): The collected tests.
+        revision (str): A git revision.
+
+    Returns:
+        Optional[Set[str]]: The affected node ids, or None when every test must run.
+    """
+    changed_symbols: Set[str] = set()
+    changed_modules: Set[str] = set()
+    changed_tests: Set[str] = set()
+    for path in changed_files(revision):
+        if any(re.search(pattern, path) for pattern in IGNORED_PATTERNS):
+            continue
+        if path.startswith(TESTS_DIR) and os.path.basename(path).startswith("test_"):
+            changed_tests.add(path)
+        elif path.startswith(PAGES_DIR) and path.endswith(".py"):
+            if not os.path.exists(os.path.join(PROJECT_ROOT, path)):
+                changed_modules.add(path)
+                continue
+            lines = changed_lines(revision, path)
+            symbols = page_symbols(path)
+            touched = {symbol for symbol, span in symbols.items() if lines & set(span)}
+            changed_symbols.update(touched)
+            if lines - set().union(*(set(symbols[symbol]) for symbol in symbols)):
+                changed_modules.add(path)
+        else:
+            return None
+
+    selected = set()
+    for node_id in node_ids:
+        used = index.tests.get(node_id)
+        if (
+            used is None
+            or node_id.split("::", 1)[0] in changed_tests
+            or changed_symbols.intersection(used)
+            or changed_modules.intersection(_module_path(symbol) for symbol in used)
+        ):
+            selected.add(node_id)
+    return selected
+
+
+class ImpactPlugin:
+    """
+    pytest plugin that records the usage of every test into the ImpactIndex and,
+    given a revision, deselects the tests the changes since it cannot affect.
+    """
+
+    __test__ = False
+
+    def __init__(self, index: ImpactIndex, changed_since: Optional[str]) -> None:
+        self.index = index
+        self.changed_since = changed_since
+        self._failed = False
+        self._skipped = False
+
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: List[pytest.Item]) -> None:
+        if not self.changed_since:
+            return
+        selected = select_tests(self.index, [item.nodeid for item in items], self.changed_since)
+        if selected is None:
+            return
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in selected]
+
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        usage_recorder.start()
+        self._failed = self._skipped = False
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call: pytest.CallInfo):
+        outcome = yield
+        report: pytest.TestReport = outcome.get_result()
+        self._failed = self._failed or report.failed
+        self._skipped = self._skipped or report.skipped
+        if call.when != "teardown":
+            return
+        used = usage_recorder.stop()
+        # Skipped tests stay unknown to the index, so they are never deselected.
+        if not self._skipped:
+            self.index.update(item.nodeid, used, replace=not self._failed)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        self.index.save()
@@ -0,0 +1,239 @@
+"""
+Browser-side performance metrics of page object navigations, checked against the
+budgets page classes declare in PERFORMANCE_BUDGETS and written per run to
+perf_metrics/<run id>.json.
+
+The observers collecting LCP, layout shifts and long tasks are part of
+pages.base_page.APP_HOOKS_JS, which is installed in every new document. A measurement
+is taken when BasePage.wait_until_app_stable() completes after a navigation: document
+loads report Navigation Timing, FCP and LCP; every navigation, including client-side
+route changes, reports its duration, CLS and long tasks since the previous measurement,
+and the deltas of the CDP Performance.getMetrics counters.
+"""
+import json
+import os
+import threading
+import time
+import warnings
+import weakref
+from typing import Any, Dict, List, Mapping, Optional
+
+from decouple import config
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from configuration.network_blocking import blocks_images, get_blocking_profile
+from utils.helpers import get_run_id, get_test_context, get_worker_id
+
+
+PERF_METRICS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "perf_metrics")
+PERF_METRICS_ENABLED: bool = config("PERF_METRICS", default=True, cast=bool)
+# Action on a budget violation: "warn" emits a PerformanceBudgetWarning, "fail" fails the test.
+PERF_BUDGET_ACTION: str = config("PERF_BUDGET_ACTION", default="warn")
+
+# Reads the entries the observers collected since the previous measurement of the document.
+COLLECT_METRICS_JS = """
+var perf = window.__appHooks && window.__appHooks.perf;
+if (!perf) { return null; }
+var since = perf.measuredAt;
+perf.measuredAt = performance.now();
+var metrics = {url: window.location.href, documentLoad: since === 0};
+var seconds = function (ms) { return ms > 0 ? ms / 1000 : null; };
+if (since === 0) {
+    var navigation = performance.getEntriesByType('navigation')[0];
+    if (navigation) {
+        metrics.ttfb = seconds(navigation.responseStart);
+        metrics.dom_content_loaded = seconds(navigation.domContentLoadedEventEnd);
+        metrics.load = seconds(navigation.loadEventEnd);
+    }
+    var paint = performance.getEntriesByName('first-contentful-paint')[0];
+    metrics.fcp = paint ? seconds(paint.startTime) : null;
+    metrics.lcp = seconds(perf.lcp);
+}
+var shifts = perf.shifts.filter(function (entry) { return entry[0] >= since; });
+var longTasks = perf.longTasks.filter(function (entry) { return entry[0] >= since; });
+metrics.cls = shifts.reduce(function (total, entry) { return total + entry[1]; }, 0);
+metrics.long_tasks = longTasks.length;
+metrics.long_task_time = longTasks.reduce(function (total, entry) { return total + entry[1]; }, 0) / 1000;
+return metrics;
+"""
+
+# CDP Performance.getMetrics counters reported as deltas per navigation, by metric name.
+CDP_COUNTERS = {
+    "LayoutCount": "layout_count",
+    "RecalcStyleCount": "recalc_style_count",
+    "ScriptDuration": "script_duration",
+    "TaskDuration": "task_duration",
+}
+
+
+class PerformanceBudgetWarning(UserWarning):
+    """
+    Emitted when a navigation exceeds a performance budget and PERF_BUDGET_ACTION is "warn".
+    """
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    """
+    Raised when a navigation exceeds a performance budget and PERF_BUDGET_ACTION is "fail".
+    """
+
+
+class PagePerformance:
+    """
+    Collects the performance metrics of navigations per driver until the test using
+    the driver takes them, and keeps the metrics of the run for save().
+    """
+
+    def __init__(self, enabled: bool, directory: str) -> None:
+        """
+        Initialize the PagePerformance recorder.
+
+        Args:
+            enabled (bool): Whether to measure anything.
+            directory (str): Directory of the per-run JSON files.
+        """
+        self.enabled = enabled
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pending: "weakref.WeakKeyDictionary[WebDriver, List[Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+        self._counters: "weakref.WeakKeyDictionary[WebDriver, Dict[str, float]]" = weakref.WeakKeyDictionary()
+        self._records: List[Dict[str, Any]] = []
+
+    def measure(
+        self, driver: WebDriver, page: str, budgets: Mapping[str, float], navigation_time: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read the metrics of the navigation that just completed.
+
+        LCP is left out when the session's blocking profile blocks images, since the
+        largest contentful paint of the page is then usually missing.
+
+        Args:
+            driver (WebDriver): The driver that navigated.
+            page (str): Name of the page class that waited for the navigation.
+            budgets (Mapping[str, float]): Maximum value by metric name.
+            navigation_time (Optional[float]): Seconds from the navigation until the app
+                was stable, or None when the navigation was not timed (pooled sessions).
+
+        Returns:
+            Optional[Dict[str, Any]]: The record, or None when disabled or the page
+                does not expose the metrics.
+        """
+        if not self.enabled:
+            return None
+        try:
+            metrics = driver.execute_script(COLLECT_METRICS_JS)
+        except WebDriverException:
+            return None
+        if not metrics:
+            return None
+        url = metrics.pop("url")
+        document_load = metrics.pop("documentLoad")
+        blocking_profile = get_blocking_profile(driver)
+        if blocks_images(blocking_profile):
+            metrics.pop("lcp", None)
+        metrics = {name: round(value, 4) for name, value in metrics.items() if value is not None}
+        if navigation_time is not None:
+            metrics["navigation_time"] = round(navigation_time, 4)
+        metrics.update(self._cdp_metrics(driver))
+        record = {
+            "page": page,
+            "url": url,
+            "document_load": document_load,
+            "blocking_profile": blocking_profile,
+            "timestamp": round(time.time(), 3),
+            "metrics": metrics,
+            "violations": [
+                f"{page} {name}={metrics[name]:g} exceeds the budget of {budget:g}"
+                for name, budget in budgets.items()
+                if name in metrics and metrics[name] > budget
+            ],
+        }
+        with self._lock:
+            self._pending.setdefault(driver, []).append(record)
+        return record
+
+    def take(self, driver: WebDriver) -> List[Dict[str, Any]]:
+        """
+        Return the records of a driver measured since the last take, attributing them
+        to the running test and keeping them for save().
+
+        Args:
+            driver (WebDriver): The driver of the test.
+
+        Returns:
+            List[Dict[str, Any]]: The records, oldest first.
+        """
+        folder_name, test_name = get_test_context()
+        with self._lock:
+            records = self._pending.pop(driver, [])
+            for record in records:
+                record["test"] = f"{folder_name}/{test_name}" if test_name else None
+            self._records.extend(records)
+        return records
+
+    def save(self) -> Optional[str]:
+        """
+        Write the records of this run to perf_metrics/<run id>[-<worker>].json.
+
+        Returns:
+            Optional[str]: The file written, or None when nothing was measured.
+        """
+        with self._lock:
+            records = list(self._records)
+        if not records:
+            return None
+        worker_id = get_worker_id()
+        path = os.path.join(self.directory, f"{get_run_id()}{'-' + worker_id if worker_id else ''}.json")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as metrics_file:
+            json.dump({"run_id": get_run_id(), "worker": worker_id, "navigations": records}, metrics_file, indent=1)
+        return path
+
+    def _cdp_metrics(self, driver: WebDriver) -> Dict[str, float]:
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return {}
+        try:
+            if driver not in self._counters:
+                driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+                self._counters[driver] = {}
+            values = {
+                metric["name"]: metric["value"]
+                for metric in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            }
+        except WebDriverException:
+            return {}
+        previous = self._counters[driver]
+        result = {"js_heap_mb": round(values.get("JSHeapUsedSize", 0) / 2 ** 20, 2)}
+        for name, metric in CDP_COUNTERS.items():
+            value = values.get(name, 0)
+            # Counters restart with a new renderer process.
+            result[metric] = round(value - previous.get(name, 0) if value >= previous.get(name, 0) else value, 4)
+        self._counters[driver] = values
+        return result
+
+
+page_performance = PagePerformance(PERF_METRICS_ENABLED, PERF_METRICS_DIR)
+
+
+def check_budgets(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Act on the budget violations of navigation records as configured by PERF_BUDGET_ACTION.
+
+    Args:
+        records (List[Dict[str, Any]]): Records returned by PagePerformance.take().
+
+    Returns:
+        List[str]: A description of every exceeded budget.
+
+    Raises:
+        PerformanceBudgetExceeded: If a budget is exceeded and the action is "fail".
+    """
+    violations = [violation for record in records for violation in record["violations"]]
+    if violations:
+        message = "Performance budgets exceeded: " + "; ".join(violations)
+        if PERF_BUDGET_ACTION == "fail":
+            raise PerformanceBudgetExceeded(message)
+        warnings.warn(message, PerformanceBudgetWarning, stacklevel=2)
+    return violations
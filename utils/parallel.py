@@ -0,0 +1,286 @@
+"""
+Duration-aware parallel runner for the browser test suite.
+
+Collects the tests, assigns them to worker processes longest-first using the
+timings recorded by earlier runs, runs one pytest process per worker (each with
+its own Chrome), and prints a merged report of per-worker busy and idle time.
+
+Usage:
+    python -m utils.parallel [-n WORKERS] [--timings FILE] [paths...] [-- pytest options...]
+"""
+import argparse
+import heapq
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+
+from utils.helpers import get_run_id
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TIMINGS_FILE = os.path.join(PROJECT_ROOT, ".test_timings.json")
+DEFAULT_REPORT_FILE = os.path.join(PROJECT_ROOT, "parallel_report.json")
+UNKNOWN_TEST_DURATION = 10.0
+
+
+class CollectionError(Exception):
+    """
+    Raised when pytest fails to collect the tests, e.g. on an import error in a test module.
+
+    Attributes:
+        exit_code (int): The exit code of the collecting pytest process.
+        output (str): Its output.
+    """
+
+    def __init__(self, exit_code: int, output: str) -> None:
+        super().__init__(f"Test collection failed with exit code {exit_code}")
+        self.exit_code = exit_code
+        self.output = output
+
+
+class WorkerReportPlugin:
+    """
+    pytest plugin that writes the duration and outcome of every test run by one
+    worker to a JSON file, for the parallel runner to merge.
+    """
+
+    def __init__(self, path: str, worker_id: str) -> None:
+        """
+        Initialize the WorkerReportPlugin.
+
+        Args:
+            path (str): The JSON file to write when the session finishes.
+            worker_id (str): Identifier of the worker, e.g. 'gw0'.
+        """
+        self.path = path
+        self.worker_id = worker_id
+        self.started = time.time()
+        self.tests: Dict[str, Dict[str, object]] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        entry = self.tests.setdefault(report.nodeid, {"duration": 0.0, "outcome": "passed"})
+        entry["duration"] += report.duration
+        if report.outcome != "passed":
+            entry["outcome"] = report.outcome
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        with open(self.path, "w", encoding="utf-8") as report_file:
+            json.dump(
+                {
+                    "worker": self.worker_id,
+                    "started": self.started,
+                    "finished": time.time(),
+                    "tests": self.tests,
+                },
+                report_file,
+                indent=2,
+            )
+
+
+def collect_tests(paths: List[str], pytest_args: List[str]) -> List[str]:
+    """
+    Collect the node ids of the tests selected by the given paths and pytest options.
+
+    Args:
+        paths (List[str]): Test paths or node ids to collect from.
+        pytest_args (List[str]): Options passed through to pytest.
+
+    Returns:
+        List[str]: The collected node ids; empty when no tests were selected.
+
+    Raises:
+        CollectionError: If pytest failed to collect the tests.
+    """
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args, *paths],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+        raise CollectionError(result.returncode, result.stdout + result.stderr)
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+
+def load_timings(path: str) -> Dict[str, float]:
+    """
+    Load the test durations recorded by earlier runs.
+
+    Args:
+        path (str): The timings JSON file.
+
+    Returns:
+        Dict[str, float]: Duration in seconds by node id; empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as timings_file:
+        return json.load(timings_file)
+
+
+def assign_longest_first(
+    node_ids: List[str], timings: Dict[str, float], workers: int
+) -> List[List[str]]:
+    """
+    Split tests between workers with the longest-processing-time-first heuristic:
+    tests are taken from the slowest down, each going to the least loaded worker.
+    Tests without a recorded timing are assumed to take the median known duration.
+
+    Args:
+        node_ids (List[str]): The tests to run.
+        timings (Dict[str, float]): Recorded durations by node id.
+        workers (int): Number of workers.
+
+    Returns:
+        List[List[str]]: The tests assigned to each worker.
+    """
+    known = [timings[node_id] for node_id in node_ids if node_id in timings]
+    default = statistics.median(known) if known else UNKNOWN_TEST_DURATION
+    ordered = sorted(node_ids, key=lambda node_id: timings.get(node_id, default), reverse=True)
+
+    loads: List[Tuple[float, int]] = [(0.0, index) for index in range(workers)]
+    assignment: List[List[str]] = [[] for _ in range(workers)]
+    for node_id in ordered:
+        load, index = heapq.heappop(loads)
+        assignment[index].append(node_id)
+        heapq.heappush(loads, (load + timings.get(node_id, default), index))
+    return assignment
+
+
+def run_workers(
+    assignment: List[List[str]], pytest_args: List[str], report_dir: str
+) -> Tuple[int, List[Dict[str, object]]]:
+    """
+    Run one pytest process per worker and wait for all of them.
+
+    Args:
+        assignment (List[List[str]]): The tests assigned to each worker.
+        pytest_args (List[str]): Options passed through to pytest.
+        report_dir (str): Directory the worker reports are written to.
+
+    Returns:
+        Tuple[int, List[Dict[str, object]]]: The worst exit code and the worker reports.
+    """
+    processes = []
+    # One run id for every worker, so their artifacts and performance metrics belong to one run.
+    run_id = get_run_id()
+    for index, node_ids in enumerate(assignment):
+        if not node_ids:
+            continue
+        worker_id = f"gw{index}"
+        report_path = os.path.join(report_dir, f"{worker_id}.json")
+        env = dict(os.environ, TEST_WORKER_ID=worker_id, TEST_RUN_ID=run_id)
+        command = [
+            sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+            "--worker-report", report_path, *pytest_args, *node_ids,
+        ]
+        processes.append((report_path, subprocess.Popen(command, cwd=PROJECT_ROOT, env=env)))
+
+    exit_code = 0
+    reports = []
+    for report_path, process in processes:
+        exit_code = max(exit_code, process.wait())
+        if os.path.exists(report_path):
+            with open(report_path, encoding="utf-8") as report_file:
+                reports.append(json.load(report_file))
+    return exit_code, reports
+
+
+def merge_reports(reports: List[Dict[str, object]], started: float, finished: float) -> Dict[str, object]:
+    """
+    Merge the worker reports into per-worker busy and idle times.
+
+    Busy time is the sum of test durations; idle time is the rest of the run's wall
+    time, including worker start-up and waiting for the slowest worker to finish.
+
+    Args:
+        reports (List[Dict[str, object]]): The worker reports.
+        started (float): Run start, as time.time().
+        finished (float): Run end, as time.time().
+
+    Returns:
+        Dict[str, object]: The merged report.
+    """
+    wall = finished - started
+    workers = []
+    for report in sorted(reports, key=lambda item: (len(item["worker"]), item["worker"])):
+        busy = sum(test["duration"] for test in report["tests"].values())
+        workers.append({
+            "worker": report["worker"],
+            "tests": len(report["tests"]),
+            "busy": round(busy, 3),
+            "idle": round(max(wall - busy, 0.0), 3),
+            "failed": sorted(
+                node_id for node_id, test in report["tests"].items() if test["outcome"] == "failed"
+            ),
+        })
+    return {"wall": round(wall, 3), "workers": workers}
+
+
+def print_report(report: Dict[str, object]) -> None:
+    """
+    Print the merged report as a table.
+
+    Args:
+        report (Dict[str, object]): The merged report.
+    """
+    print(f"\nParallel run finished in {report['wall']:.1f}s")
+    print(f"{'worker':<8}{'tests':>7}{'busy [s]':>11}{'idle [s]':>11}{'util':>7}")
+    for worker in report["workers"]:
+        utilisation = worker["busy"] / report["wall"] if report["wall"] else 0.0
+        print(
+            f"{worker['worker']:<8}{worker['tests']:>7}{worker['busy']:>11.1f}"
+            f"{worker['idle']:>11.1f}{utilisation:>7.0%}"
+        )
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.parallel", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: number of CPUs).")
+    parser.add_argument("--timings", default=DEFAULT_TIMINGS_FILE,
+                        help="Timings file read for scheduling and updated after the run.")
+    parser.add_argument("--report", default=DEFAULT_REPORT_FILE,
+                        help="File the merged JSON report is written to.")
+    parser.add_argument("paths", nargs="*", help="Test paths to run (default: the whole suite).")
+    separator = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:separator])
+    pytest_args = argv[separator + 1:]
+
+    try:
+        node_ids = collect_tests(args.paths, pytest_args)
+    except CollectionError as error:
+        print(error.output, end="", file=sys.stderr)
+        print(error, file=sys.stderr)
+        return error.exit_code
+    if not node_ids:
+        print("No tests collected.")
+        return 5
+
+    timings = load_timings(args.timings)
+    assignment = assign_longest_first(node_ids, timings, min(args.workers, len(node_ids)))
+
+    started = time.time()
+    with tempfile.TemporaryDirectory() as report_dir:
+        exit_code, reports = run_workers(assignment, pytest_args, report_dir)
+    report = merge_reports(reports, started, time.time())
+
+    for worker_report in reports:
+        for node_id, test in worker_report["tests"].items():
+            timings[node_id] = round(test["duration"], 3)
+    with open(args.timings, "w", encoding="utf-8") as timings_file:
+        json.dump(timings, timings_file, indent=2, sort_keys=True)
+    with open(args.report, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    print_report(report)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
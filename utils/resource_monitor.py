@@ -0,0 +1,255 @@
+"""
+Per-test resource usage of the Chrome and chromedriver processes behind a WebDriver
+session, sampled from /proc (Linux only), with configurable limits.
+"""
+import os
+import threading
+import warnings
+from typing import Dict, List, Optional, Set
+
+from decouple import config
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+PROC_DIR = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+RESOURCE_MONITOR_ENABLED: bool = config("RESOURCE_MONITOR", default=True, cast=bool)
+RESOURCE_MONITOR_INTERVAL: float = config("RESOURCE_MONITOR_INTERVAL", default=0.25, cast=float)
+# Action on a limit violation: "warn" emits a ResourceLimitWarning, "fail" fails the test.
+RESOURCE_LIMIT_ACTION: str = config("RESOURCE_LIMIT_ACTION", default="warn")
+# Limits by metric name; 0 disables a limit.
+RESOURCE_LIMITS: Dict[str, float] = {
+    "peak_rss_mb": config("RESOURCE_LIMIT_RSS_MB", default=0, cast=float),
+    "cpu_seconds": config("RESOURCE_LIMIT_CPU_SECONDS", default=0, cast=float),
+    "peak_threads": config("RESOURCE_LIMIT_THREADS", default=0, cast=float),
+    "peak_fds": config("RESOURCE_LIMIT_FDS", default=0, cast=float),
+    "fd_growth": config("RESOURCE_LIMIT_FD_GROWTH", default=0, cast=float),
+    "thread_growth": config("RESOURCE_LIMIT_THREAD_GROWTH", default=0, cast=float),
+}
+
+
+class ResourceLimitWarning(UserWarning):
+    """
+    Emitted when a test exceeds a resource limit and RESOURCE_LIMIT_ACTION is "warn".
+    """
+
+
+class ResourceLimitExceeded(AssertionError):
+    """
+    Raised when a test exceeds a resource limit and RESOURCE_LIMIT_ACTION is "fail".
+    """
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as proc_file:
+        return proc_file.read()
+
+
+def _children(pid: int) -> List[int]:
+    task_dir = os.path.join(PROC_DIR, str(pid), "task")
+    try:
+        threads = os.listdir(task_dir)
+    except OSError:
+        return []
+    children: List[int] = []
+    for thread in threads:
+        try:
+            children += [int(child) for child in _read(os.path.join(task_dir, thread, "children")).split()]
+        except OSError:
+            continue
+    return children
+
+
+def process_tree(root_pid: int) -> Set[int]:
+    """
+    Find a process and all of its live descendants by following the children lists
+    of /proc/<pid>/task/<tid>/children, so only the tree itself is read rather than
+    every process on the machine.
+
+    Args:
+        root_pid (int): The root process id.
+
+    Returns:
+        Set[int]: Process ids of the tree, empty if the root has exited.
+    """
+    if not os.path.isdir(os.path.join(PROC_DIR, str(root_pid))):
+        return set()
+    tree, frontier = {root_pid}, [root_pid]
+    while frontier:
+        children = [pid for pid in _children(frontier.pop()) if pid not in tree]
+        tree.update(children)
+        frontier.extend(children)
+    return tree
+
+
+def find_browser_pid(user_data_dir: str) -> Optional[int]:
+    """
+    Find the main Chrome process running on a user-data-dir.
+
+    Args:
+        user_data_dir (str): The profile directory of the session.
+
+    Returns:
+        Optional[int]: The browser process id, or None if it was not found.
+    """
+    flag = f"--user-data-dir={user_data_dir}"
+    for entry in os.listdir(PROC_DIR):
+        if not entry.isdigit():
+            continue
+        try:
+            arguments = _read(os.path.join(PROC_DIR, entry, "cmdline")).split("\0")
+        except OSError:
+            continue
+        # Renderer, GPU and utility processes carry a --type switch; the browser does not.
+        if flag in arguments and not any(argument.startswith("--type=") for argument in arguments):
+            return int(entry)
+    return None
+
+
+def sample_processes(pids: Set[int]) -> Dict[str, float]:
+    """
+    Read the current resource usage of a set of processes.
+
+    Args:
+        pids (Set[int]): Process ids; processes that have exited are skipped.
+
+    Returns:
+        Dict[str, float]: Total RSS in bytes, CPU seconds (including reaped children),
+            thread count and open file descriptors.
+    """
+    totals = {"rss": 0.0, "cpu": 0.0, "threads": 0.0, "fds": 0.0}
+    for pid in pids:
+        base = os.path.join(PROC_DIR, str(pid))
+        try:
+            fields = _read(os.path.join(base, "stat"))
+            fields = fields[fields.rindex(")") + 2:].split()
+            fds = len(os.listdir(os.path.join(base, "fd")))
+        except OSError:
+            continue
+        # utime, stime, cutime and cstime are fields 14-17 of /proc/<pid>/stat.
+        totals["cpu"] += sum(int(value) for value in fields[11:15]) / CLOCK_TICKS
+        totals["threads"] += int(fields[17])
+        totals["rss"] += int(fields[21]) * PAGE_SIZE
+        totals["fds"] += fds
+    return totals
+
+
+class ResourceMonitor:
+    """
+    Samples the processes of a WebDriver session in a background thread, from start()
+    until stop(): the tree under the chromedriver process, which started Chrome, or
+    the Chrome process tree when chromedriver runs elsewhere.
+    """
+
+    def __init__(self, browser_pid: Optional[int], driver_pid: Optional[int], interval: float) -> None:
+        """
+        Initialize the ResourceMonitor.
+
+        Args:
+            browser_pid (Optional[int]): Main Chrome process of the session.
+            driver_pid (Optional[int]): chromedriver process of the session.
+            interval (float): Seconds between samples.
+        """
+        self.browser_pid = browser_pid
+        self.driver_pid = driver_pid
+        self.interval = interval
+        self._samples: List[Dict[str, float]] = []
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_driver(cls, driver: WebDriver) -> Optional["ResourceMonitor"]:
+        """
+        Create a monitor for the processes behind a session.
+
+        Args:
+            driver (WebDriver): A local Chrome WebDriver session.
+
+        Returns:
+            Optional[ResourceMonitor]: The monitor, or None when monitoring is disabled,
+                /proc is unavailable or the session's processes cannot be found.
+        """
+        if not RESOURCE_MONITOR_ENABLED or not os.path.isdir(PROC_DIR):
+            return None
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        driver_pid = process.pid if process else None
+        browser_pid = None
+        if driver_pid is None:
+            user_data_dir = (driver.caps or {}).get("chrome", {}).get("userDataDir")
+            browser_pid = find_browser_pid(user_data_dir) if user_data_dir else None
+        if browser_pid is None and driver_pid is None:
+            return None
+        return cls(browser_pid, driver_pid, RESOURCE_MONITOR_INTERVAL)
+
+    def start(self) -> "ResourceMonitor":
+        """
+        Take the first sample and start sampling in the background.
+
+        Returns:
+            ResourceMonitor: self, for chaining.
+        """
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, float]:
+        """
+        Take the last sample, stop sampling and summarize the samples.
+
+        Returns:
+            Dict[str, float]: peak_rss_mb, cpu_seconds used while monitored, peak_threads,
+                peak_fds, and the fd_growth and thread_growth between the first and last sample.
+        """
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        self._sample()
+        first, last = self._samples[0], self._samples[-1]
+        return {
+            "peak_rss_mb": round(max(sample["rss"] for sample in self._samples) / 2 ** 20, 1),
+            "cpu_seconds": round(max(0.0, last["cpu"] - first["cpu"]), 2),
+            "peak_threads": int(max(sample["threads"] for sample in self._samples)),
+            "peak_fds": int(max(sample["fds"] for sample in self._samples)),
+            "fd_growth": int(last["fds"] - first["fds"]),
+            "thread_growth": int(last["threads"] - first["threads"]),
+        }
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        root_pid = self.driver_pid or self.browser_pid
+        pids = process_tree(root_pid) if root_pid else set()
+        self._samples.append(sample_processes(pids))
+
+
+def check_limits(usage: Dict[str, float]) -> List[str]:
+    """
+    Compare resource usage with RESOURCE_LIMITS and act on violations as configured
+    by RESOURCE_LIMIT_ACTION.
+
+    Args:
+        usage (Dict[str, float]): Summary returned by ResourceMonitor.stop().
+
+    Returns:
+        List[str]: A description of every exceeded limit.
+
+    Raises:
+        ResourceLimitExceeded: If a limit is exceeded and the action is "fail".
+    """
+    violations = [
+        f"{name}={usage[name]} exceeds the limit of {limit:g}"
+        for name, limit in RESOURCE_LIMITS.items()
+        if limit and usage.get(name, 0) > limit
+    ]
+    if violations:
+        message = "Resource limits exceeded: " + "; ".join(violations)
+        if RESOURCE_LIMIT_ACTION == "fail":
+            raise ResourceLimitExceeded(message)
+        warnings.warn(message, ResourceLimitWarning, stacklevel=2)
+    return violations
@@ -0,0 +1,89 @@
+"""
+Per-test metrics recorded by the framework (e.g. element cache hits) and attached
+to the pytest report of the test that produced them.
+"""
+import threading
+from typing import Dict, List, Tuple, Union
+
+import pytest
+
+
+Number = Union[int, float]
+
+_lock = threading.Lock()
+_metrics: Dict[str, Number] = {}
+
+
+def add(name: str, value: Number) -> None:
+    """
+    Add a value to a metric of the running test.
+
+    Args:
+        name (str): Metric name.
+        value (Number): Amount to add.
+    """
+    with _lock:
+        _metrics[name] = _metrics.get(name, 0) + value
+
+
+def record(name: str, value: Number) -> None:
+    """
+    Set a metric of the running test, keeping the highest value recorded.
+
+    Args:
+        name (str): Metric name.
+        value (Number): Recorded value.
+    """
+    with _lock:
+        _metrics[name] = max(_metrics.get(name, value), value)
+
+
+def collect() -> Dict[str, Number]:
+    """
+    Return and reset the metrics recorded since the last call.
+
+    Returns:
+        Dict[str, Number]: Metric values by name.
+    """
+    with _lock:
+        collected = dict(_metrics)
+        _metrics.clear()
+    return collected
+
+
+class TestMetricsPlugin:
+    """
+    pytest plugin that attaches the metrics of each test to its report as
+    user_properties (also exported by --junitxml) and prints them at the end of
+    the run.
+    """
+
+    __test__ = False
+
+    def __init__(self) -> None:
+        self.results: List[Tuple[str, Dict[str, Number]]] = []
+
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        collect()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call: pytest.CallInfo):
+        outcome = yield
+        if call.when != "teardown":
+            return
+        metrics = collect()
+        if metrics:
+            report: pytest.TestReport = outcome.get_result()
+            report.user_properties.extend(sorted(metrics.items()))
+            self.results.append((item.nodeid, metrics))
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.results:
+            return
+        terminalreporter.section("test metrics")
+        for node_id, metrics in self.results:
+            values = ", ".join(
+                f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in sorted(metrics.items())
+            )
+            terminalreporter.write_line(f"{node_id}: {values}")
@@ -0,0 +1,206 @@
+"""
+Visual regression checks on screenshots using perceptual hashes.
+
+Every screenshot is downscaled to 32x32 grayscale and reduced to a 64-bit DCT hash
+(pHash) with NumPy. A capture is compared with the baseline stored for the same test
+and step by the Hamming distance of the hashes; only when that exceeds
+VISUAL_HASH_TOLERANCE is the full-size pixel diff computed, and the check fails when
+more than VISUAL_PIXEL_TOLERANCE of the pixels differ.
+"""
+import io
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+from decouple import config
+from PIL import Image
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES_DIR = os.path.join(PROJECT_ROOT, "visual_baselines")
+DIFFS_DIR = os.path.join(PROJECT_ROOT, "screenshots", "visual_diffs")
+
+VISUAL_HASH_TOLERANCE: int = config("VISUAL_HASH_TOLERANCE", default=4, cast=int)
+VISUAL_PIXEL_TOLERANCE: float = config("VISUAL_PIXEL_TOLERANCE", default=0.001, cast=float)
+# Channel difference (0-255) above which a pixel counts as changed.
+VISUAL_PIXEL_THRESHOLD: int = config("VISUAL_PIXEL_THRESHOLD", default=16, cast=int)
+VISUAL_UPDATE_BASELINES: bool = config("VISUAL_UPDATE_BASELINES", default=False, cast=bool)
+
+HASH_SIZE = 8
+SAMPLE_SIZE = 32
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+DCT_MATRIX = _dct_matrix(SAMPLE_SIZE)[:HASH_SIZE]
+
+
+class VisualRegressionError(AssertionError):
+    """
+    Raised when a screenshot differs from its baseline beyond the tolerances.
+    """
+
+
+def downscale(png: bytes) -> np.ndarray:
+    """
+    Decode a PNG screenshot into the grayscale sample the hash is computed from.
+
+    Args:
+        png (bytes): The PNG image.
+
+    Returns:
+        np.ndarray: A SAMPLE_SIZE x SAMPLE_SIZE float32 array.
+    """
+    with Image.open(io.BytesIO(png)) as image:
+        # draft() lets the decoder skip detail where the format supports it.
+        image.draft("L", (SAMPLE_SIZE * 4, SAMPLE_SIZE * 4))
+        sample = image.convert("L").resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.BOX)
+    return np.asarray(sample, dtype=np.float32)
+
+
+def phash_many(samples: np.ndarray) -> np.ndarray:
+    """
+    Compute the perceptual hashes of a batch of downscaled samples.
+
+    Args:
+        samples (np.ndarray): An N x SAMPLE_SIZE x SAMPLE_SIZE array.
+
+    Returns:
+        np.ndarray: N 64-bit hashes (uint64): bit i is set where the i-th lowest
+            frequency DCT coefficient is above the median of the block.
+    """
+    coefficients = DCT_MATRIX @ samples @ DCT_MATRIX.T
+    flat = coefficients.reshape(len(samples), -1)
+    bits = flat > np.median(flat[:, 1:], axis=1, keepdims=True)
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def hamming_distances(hashes: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    Count the differing bits of pairs of hashes.
+
+    Args:
+        hashes (np.ndarray): N uint64 hashes.
+        others (np.ndarray): N uint64 hashes.
+
+    Returns:
+        np.ndarray: N distances between 0 and 64.
+    """
+    return np.bitwise_count(np.bitwise_xor(hashes, others))
+
+
+def pixel_diff(png: bytes, baseline_png: bytes) -> Tuple[float, Optional[Image.Image]]:
+    """
+    Compare two screenshots pixel by pixel.
+
+    Args:
+        png (bytes): The new screenshot.
+        baseline_png (bytes): The baseline screenshot.
+
+    Returns:
+        Tuple[float, Optional[Image.Image]]: The share of changed pixels (1.0 when the
+            sizes differ) and an image highlighting them in red over the new screenshot.
+    """
+    with Image.open(io.BytesIO(png)) as image, Image.open(io.BytesIO(baseline_png)) as baseline:
+        current = np.asarray(image.convert("RGB"), dtype=np.int16)
+        expected = np.asarray(baseline.convert("RGB"), dtype=np.int16)
+    if current.shape != expected.shape:
+        return 1.0, None
+    changed = (np.abs(current - expected) > VISUAL_PIXEL_THRESHOLD).any(axis=2)
+    highlighted = current.astype(np.uint8) // 2
+    highlighted[changed] = (255, 0, 0)
+    return float(changed.mean()), Image.fromarray(highlighted)
+
+
+class VisualBaseline:
+    """
+    Baseline screenshots and their hashes, stored as visual_baselines/<key>.png next
+    to visual_baselines/<key>.phash, so comparisons never decode a baseline unless
+    the hashes disagree. Every key has its own files, so parallel workers checking
+    different tests never write to the same file.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initialize the VisualBaseline.
+
+        Args:
+            directory (str): Directory of the baselines.
+        """
+        self.directory = directory
+
+    def check(self, key: str, png: bytes) -> int:
+        """
+        Compare a screenshot with its baseline.
+
+        A screenshot without a baseline (or any, with VISUAL_UPDATE_BASELINES) becomes
+        the new baseline. A baseline whose hash file is missing is hashed again, never
+        replaced.
+
+        Args:
+            key (str): Baseline key, e.g. "user/test_user_settings_displayed/final".
+            png (bytes): The PNG screenshot.
+
+        Returns:
+            int: The Hamming distance of the screenshot to the baseline hash (0 for a
+                new baseline).
+
+        Raises:
+            VisualRegressionError: If the hash distance exceeds VISUAL_HASH_TOLERANCE
+                and the pixel diff exceeds VISUAL_PIXEL_TOLERANCE.
+        """
+        image_hash = phash_many(downscale(png)[np.newaxis])
+        png_path = self._png_path(key)
+        if VISUAL_UPDATE_BASELINES or not os.path.exists(png_path):
+            _write_atomic(png_path, png)
+            _write_atomic(self._hash_path(key), f"{int(image_hash[0]):016x}".encode("ascii"))
+            return 0
+
+        distance = int(hamming_distances(image_hash, np.array([self._baseline_hash(key)], dtype=np.uint64))[0])
+        if distance <= VISUAL_HASH_TOLERANCE:
+            return distance
+        with open(png_path, "rb") as baseline_file:
+            changed, diff = pixel_diff(png, baseline_file.read())
+        if changed > VISUAL_PIXEL_TOLERANCE:
+            diff_path = os.path.join(DIFFS_DIR, f"{key}.png")
+            if diff is not None:
+                os.makedirs(os.path.dirname(diff_path), exist_ok=True)
+                diff.save(diff_path)
+            raise VisualRegressionError(
+                f"Screenshot differs from its baseline: {key}: hash distance {distance}, "
+                f"{changed:.2%} of pixels changed ({diff_path})"
+            )
+        return distance
+
+    def _png_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _hash_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.phash")
+
+    def _baseline_hash(self, key: str) -> int:
+        try:
+            with open(self._hash_path(key), encoding="ascii") as hash_file:
+                return int(hash_file.read().strip(), 16)
+        except (FileNotFoundError, ValueError):
+            with open(self._png_path(key), "rb") as baseline_file:
+                baseline_hash = int(phash_many(downscale(baseline_file.read())[np.newaxis])[0])
+            _write_atomic(self._hash_path(key), f"{baseline_hash:016x}".encode("ascii"))
+            return baseline_hash
+
+
+def _write_atomic(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as output_file:
+        output_file.write(content)
+    os.replace(temporary_path, path)
+
+
+visual_baseline = VisualBaseline(BASELINES_DIR)